@@ -0,0 +1,154 @@
+"""Benchmark for `combine_chunks_from_generators` against the previous
+implementation, which called `gc.collect()` after every column of every
+meter and allocated fresh temporaries each time.
+
+Reports the best wall-clock time and the peak memory allocated (as
+measured by `tracemalloc`) while combining one chunk.
+
+Run with::
+
+    python benchmarks/bench_combine_chunks.py
+"""
+
+import gc
+import timeit
+import tracemalloc
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.measurement import LEVEL_NAMES, PHYSICAL_QUANTITIES_TO_AVERAGE
+from nilmtk.metergroup import combine_chunks_from_generators
+from nilmtk.timeframe import TimeFrame
+
+N_METERS = 20
+N_SAMPLES = 2 * 10**5
+REPEAT = 3
+COLUMNS = pd.MultiIndex.from_tuples(
+    [("power", "active"), ("power", "reactive"), ("voltage", "")], names=LEVEL_NAMES
+)
+
+
+class FakeMeter(object):
+    def __init__(self, identifier, chunk):
+        self.identifier = identifier
+        self.chunk = chunk
+
+    def load(self, **kwargs):
+        yield self.chunk
+
+
+def make_meters(index, n_meters=N_METERS):
+    rng = np.random.default_rng(0)
+    meters = []
+    for i in range(n_meters):
+        values = rng.uniform(0, 3000, size=(len(index), len(COLUMNS)))
+        values[rng.random(len(index)) < 0.05] = np.nan
+        chunk = pd.DataFrame(values.astype(np.float32), index=index, columns=COLUMNS)
+        chunk.attrs["timeframe"] = TimeFrame(index[0], index[-1])
+        meters.append(FakeMeter(i, chunk))
+    return meters
+
+
+def legacy_combine_chunks_from_generators(index, columns, meters, kwargs):
+    """The previous implementation of `combine_chunks_from_generators`."""
+    DTYPE = np.float32
+    cumulator = pd.DataFrame(np.nan, index=index, columns=columns, dtype=DTYPE)
+    cumulator_arr = cumulator.values
+    columns_to_average_counter = pd.DataFrame(dtype=np.uint16)
+    timeframe = None
+    for meter in meters:
+        kwargs_copy = deepcopy(kwargs)
+        generator = meter.load(**kwargs_copy)
+        try:
+            chunk_from_next_meter = next(generator)
+        except StopIteration:
+            continue
+        del generator
+        del kwargs_copy
+        gc.collect()
+        if timeframe is None:
+            timeframe = chunk_from_next_meter.attrs["timeframe"]
+        else:
+            timeframe = timeframe.union(chunk_from_next_meter.attrs["timeframe"])
+        for i, column_name in enumerate(columns):
+            try:
+                column = chunk_from_next_meter[column_name]
+            except KeyError:
+                continue
+            aligned = column.reindex(index, copy=False).values
+            del column
+            cumulator_col = cumulator_arr[:, i]
+            where_both_are_nan = np.isnan(cumulator_col) & np.isnan(aligned)
+            np.nansum([cumulator_col, aligned], axis=0, out=cumulator_col, dtype=DTYPE)
+            cumulator_col[where_both_are_nan] = np.nan
+            del aligned
+            del where_both_are_nan
+            gc.collect()
+        physical_quantities = chunk_from_next_meter.columns.get_level_values(
+            "physical_quantity"
+        )
+        columns_to_average = set(PHYSICAL_QUANTITIES_TO_AVERAGE).intersection(
+            physical_quantities
+        )
+        if columns_to_average:
+            counter_increment = pd.DataFrame(
+                1,
+                columns=list(columns_to_average),
+                dtype=np.uint16,
+                index=chunk_from_next_meter.index,
+            )
+            columns_to_average_counter = columns_to_average_counter.add(
+                counter_increment, fill_value=0
+            )
+            del counter_increment
+        del chunk_from_next_meter
+        gc.collect()
+    del cumulator_arr
+    gc.collect()
+    for column in columns_to_average_counter:
+        cumulator[column] /= columns_to_average_counter[column]
+    del columns_to_average_counter
+    gc.collect()
+    cumulator.attrs["timeframe"] = timeframe
+    return cumulator
+
+
+def measure(func, index, meters):
+    seconds = min(
+        timeit.repeat(lambda: func(index, COLUMNS, meters, {}), number=1, repeat=REPEAT)
+    )
+    tracemalloc.start()
+    func(index, COLUMNS, meters, {})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    index = pd.date_range("2014-01-01", periods=N_SAMPLES, freq="6s")
+    meters = make_meters(index)
+    # A large heap makes each full collection more expensive
+    heap = [list(range(10)) for _ in range(10**5)]
+
+    print(
+        "{:d} meters x {:d} samples x {:d} columns, best of {:d}:".format(
+            N_METERS, N_SAMPLES, len(COLUMNS), REPEAT
+        )
+    )
+    for name, func in [
+        ("legacy", legacy_combine_chunks_from_generators),
+        ("buffered", combine_chunks_from_generators),
+    ]:
+        seconds, peak = measure(func, index, meters)
+        print(
+            "  {:<10s}{:8.1f} ms {:8.1f} MiB peak".format(
+                name, seconds * 1e3, peak / 2**20
+            )
+        )
+    del heap
+
+
+if __name__ == "__main__":
+    main()
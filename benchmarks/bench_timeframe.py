@@ -0,0 +1,67 @@
+"""Micro-benchmark for TimeFrame construction, intersection, sorting and
+hashing.
+
+Run with::
+
+    python benchmarks/bench_timeframe.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.timeframe import TimeFrame
+
+N_TIMEFRAMES = 20000
+REPEAT = 5
+
+
+def make_timestamps(n=N_TIMEFRAMES):
+    rng = np.random.default_rng(0)
+    starts = pd.Timestamp("2014-01-01", tz="Europe/London") + pd.to_timedelta(
+        np.sort(rng.integers(0, 10**15, size=n)), unit="ns"
+    )
+    ends = starts + pd.to_timedelta(rng.integers(1, 10**12, size=n), unit="ns")
+    return list(starts), list(ends)
+
+
+def best_of(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    starts, ends = make_timestamps()
+    timeframes = [TimeFrame(start, end) for start, end in zip(starts, ends)]
+    shifted = timeframes[1:] + timeframes[:1]
+
+    results = {
+        "construction": best_of(
+            lambda: [TimeFrame(start, end) for start, end in zip(starts, ends)]
+        ),
+        "intersection": best_of(
+            lambda: [a.intersection(b) for a, b in zip(timeframes, shifted)]
+        ),
+        "adjacent": best_of(
+            lambda: [a.adjacent(b, gap=1) for a, b in zip(timeframes, shifted)]
+        ),
+        "sort": best_of(lambda: sorted(shifted)),
+        "hash": best_of(lambda: set(timeframes)),
+    }
+    if hasattr(TimeFrame, "from_ns"):
+        tz = starts[0].tz
+        starts_ns = [start.value for start in starts]
+        ends_ns = [end.value for end in ends]
+        results["from_ns"] = best_of(
+            lambda: [
+                TimeFrame.from_ns(start, end, tz)
+                for start, end in zip(starts_ns, ends_ns)
+            ]
+        )
+    print("{:d} TimeFrames, best of {:d}:".format(N_TIMEFRAMES, REPEAT))
+    for name, seconds in results.items():
+        print("  {:<14s}{:8.1f} ms".format(name, seconds * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark for `get_total_energy` against the previous per-column
+implementation, which copied each column with `dropna()` and called
+`gc.collect()` for every power column.
+
+Run with::
+
+    python benchmarks/bench_totalenergy.py
+"""
+
+import gc
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.stats.totalenergy import get_total_energy, select_energy_columns
+from nilmtk.utils import timedelta64_to_secs
+
+N_SAMPLES = 2 * 10**6
+MAX_SAMPLE_PERIOD = 20
+REPEAT = 5
+
+
+def make_chunk(n=N_SAMPLES):
+    rng = np.random.default_rng(0)
+    secs = np.cumsum(rng.choice([1, 1, 1, 2, 30], size=n))
+    index = pd.Timestamp("2014-01-01", tz="Europe/London") + pd.to_timedelta(
+        secs, unit="s"
+    )
+    columns = pd.MultiIndex.from_tuples(
+        [("power", "active"), ("power", "reactive"), ("power", "apparent")],
+        names=["physical_quantity", "type"],
+    )
+    values = rng.uniform(0, 3000, size=(n, len(columns)))
+    # One AC type has occasional dropouts
+    values[rng.random(n) < 0.01, 2] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def per_column_total_energy(df, max_sample_period):
+    """The previous implementation of `get_total_energy`."""
+    energy = {}
+    for physical_quantity, ac_type in select_energy_columns(df.columns):
+        series = df[(physical_quantity, ac_type)].dropna()
+        timedelta = np.diff(series.index.values)
+        timedelta_secs = timedelta64_to_secs(timedelta)
+        del timedelta
+        gc.collect()
+        timedelta_secs = timedelta_secs.clip(max=max_sample_period)
+        joules = (timedelta_secs * series.values[:-1]).sum()
+        energy[ac_type] = joules / JOULES_PER_KWH
+    return energy
+
+
+def best_of(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    df = make_chunk()
+    expected = per_column_total_energy(df, MAX_SAMPLE_PERIOD)
+    energy = get_total_energy(df, MAX_SAMPLE_PERIOD)
+    for ac_type, value in expected.items():
+        np.testing.assert_allclose(energy[ac_type], value, rtol=1e-9)
+
+    results = {
+        "per-column": best_of(lambda: per_column_total_energy(df, MAX_SAMPLE_PERIOD)),
+        "vectorised": best_of(lambda: get_total_energy(df, MAX_SAMPLE_PERIOD)),
+    }
+    print("{:d} samples x 3 AC types, best of {:d}:".format(len(df), REPEAT))
+    for name, seconds in results.items():
+        print("  {:<12s}{:8.1f} ms".format(name, seconds * 1e3))
+
+
+if __name__ == "__main__":
+    main()
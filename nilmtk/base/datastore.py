@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from threading import RLock
 from typing import Iterator, Optional, Union
 
 import pandas as pd
@@ -31,6 +32,10 @@ class DataStore(ABC):
     ----------
     window : nilmtk.TimeFrame
         Defines the timeframe we are interested in.
+    lock : threading.RLock
+        Held while reading from the physical store, or changing the
+        DataStore's state, so that several threads can load from the
+        same DataStore at once.
     """
 
     def __init__(self):
@@ -40,6 +45,28 @@ class DataStore(ABC):
         filename : string
         """
         self.window = TimeFrame()
+        self.lock = RLock()
+        # For each key, whether every section of the last `load(key)`
+        # fitted in a single chunk
+        self._sections_fit_in_one_chunk = {}
+
+    def sections_fit_in_one_chunk(self, key: str) -> bool:
+        """Returns False if a section in the last `load(key)` needed
+        more than one chunk.  Each key is tracked separately, so loads
+        of different keys can run at the same time."""
+        with self.lock:
+            return self._sections_fit_in_one_chunk.get(key, True)
+
+    @property
+    def all_sections_smaller_than_chunksize(self) -> bool:
+        """False if a section in the last load of any key needed more
+        than one chunk.  Use `sections_fit_in_one_chunk` for one key."""
+        with self.lock:
+            return all(self._sections_fit_in_one_chunk.values())
+
+    def _set_sections_fit_in_one_chunk(self, key: str, fit: bool) -> None:
+        with self.lock:
+            self._sections_fit_in_one_chunk[key] = fit
 
     @abstractmethod
     def __getitem__(self, key: str) -> Union[pd.DataFrame, pd.Series]:
@@ -196,6 +223,15 @@ class DataStore(ABC):
         nilmtk.TimeFrame of entire table after intersecting with self.window.
         """
 
+    def n_rows(self, key: str, timeframe: Optional[TimeFrame] = None) -> Optional[int]:
+        """
+        Returns
+        -------
+        Number of rows of `key` within `timeframe` and self.window, or
+        None if the number of rows cannot be found without loading the data.
+        """
+        return None
+
     @staticmethod
     def join_key(*args) -> str:
         """
@@ -3,7 +3,7 @@ import copy
 import pandas as pd
 
 from nilmtk.timeframe.timeframe import TimeFrame
-from nilmtk.utils import get_tz, tz_localize_naive
+from nilmtk.utils import datetime_index_to_ns, get_tz, tz_localize_naive
 
 
 class Results(object):
@@ -199,13 +199,12 @@ class Results(object):
 
     def timeframes(self):
         """Returns a list of timeframes covered by this Result."""
-        # For some reason, using `iterrows()` messes with the
-        # timezone of the index, hence we need to 'manually' iterate
-        # over the rows.
-        return [
-            TimeFrame(self._data.index[i], self._data.iloc[i]["end"])
-            for i in range(len(self._data))
-        ]
+        if self._data.empty:
+            return []
+        tz = get_tz(self._data)
+        starts = datetime_index_to_ns(self._data.index).tolist()
+        ends = datetime_index_to_ns(self._data["end"]).tolist()
+        return [TimeFrame.from_ns(start, end, tz) for start, end in zip(starts, ends)]
 
     def _columns_with_end_removed(self):
         cols = set(self._data.columns)
@@ -184,15 +184,10 @@ class DataSet(object):
                 )
                 print("Computing activations for", key)
 
-                activations = meter.get_activations()
-                starts = []
-                ends = []
-                for activation in activations:
-                    starts.append(activation.index[0])
-                    ends.append(activation.index[-1])
+                activations = meter.activation_records()
+                starts = pd.Series(True, index=pd.DatetimeIndex(activations["start"]))
+                ends = pd.Series(False, index=pd.DatetimeIndex(activations["end"]))
                 del activations
-                starts = pd.Series(True, index=starts)
-                ends = pd.Series(False, index=ends)
                 script = pd.concat([starts, ends])
                 script = script.sort_index()
                 store[key] = script
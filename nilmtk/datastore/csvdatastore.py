@@ -50,7 +50,7 @@ class CSVDataStore(DataStore):
         sections = [TimeFrame()] if sections is None else sections
         sections = TimeFrameGroup(sections)
 
-        self.all_sections_smaller_than_chunksize = True
+        self._set_sections_fit_in_one_chunk(key, True)
 
         # iterate through parameter sections
         # requires 1 pass through file for each section
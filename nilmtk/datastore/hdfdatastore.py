@@ -37,6 +37,8 @@ class HDFDataStore(DataStore):
         # TODO: calculate chunksize default based on physical
         # memory installed and number of columns
 
+        requested_key = key
+
         # Make sure key has a slash at the front but not at the end.
         if key[0] != "/":
             key = "/" + key
@@ -58,7 +60,7 @@ class HDFDataStore(DataStore):
             f"HDFDataStore.load({key=}, {columns=}, {sections=}, {n_look_ahead_rows=}, {chunksize=})"
         )
 
-        self.all_sections_smaller_than_chunksize = True
+        self._set_sections_fit_in_one_chunk(requested_key, True)
 
         for section in sections:
             LOGGER.debug(f"{section=}")
@@ -73,7 +75,8 @@ class HDFDataStore(DataStore):
             terms = window_intersect.query_terms("window_intersect")
             if terms is None:
                 section_start_i = 0
-                section_end_i = self.store.get_storer(key).nrows  # type: ignore
+                with self.lock:
+                    section_end_i = self.store.get_storer(key).nrows  # type: ignore
                 if section_end_i <= 1:
                     data = pd.DataFrame()
                     data.attrs["timeframe"] = section
@@ -81,7 +84,8 @@ class HDFDataStore(DataStore):
                     continue
             else:
                 try:
-                    coords = self.store.select_as_coordinates(key=key, where=terms)  # type: ignore
+                    with self.lock:
+                        coords = self.store.select_as_coordinates(key=key, where=terms)  # type: ignore
                 except AttributeError as e:
                     if str(e) == (
                         "'NoneType' object has no attribute " "'read_coordinates'"
@@ -104,7 +108,7 @@ class HDFDataStore(DataStore):
             n_chunks = int(np.ceil((section_end_i - section_start_i) / chunksize))
 
             if n_chunks > 1:
-                self.all_sections_smaller_than_chunksize = False
+                self._set_sections_fit_in_one_chunk(requested_key, False)
 
             for chunk_i, chunk_start_i in enumerate(slice_starts):
                 chunk_end_i = chunk_start_i + chunksize
@@ -114,9 +118,10 @@ class HDFDataStore(DataStore):
                     chunk_end_i = section_end_i
                 chunk_end_i += 1
 
-                data = self.store.select(
-                    key=key, columns=columns, start=chunk_start_i, stop=chunk_end_i
-                )  # type: ignore
+                with self.lock:
+                    data = self.store.select(
+                        key=key, columns=columns, start=chunk_start_i, stop=chunk_end_i
+                    )  # type: ignore
 
                 # if len(data) <= 2:
                 #     yield pd.DataFrame()
@@ -127,12 +132,13 @@ class HDFDataStore(DataStore):
                         look_ahead_start_i = chunk_end_i
                         look_ahead_end_i = look_ahead_start_i + n_look_ahead_rows
                         try:
-                            look_ahead = self.store.select(
-                                key=key,
-                                columns=columns,
-                                start=look_ahead_start_i,
-                                stop=look_ahead_end_i,
-                            )
+                            with self.lock:
+                                look_ahead = self.store.select(
+                                    key=key,
+                                    columns=columns,
+                                    start=look_ahead_start_i,
+                                    stop=look_ahead_end_i,
+                                )
                         except ValueError:
                             look_ahead = pd.DataFrame()
                     else:
@@ -278,6 +284,9 @@ class HDFDataStore(DataStore):
         else:
             return est_mem_usage_for_data + est_mem_usage_for_index
 
+    def n_rows(self, key: str, timeframe: Optional[TimeFrame] = None) -> int:
+        return self._nrows(key, timeframe)
+
     def _nrows(self, key, timeframe=None):
         """
         Returns
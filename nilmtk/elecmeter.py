@@ -18,7 +18,14 @@ from nilmtk.measurement import (
     select_best_ac_type,
 )
 from nilmtk.preprocessing import Clip
-from nilmtk.stats import DropoutRate, GoodSections, TotalEnergy
+from nilmtk.stats import (
+    DropoutRate,
+    EnergyIndex,
+    EnergyPerPeriod,
+    GoodSections,
+    PowerQuantiles,
+    TotalEnergy,
+)
 from nilmtk.timeframe.timeframegroup import TimeFrameGroup
 from nilmtk.utils import capitalise_first_letter, flatten_2d_list
 
@@ -590,6 +597,19 @@ class ElecMeter(Hashable, Electric):
     def get_metadata(self):
         return self.metadata
 
+    def _estimate_n_rows(self, sections=None, **kwargs):
+        """Uses the number of rows in the store, unless the data are to
+        be resampled."""
+        if kwargs.get("resample") or kwargs.get("sample_period") is not None:
+            return super(ElecMeter, self)._estimate_n_rows(sections=sections, **kwargs)
+        self._check_store()
+        if sections is None:
+            sections = [None]
+        n_rows = [self.store.n_rows(self.key, section) for section in sections]
+        if None in n_rows:
+            return super(ElecMeter, self)._estimate_n_rows(sections=sections, **kwargs)
+        return sum(n_rows)
+
     def get_source_node(self, **loader_kwargs):
         if self.store is None:
             raise RuntimeError("Cannot get source node if meter.store is None!")
@@ -601,10 +621,18 @@ class ElecMeter(Hashable, Electric):
         self.metadata["device"] = self.device
         return Node(self, generator=generator)
 
-    def total_energy(self, **loader_kwargs):
+    def total_energy(self, use_energy_index=False, **loader_kwargs):
         """
         Parameters
         ----------
+        use_energy_index : bool, default=False
+            If True then look up the energy for whole minutes in
+            `energy_index()` and only load the raw data for the
+            partial minutes at the edges of each section.  The energy of
+            each sample is assigned to the minute containing that
+            sample so, at each section boundary, the result may differ
+            from `use_energy_index=False` by the energy of one sample.
+            Ignored if `full_results` or `preprocessing` are set.
         full_results : bool, default=False
         **loader_kwargs : key word arguments for DataStore.load()
 
@@ -613,11 +641,166 @@ class ElecMeter(Hashable, Electric):
         if `full_results` is True then return TotalEnergyResults object
         else returns a pd.Series with a row for each AC type.
         """
+        if (
+            use_energy_index
+            and not loader_kwargs.get("full_results")
+            and loader_kwargs.get("preprocessing") is None
+        ):
+            return self._total_energy_from_index(**loader_kwargs)
         nodes = [Clip, TotalEnergy]
         return self._get_stat_from_cache_or_compute(
             nodes, TotalEnergy.results_class(), loader_kwargs
         )
 
+    def _total_energy_from_index(self, sections=None, **loader_kwargs):
+        if sections is None:
+            tf = self.get_timeframe()
+            tf.include_end = True
+            sections = [tf]
+        index_kwargs = {}
+        if "chunksize" in loader_kwargs:
+            index_kwargs["chunksize"] = loader_kwargs["chunksize"]
+        energy, edges = self.energy_index(**index_kwargs).energy(sections)
+        if edges:
+            edge_energy = self.total_energy(sections=edges, **loader_kwargs)
+            energy = energy.add(edge_energy, fill_value=0)
+
+        if "ac_type" in loader_kwargs or "physical_quantity" in loader_kwargs:
+            loader_kwargs = self._convert_physical_quantity_and_ac_type_to_cols(
+                **loader_kwargs
+            )
+        if loader_kwargs.get("columns"):
+            ac_types = [ac_type for _, ac_type in loader_kwargs["columns"]]
+            energy = energy[energy.index.intersection(ac_types)]
+        return energy
+
+    def energy_index(self, resolution="1min", **loader_kwargs):
+        """Energy per fixed-width time bin, computed in a single pass over
+        all the data and then cached.  Used by
+        `total_energy(use_energy_index=True)`.
+
+        Parameters
+        ----------
+        resolution : str or pd.Timedelta, default='1min'
+            Width of each bin.
+        **loader_kwargs : key word arguments for DataStore.load()
+
+        Returns
+        -------
+        nilmtk.stats.EnergyIndexResults
+        """
+        results_obj = EnergyIndex.results_class(resolution)
+        key_for_cached_stat = self.key_for_cached_stat(results_obj.cache_name)
+        cached_stat = self.get_cached_stat(key_for_cached_stat)
+        if not cached_stat.empty:
+            results_obj.import_from_cache(cached_stat)
+            return results_obj
+
+        energy_index = EnergyIndex(
+            Clip(self.get_source_node(**loader_kwargs)), resolution=resolution
+        )
+        energy_index.run()
+        results_obj = energy_index.results
+        if not results_obj._data.empty:
+            self.cache.put(key_for_cached_stat, results_obj.export_to_cache())
+        return results_obj
+
+    def energy_per_period(self, offset_alias="D", full_results=False, **loader_kwargs):
+        """Energy per calendar period, in the timezone of the data.
+
+        Unless `sections` or `preprocessing` are specified, the energy
+        per period is computed for all the data once and then cached.
+
+        Parameters
+        ----------
+        offset_alias : str, default='D'
+            A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+        full_results : bool, default=False
+        **loader_kwargs : key word arguments for DataStore.load()
+
+        Returns
+        -------
+        if `full_results` is True then return EnergyPerPeriodResults object
+        else returns a pd.DataFrame with a row for each period (indexed by
+        the start of the period) and a column for each AC type.
+        """
+        loader_kwargs = self._convert_physical_quantity_and_ac_type_to_cols(
+            **loader_kwargs
+        )
+        ac_types = [ac_type for _, ac_type in loader_kwargs.pop("columns")]
+        use_cache = (
+            loader_kwargs.get("sections") is None
+            and loader_kwargs.get("preprocessing") is None
+        )
+
+        results_obj = EnergyPerPeriod.results_class(offset_alias)
+        key_for_cached_stat = self.key_for_cached_stat(results_obj.cache_name)
+        if use_cache:
+            results_obj.import_from_cache(self.get_cached_stat(key_for_cached_stat))
+
+        if results_obj._data.empty:
+            energy_per_period = EnergyPerPeriod(
+                Clip(self.get_source_node(**loader_kwargs)), offset_alias=offset_alias
+            )
+            energy_per_period.run()
+            results_obj = energy_per_period.results
+            if use_cache and not results_obj._data.empty:
+                self.cache.put(key_for_cached_stat, results_obj.export_to_cache())
+        else:
+            LOGGER.debug("Using cached result.")
+
+        if full_results:
+            return results_obj
+        energy = results_obj.simple()
+        return energy[[ac_type for ac_type in energy.columns if ac_type in ac_types]]
+
+    def power_quantile_sketch(self, full_results=False, **loader_kwargs):
+        """Sketches the distribution of power values in one pass over the
+        data, in bounded memory.
+
+        Unless `sections`, `preprocessing` or `ac_type` are specified,
+        the sketch covers the good sections of the meter and is computed
+        once and then cached.
+
+        Parameters
+        ----------
+        full_results : bool, default=False
+        **loader_kwargs : key word arguments for DataStore.load()
+
+        Returns
+        -------
+        if `full_results` is True then return PowerQuantilesResults object
+        else returns a nilmtk.stats.quantilesketch.QuantileSketch.
+        """
+        use_cache = all(
+            loader_kwargs.get(kwarg) is None
+            for kwarg in ["sections", "preprocessing", "ac_type"]
+        )
+        if loader_kwargs.get("sections") is None:
+            loader_kwargs["sections"] = self.good_sections()
+        loader_kwargs["physical_quantity"] = "power"
+        loader_kwargs.setdefault("ac_type", "best")
+
+        results_obj = PowerQuantiles.results_class()
+        key_for_cached_stat = self.key_for_cached_stat(results_obj.cache_name)
+        if use_cache:
+            results_obj.import_from_cache(self.get_cached_stat(key_for_cached_stat))
+
+        if results_obj.sketch.n == 0:
+            power_quantiles = PowerQuantiles(
+                Clip(self.get_source_node(**loader_kwargs))
+            )
+            power_quantiles.run()
+            results_obj = power_quantiles.results
+            if use_cache and results_obj.sketch.n > 0:
+                self.cache.put(key_for_cached_stat, results_obj.export_to_cache())
+        else:
+            LOGGER.debug("Using cached result.")
+
+        if full_results:
+            return results_obj
+        return results_obj.simple()
+
     def dropout_rate(self, ignore_gaps=True, **loader_kwargs):
         """
         Parameters
@@ -1,26 +1,25 @@
-import gc
-from math import log
 from warnings import warn
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import scipy.spatial as ss
 from pandas.plotting import autocorrelation_plot, lag_plot
 from scipy import fft
-from scipy.special import digamma
 
 from nilmtk.appliance import DEFAULT_ON_POWER_THRESHOLD
 from nilmtk.measurement import select_best_ac_type
-from nilmtk.preprocessing import Apply
-from nilmtk.stats import histogram_from_generator
+from nilmtk.preprocessing import Resample
+from nilmtk.seriesbuffer import SeriesBuffer
+from nilmtk.stats.activations import ActivationDetector, slice_activations
+from nilmtk.stats.align import align_streams
+from nilmtk.stats.correlation import CoMoments
+from nilmtk.stats.decimate import MinMaxDecimator
+from nilmtk.stats.entropy import knn_entropy, knn_mutual_information, reservoir_sample
+from nilmtk.stats.histogram import activity_histogram_from_generator
+from nilmtk.stats.quantilesketch import QUANTILES, QuantileSketch
+from nilmtk.stats.switchevents import switch_events
 from nilmtk.timeframe.timeframe import TimeFrame
-from nilmtk.utils import (
-    flatten_2d_list,
-    offset_alias_to_seconds,
-    safe_resample,
-    timedelta64_to_secs,
-)
+from nilmtk.utils import offset_alias_to_seconds, timedelta64_to_secs
 
 MAX_SIZE_ENTROPY = 10000
 
@@ -99,7 +98,35 @@ class Electric(object):
                 return True
         return False
 
-    def power_series_all_data(self, **kwargs):
+    def power_series_all_data(self, preallocate=False, memory_budget=None, **kwargs):
+        """Loads all the power data into a single pd.Series.
+
+        Parameters
+        ----------
+        preallocate : bool, default=False
+            If True then copy each chunk into a single preallocated
+            float32 array, sized from the number of rows in the store,
+            rather than concatenating all the chunks at the end.  This
+            halves the peak memory use.
+        memory_budget : int, optional
+            Bytes.  If the preallocated arrays would be larger than this
+            then they are memory-mapped temporary files.  Implies
+            `preallocate=True`.
+        **kwargs : key word arguments for `power_series`
+
+        Returns
+        -------
+        pd.Series or None if there is no data.  If `preallocate` is True
+        then the Series is a view of the preallocated arrays.
+        """
+        if preallocate or memory_budget is not None:
+            buffer = SeriesBuffer(
+                self._estimate_n_rows(**kwargs), memory_budget=memory_budget
+            )
+            for series in self.power_series(**kwargs):
+                buffer.append(series)
+            return buffer.to_series()
+
         chunks = []
         for series in self.power_series(**kwargs):
             if len(series) > 0:
@@ -118,6 +145,22 @@ class Electric(object):
             all_data = None
         return all_data
 
+    def _estimate_n_rows(self, sections=None, sample_period=None, **kwargs):
+        """Estimates the number of rows which `power_series` will return,
+        from the duration of `sections` and the sample period."""
+        if sample_period is None:
+            sample_period = self.sample_period()
+        timeframe = self.get_timeframe()
+        if sections is None:
+            sections = [timeframe]
+        n_rows = 0
+        for section in sections:
+            section = timeframe.intersection(section)
+            if not section.empty and section.timedelta is not None:
+                seconds = section.timedelta.total_seconds()
+                n_rows += int(seconds // sample_period) + 1
+        return n_rows
+
     def _prep_kwargs_for_sample_period_and_resample(
         self, sample_period=None, resample=False, resample_kwargs=None, **kwargs
     ):
@@ -137,12 +180,15 @@ class Electric(object):
         if resample:
             if resample_kwargs is None:
                 resample_kwargs = {}
-
-            def resample_func(df):
-                resample_kwargs["rule"] = "{:d}s".format(sample_period)
-                return safe_resample(df, **resample_kwargs)
-
-            kwargs.setdefault("preprocessing", []).append(Apply(func=resample_func))
+            if "rule" in resample_kwargs:
+                raise ValueError(
+                    "`resample_kwargs` must not contain 'rule'."
+                    "  Please use the `sample_period` parameter instead."
+                )
+            resample_node = Resample(
+                rule="{:d}s".format(sample_period), **resample_kwargs
+            )
+            kwargs.setdefault("preprocessing", []).append(resample_node)
 
         return kwargs
 
@@ -162,6 +208,7 @@ class Electric(object):
         plot_legend=True,
         unit="W",
         plot_kwargs=None,
+        decimate=True,
         **kwargs
     ):
         """
@@ -173,6 +220,12 @@ class Electric(object):
         plot_legend : boolean, optional
             Defaults to True.  Set to False to not plot legend.
         unit : {'W', 'kW'}
+        decimate : boolean, optional
+            Defaults to True.  Plot the minimum and maximum power in each
+            of `width` bins, found in one pass over the raw data, so
+            spikes are not smoothed away.  If False, or if `sample_period`
+            is given, then plot the data resampled to `sample_period`
+            (which defaults to the duration / `width`).
         **kwargs
         """
         # Get start and end times for the plot
@@ -181,9 +234,12 @@ class Electric(object):
             return ax
 
         kwargs["sections"] = [timeframe]
-        kwargs = self._set_sample_period(timeframe, **kwargs)
-        power_series = self.power_series_all_data(**kwargs)
-        if power_series is None or power_series.empty:
+        if decimate and kwargs.get("sample_period") is None:
+            power_series = self._decimated_power_series(timeframe, **kwargs)
+        else:
+            kwargs = self._set_sample_period(timeframe, **kwargs)
+            power_series = self.power_series_all_data(**kwargs)
+        if power_series is None or power_series.isnull().all():
             return ax
 
         if unit == "kW":
@@ -203,6 +259,14 @@ class Electric(object):
 
         return ax
 
+    def _decimated_power_series(self, timeframe, width=800, **kwargs):
+        """Returns the minimum and maximum power in each of `width` bins
+        of `timeframe`.  See `MinMaxDecimator`."""
+        decimator = MinMaxDecimator(timeframe.start, timeframe.end, width)
+        for chunk in self.power_series(**kwargs):
+            decimator.update(chunk)
+        return decimator.to_series()
+
     def _set_sample_period(self, timeframe, width=800, **kwargs):
         # Calculate the resolution for the x axis
         if kwargs.get("sample_period", None) is None:
@@ -226,10 +290,54 @@ class Electric(object):
         else:
             return proportion_of_energy
 
-    def vampire_power(self, **load_kwargs):
-        # TODO: this might be a naive approach to calculating vampire power.
-        power_series = self.power_series_all_data(**load_kwargs)
-        return get_vampire_power(power_series)
+    def vampire_power(self, quantile=0.01, **load_kwargs):
+        """Estimates the standby power as a low quantile of the power
+        distribution, which, unlike the minimum, is robust to spurious
+        low readings.
+
+        Parameters
+        ----------
+        quantile : float, default=0.01
+        **load_kwargs : key word arguments for `power_quantile_sketch`
+
+        Returns
+        -------
+        float, watts
+        """
+        return self.power_quantile_sketch(**load_kwargs).quantile(quantile)
+
+    def power_quantile_sketch(self, **load_kwargs):
+        """Sketches the distribution of power values in one pass over the
+        data, in bounded memory.
+
+        Parameters
+        ----------
+        **load_kwargs : key word arguments for `power_series`
+
+        Returns
+        -------
+        nilmtk.stats.quantilesketch.QuantileSketch
+        """
+        sketch = QuantileSketch()
+        for chunk in self.power_series(**load_kwargs):
+            sketch.update(chunk.to_numpy())
+        return sketch
+
+    def power_quantiles(self, q=QUANTILES, **load_kwargs):
+        """Approximate quantiles of power.
+
+        Parameters
+        ----------
+        q : float or list of floats in [0, 1]
+        **load_kwargs : key word arguments for `power_quantile_sketch`
+
+        Returns
+        -------
+        pd.Series of watts, indexed by `q`
+        """
+        q = np.atleast_1d(q)
+        sketch = self.power_quantile_sketch(**load_kwargs)
+        return pd.Series(sketch.quantile(q), index=q, name="power")
 
     def uptime(self, **load_kwargs):
         """
@@ -252,6 +360,8 @@ class Electric(object):
             A Pandas `offset alias`.  See:
             pandas.pydata.org/pandas-docs/stable/timeseries.html#offset-aliases
         use_uptime : bool
+        use_energy_index : bool, default=False
+            Passed to `total_energy()`.
 
         Returns
         -------
@@ -265,6 +375,7 @@ class Electric(object):
                 " 'average_energy_per_period'.  Instead"
                 " use 'use_uptime' param."
             )
+        use_energy_index = load_kwargs.pop("use_energy_index", False)
         if use_uptime:
             td = self.uptime(**load_kwargs)
         else:
@@ -273,7 +384,7 @@ class Electric(object):
             return np.nan
         uptime_secs = td.total_seconds()
         periods = uptime_secs / offset_alias_to_seconds(offset_alias)
-        energy = self.total_energy(**load_kwargs)
+        energy = self.total_energy(use_energy_index=use_energy_index, **load_kwargs)
         return energy / periods
 
     def proportion_of_energy(self, other, **loader_kwargs):
@@ -286,20 +397,27 @@ class Electric(object):
         ----------
         other : nilmtk.MeteGroup or ElecMeter
             Typically this will be mains.
+        use_energy_index : bool, default=False
+            Passed to `total_energy()`.
 
         Returns
         -------
         float [0,1] or NaN if other.total_energy == 0
         """
+        use_energy_index = loader_kwargs.pop("use_energy_index", False)
         good_other_sections = other.good_sections(**loader_kwargs)
         loader_kwargs.setdefault("sections", good_other_sections)
 
         # TODO test effect of setting `sections` for other
-        other_total_energy = other.total_energy(**loader_kwargs)
+        other_total_energy = other.total_energy(
+            use_energy_index=use_energy_index, **loader_kwargs
+        )
         if other_total_energy.sum() == 0:
             return np.nan
 
-        total_energy = self.total_energy(**loader_kwargs)
+        total_energy = self.total_energy(
+            use_energy_index=use_energy_index, **loader_kwargs
+        )
         if total_energy.empty:
             return 0.0
 
@@ -326,9 +444,14 @@ class Electric(object):
     def correlation(self, other, **load_kwargs):
         """
         Finds the correlation between the two ElecMeters. Both the ElecMeters
-        should be perfectly aligned
-        Adapted from:
-        http://www.johndcook.com/blog/2008/11/05/how-to-calculate-pearson-correlation-accurately/
+        should be perfectly aligned.
+
+        Both meters are read once and aligned onto a shared grid with
+        `nilmtk.stats.align.align_streams`, so samples are paired by time
+        however the meters' chunks are cut.  Each aligned chunk is
+        summarised with `nilmtk.stats.correlation.CoMoments` and merged
+        into the running state, which is numerically stable.  Only
+        timestamps where both meters have a value are used.
 
         Parameters
         ----------
@@ -341,53 +464,10 @@ class Electric(object):
         sample_period = max(self.sample_period(), other.sample_period())
         load_kwargs.setdefault("sample_period", sample_period)
 
-        def sum_and_count(electric):
-            n = 0
-            cumulator = 0.0
-            for power in electric.power_series(**load_kwargs):
-                n += len(power.index)
-                cumulator += power.sum()
-            return n, cumulator
-
-        x_n, x_sum = sum_and_count(self)
-        if x_n <= 1:
-            return np.nan
-
-        y_n, y_sum = sum_and_count(other)
-        if y_n <= 1:
-            return np.nan
-
-        x_bar = x_sum / x_n
-        y_bar = y_sum / y_n
-
-        # Second pass is used to find x_s and y_s (std.devs)
-        def stdev(electric, mean, n):
-            s_square_sum = 0.0
-            for power in electric.power_series(**load_kwargs):
-                s_square_sum += ((power - mean) * (power - mean)).sum()
-            s_square = s_square_sum / (n - 1)
-            return np.sqrt(s_square)
-
-        x_s = stdev(self, x_bar, x_n)
-        y_s = stdev(other, y_bar, y_n)
-
-        numerator = 0.0
-        for x_power, y_power in zip(
-            self.power_series(**load_kwargs), other.power_series(**load_kwargs)
-        ):
-            xi_minus_xbar = x_power - x_bar
-            del x_power
-            gc.collect()
-            yi_minus_ybar = y_power - y_bar
-            del y_power
-            gc.collect()
-            numerator += (xi_minus_xbar * yi_minus_ybar).sum()
-            del xi_minus_xbar
-            del yi_minus_ybar
-            gc.collect()
-        denominator = (x_n - 1) * x_s * y_s
-        corr = numerator / denominator
-        return corr
+        comoments = CoMoments(2)
+        for xy in aligned_power_values([self, other], **load_kwargs):
+            comoments.update(xy)
+        return comoments.correlation()[0, 1]
 
     def plot_lag(self, lag=1, ax=None):
         """
@@ -459,10 +539,14 @@ class Electric(object):
         ----------
         ax : axes
         load_kwargs : dict
+            key word arguments for `power_quantile_sketch`
         plot_kwargs : dict
         range : None or tuple
             if range=(None, x) then on_power_threshold will be used as minimum.
+            if range=(x, None) then the maximum power will be used.
         **hist_kwargs
+            key word arguments for `QuantileSketch.histogram`.  If `bins`
+            is not given then uses one bin per watt.
 
         Returns
         -------
@@ -474,14 +558,20 @@ class Electric(object):
             load_kwargs = {}
         if plot_kwargs is None:
             plot_kwargs = {}
-        generator = self.power_series(**load_kwargs)
+        sketch = self.power_quantile_sketch(**load_kwargs)
 
         # set range
-        if range is None or range[0] is None:
-            maximum = None if range is None else range[1]
-            range = (self.on_power_threshold(), maximum)
-
-        hist, bins = histogram_from_generator(generator, range=range, **hist_kwargs)
+        if range is None:
+            range = (None, None)
+        minimum, maximum = range
+        if minimum is None:
+            minimum = self.on_power_threshold()
+        if maximum is None:
+            maximum = sketch.max
+        range = (minimum, maximum)
+        hist_kwargs.setdefault("bins", max(int(maximum - minimum), 1))
+
+        hist, bins = sketch.histogram(range=range, **hist_kwargs)
 
         # Plot
         plot_kwargs.setdefault("linewidth", 0.1)
@@ -492,129 +582,104 @@ class Electric(object):
         ax.set_ylabel("Count")
         return ax
 
-    def switch_times(self, threshold=40):
+    def switch_times(self, threshold=40, max_sample_period=None):
         """
-        Returns an array of pd.DateTime when a switch occurs as defined by threshold
+        Returns an array of times when a switch occurs as defined by threshold
 
         Parameters
         ----------
         threshold: int, threshold in Watts between succcessive readings
         to amount for an appliance state change
-        """
-
-        datetime_switches = []
-        for power in self.power_series():
-            delta_power = power.diff()
-            delta_power_absolute = delta_power.abs()
-            datetime_switches.append(
-                delta_power_absolute[
-                    (delta_power_absolute > threshold)
-                ].index.values.tolist()
-            )
-        return flatten_2d_list(datetime_switches)
+        max_sample_period : number, seconds, optional
+            Successive readings further apart than this are not compared.
 
-    def entropy(self, k=3, base=2):
+        Returns
+        -------
+        np.ndarray of int64 nanoseconds since the epoch (UTC)
         """
-        This implementation is provided courtesy NPEET toolbox,
-        the authors kindly allowed us to directly use their code.
-        As a courtesy procedure, you may wish to cite their paper,
-        in case you use this function.
-        This fails if there is a large number of records. Need to
-        ask the authors what to do about the same!
-        The classic K-L k-nearest neighbor continuous entropy estimator
-        x should be a list of vectors, e.g. x = [[1.3],[3.7],[5.1],[2.4]]
-        if x is a one-dimensional scalar and we have four samples
+        chunks = list(switch_events(self.power_series(), threshold, max_sample_period))
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def entropy(self, k=3, base=2, max_samples=None):
         """
+        The classic K-L k-nearest neighbor continuous entropy estimator.
+        See `nilmtk.stats.entropy.knn_entropy`.
 
-        def kdtree_entropy(z):
-            assert k <= len(z) - 1, "Set k smaller than num. samples - 1"
-            d = len(z[0])
-            N = len(z)
-            # small noise to break degeneracy, see doc.
-            intens = 1e-10
-            z = [list(p + intens * np.random.rand(len(z[0]))) for p in z]
-            tree = ss.cKDTree(z)
-            nn = [tree.query(point, k + 1, p=float("inf"))[0][k] for point in z]
-            const = digamma(N) - digamma(k) + d * log(2)
-            return (const + d * np.mean(map(log, nn))) / log(base)
+        Parameters
+        ----------
+        k : int
+        base : number, base of the logarithm
+        max_samples : int, optional
+            If None then the entropy is estimated for each block of
+            `MAX_SIZE_ENTROPY` samples and the estimates are averaged.
+            Otherwise the entropy is estimated once, from a uniform
+            random sample of up to `max_samples` samples drawn from
+            all the data.
+
+        Returns
+        -------
+        float
+        """
+        samples = (power.dropna().values for power in self.power_series())
+        if max_samples is not None:
+            x = reservoir_sample(samples, max_samples)
+            if len(x) <= k:
+                raise ValueError("Too few samples for k={:d}.".format(k))
+            return knn_entropy(x, k, base)
 
         out = []
-        for power in self.power_series():
-            x = power.values
-            num_elements = len(x)
-            x = x.reshape((num_elements, 1))
-            if num_elements > MAX_SIZE_ENTROPY:
-                splits = num_elements / MAX_SIZE_ENTROPY + 1
-                y = np.array_split(x, splits)
-                for z in y:
-                    out.append(kdtree_entropy(z))
-            else:
-                out.append(kdtree_entropy(x))
+        for x in samples:
+            for block in _split_into_blocks(x, k):
+                out.append(knn_entropy(block, k, base))
+        if not out:
+            raise ValueError("Too few samples for k={:d}.".format(k))
         return sum(out) / len(out)
 
-    def mutual_information(self, other, k=3, base=2):
+    def mutual_information(self, other, k=3, base=2, max_samples=None):
         """
-        Mutual information of two ElecMeters
-        x,y should be a list of vectors, e.g. x = [[1.3],[3.7],[5.1],[2.4]]
-        if x is a one-dimensional scalar and we have four samples
+        Mutual information of two ElecMeters.
+        See `nilmtk.stats.entropy.knn_mutual_information`.
 
         Parameters
         ----------
         other : ElecMeter or MeterGroup
+        k : int
+        base : number, base of the logarithm
+        max_samples : int, optional
+            If None then the mutual information is estimated for each
+            block of `MAX_SIZE_ENTROPY` samples and the estimates are
+            averaged.  Otherwise it is estimated once, from a uniform
+            random sample of up to `max_samples` samples drawn from
+            all the data.
+
+        Returns
+        -------
+        float
         """
 
-        def kdtree_mi(x, y, k, base):
-            intens = 1e-10  # small noise to break degeneracy, see doc.
-            x = [list(p + intens * np.random.rand(len(x[0]))) for p in x]
-            y = [list(p + intens * np.random.rand(len(y[0]))) for p in y]
-            points = zip2(x, y)
-            # Find nearest neighbors in joint space, p=inf means max-norm
-            tree = ss.cKDTree(points)
-            dvec = [tree.query(point, k + 1, p=float("inf"))[0][k] for point in points]
-            a, b, c, d = (
-                avgdigamma(x, dvec),
-                avgdigamma(y, dvec),
-                digamma(k),
-                digamma(len(x)),
+        # Load the native data and average it onto the longer of the two
+        # sample periods.
+        sample_period = max(self.sample_period(), other.sample_period())
+
+        def aligned_samples():
+            return aligned_power_values(
+                [self, other], align_sample_period=sample_period
             )
-            return (-a - b + c + d) / log(base)
-
-        def zip2(*args):
-            # zip2(x,y) takes the lists of vectors and makes it a list of vectors in a joint space
-            # E.g. zip2([[1],[2],[3]],[[4],[5],[6]]) = [[1,4],[2,5],[3,6]]
-            return [sum(sublist, []) for sublist in zip(*args)]
-
-        def avgdigamma(points, dvec):
-            # This part finds number of neighbors in some radius in the marginal space
-            # returns expectation value of <psi(nx)>
-            N = len(points)
-            tree = ss.cKDTree(points)
-            avg = 0.0
-            for i in range(N):
-                dist = dvec[i]
-                # subtlety, we don't include the boundary point,
-                # but we are implicitly adding 1 to kraskov def bc center point is included
-                num_points = len(
-                    tree.query_ball_point(points[i], dist - 1e-15, p=float("inf"))
-                )
-                avg += digamma(num_points) / N
-            return avg
+
+        if max_samples is not None:
+            xy = reservoir_sample(aligned_samples(), max_samples, n_columns=2)
+            if len(xy) <= k:
+                raise ValueError("Too few overlapping samples for k={:d}.".format(k))
+            return knn_mutual_information(xy[:, 0], xy[:, 1], k, base)
 
         out = []
-        for power_x, power_y in zip(self.power_series(), other.power_series()):
-            power_x_val = power_x.values
-            power_y_val = power_y.values
-            num_elements = len(power_x_val)
-            power_x_val = power_x_val.reshape((num_elements, 1))
-            power_y_val = power_y_val.reshape((num_elements, 1))
-            if num_elements > MAX_SIZE_ENTROPY:
-                splits = num_elements / MAX_SIZE_ENTROPY + 1
-                x_split = np.array_split(power_x_val, splits)
-                y_split = np.array_split(power_y_val, splits)
-                for x, y in zip(x_split, y_split):
-                    out.append(kdtree_mi(x, y, k, base))
-            else:
-                out.append(kdtree_mi(power_x_val, power_y_val, k, base))
+        for xy in aligned_samples():
+            for block in _split_into_blocks(xy, k):
+                out.append(knn_mutual_information(block[:, 0], block[:, 1], k, base))
+        if not out:
+            raise ValueError("Too few overlapping samples for k={:d}.".format(k))
         return sum(out) / len(out)
 
     def available_power_ac_types(self):
@@ -691,52 +756,22 @@ class Electric(object):
 
         Parameters
         ----------
-        period : str. Pandas period alias.
+        period : str. Pandas period alias with a fixed length (e.g. 'D')
+            or a week (e.g. 'W').  Uses local time.
         bin_duration : str. Pandas period alias e.g. 'H' = hourly; 'D' = daily.
             Width of each bin of the histogram.  `bin_duration` must exactly
             divide the chosen `period`.
+
         Returns
         -------
         hist : np.ndarray
             length will be `period / bin_duration`
         """
-        n_bins = offset_alias_to_seconds(period) / offset_alias_to_seconds(bin_duration)
-        if n_bins != int(n_bins):
-            raise ValueError(
-                "`bin_duration` must exactly divide the" " chosen `period`"
-            )
-        n_bins = int(n_bins)
-
         # Resample to `bin_duration` and load
         kwargs["sample_period"] = offset_alias_to_seconds(bin_duration)
         kwargs["resample_kwargs"] = {"how": "max"}
         when_on = self.when_on(**kwargs)
-
-        # Calculate histogram...
-        hist = np.zeros(n_bins, dtype=int)
-        for on_chunk in when_on:
-            if len(on_chunk) < 5:
-                continue
-
-            on_chunk = on_chunk.fillna(0).astype(int)
-
-            # Trick using resample to 'normalise' start and end dates
-            # to natural boundaries of 'period'.
-            resampled_to_period = on_chunk.iloc[[0, -1]].resample(period).mean().index
-            start = resampled_to_period[0]
-            end = resampled_to_period[-1] + 1 * resampled_to_period.freq
-
-            # Reindex chunk
-            new_index = pd.date_range(start, end, freq=bin_duration, closed="left")
-            on_chunk = on_chunk.reindex(new_index, fill_value=0, copy=False)
-
-            # reshape
-            matrix = on_chunk.values.reshape((-1, n_bins))
-
-            # histogram
-            hist += matrix.sum(axis=0)
-
-        return hist
+        return activity_histogram_from_generator(when_on, period, bin_duration)
 
     def plot_activity_histogram(
         self, ax=None, period="D", bin_duration="H", plot_kwargs=None, **kwargs
@@ -845,29 +880,141 @@ class Electric(object):
         Returns
         -------
         list of pd.Series.  Each series contains one activation.
+
+        Notes
+        -----
+        Activations are found and sliced in a single pass over the data
+        with `nilmtk.stats.activations.slice_activations`, so activations
+        which span chunk boundaries are not lost.  If you only need the
+        times, energy or peak power of each activation then use
+        `activation_records`, which does not keep any of the data.
+        """
+        kwargs.setdefault("resample", True)
+        detector = self._activation_detector(
+            min_off_duration, min_on_duration, on_power_threshold, kwargs
+        )
+        activations = []
+        for activation in slice_activations(
+            self.power_series(**kwargs), detector, border
+        ):
+            # throw away any activation with any NaN values
+            if not activation.isnull().values.any():
+                activations.append(activation)
+        return activations
+
+    def activation_records(
+        self,
+        min_off_duration=None,
+        min_on_duration=None,
+        on_power_threshold=None,
+        store=None,
+        key=None,
+        **kwargs
+    ):
+        """Finds runs of an appliance in a single pass over the data,
+        including runs which span chunk boundaries, and summarises each
+        one without keeping its data.  Use `load_activation` to load the
+        data for an activation.
+
+        Parameters
+        ----------
+        min_off_duration, min_on_duration, on_power_threshold :
+            See `get_activations`.
+        store : nilmtk.DataStore, optional
+            If given then the activations are appended to `store[key]` as
+            they are found, indexed by `start`, and None is returned.
+        key : str
+            Required if `store` is given.
+        **kwargs : kwargs for self.power_series()
+
+        Returns
+        -------
+        pd.DataFrame with one row per activation and columns `start`,
+        `end`, `energy` (kWh) and `peak` (watts).  See
+        `nilmtk.stats.activations.activations_frame`.
+        """
+        if store is not None and key is None:
+            raise ValueError("`key` must be given with `store`.")
+        kwargs.setdefault("resample", True)
+        detector = self._activation_detector(
+            min_off_duration, min_on_duration, on_power_threshold, kwargs
+        )
+
+        def batches():
+            for chunk in self.power_series(**kwargs):
+                yield detector.process(chunk)
+            yield detector.finish()
+
+        if store is None:
+            return pd.concat(list(batches()), ignore_index=True)
+        for batch in batches():
+            if not batch.empty:
+                store.append(key, batch.set_index("start"))
+
+    def load_activation(self, activation, border=1, **kwargs):
+        """Loads the data for one activation found by `activation_records`.
+
+        Parameters
+        ----------
+        activation : row of the DataFrame returned by `activation_records`
+            Anything with `start` and `end` attributes, e.g. from
+            `DataFrame.itertuples()`.
+        border : int
+            Number of samples to include before and after the activation.
+        **kwargs : kwargs for self.power_series()
+
+        Returns
+        -------
+        pd.Series
+
+        Notes
+        -----
+        Only the section around the activation is loaded, so the data
+        near its edges may differ slightly from `get_activations`: for
+        example, the first resampled bin starts at the section's start
+        and samples before the section are not forward filled into it.
         """
+        kwargs.setdefault("resample", True)
+        sample_period = pd.Timedelta(seconds=self._effective_sample_period(kwargs))
+        # Match the rows selected by the `get_activations` function
+        timeframe = TimeFrame(
+            activation.start - (border + 1) * sample_period,
+            activation.end + border * sample_period,
+        )
+        kwargs["sections"] = [timeframe]
+        chunks = [chunk for chunk in self.power_series(**kwargs) if not chunk.empty]
+        if not chunks:
+            return pd.Series(dtype=np.float64)
+        return pd.concat(chunks)
+
+    def _effective_sample_period(self, load_kwargs):
+        """The sample period, in seconds, of the data loaded by
+        `self.power_series(**load_kwargs)`."""
+        sample_period = load_kwargs.get("sample_period")
+        if sample_period is None:
+            sample_period = self.sample_period()
+        return sample_period
+
+    def _activation_detector(
+        self, min_off_duration, min_on_duration, on_power_threshold, load_kwargs
+    ):
         if on_power_threshold is None:
             on_power_threshold = self.on_power_threshold()
-
         if min_off_duration is None:
             min_off_duration = self.min_off_duration()
-
         if min_on_duration is None:
             min_on_duration = self.min_on_duration()
-
-        activations = []
-        kwargs.setdefault("resample", True)
-        for chunk in self.power_series(**kwargs):
-            activations_for_chunk = get_activations(
-                chunk=chunk,
-                min_off_duration=min_off_duration,
-                min_on_duration=min_on_duration,
-                border=border,
-                on_power_threshold=on_power_threshold,
-            )
-            activations.extend(activations_for_chunk)
-
-        return activations
+        # Resampled data is evenly spaced, except across gaps
+        if load_kwargs.get("resample"):
+            max_sample_period = self._effective_sample_period(load_kwargs)
+        else:
+            max_sample_period = None
+        return ActivationDetector(
+            min_off_duration=min_off_duration,
+            min_on_duration=min_on_duration,
+            on_power_threshold=on_power_threshold,
+            max_sample_period=max_sample_period,
+        )
 
 
 def align_two_meters(master, slave, func="power_series"):
@@ -880,27 +1027,62 @@ def align_two_meters(master, slave, func="power_series"):
     ----------
     master, slave : ElecMeter or MeterGroup instances
     """
-    sample_period = master.sample_period()
-    period_alias = "{:d}s".format(sample_period)
-    sections = master.good_sections()
-    master_generator = getattr(master, func)(sections=sections)
-    for master_chunk in master_generator:
-        if len(master_chunk) < 2:
-            return
-        chunk_timeframe = TimeFrame(master_chunk.index[0], master_chunk.index[-1])
-        slave_generator = getattr(slave, func)(sections=[chunk_timeframe])
-        slave_chunk = next(slave_generator)
-
-        # TODO: do this resampling in the pipeline?
-        if not slave_chunk.empty:
-            slave_chunk = slave_chunk.resample(period_alias).mean()
-
-        if slave_chunk.empty:
-            continue
+    return align_meters(
+        [master, slave],
+        func=func,
+        names=["master", "slave"],
+        sample_period=master.sample_period(),
+        sections=master.good_sections(),
+    )
+
+
+def align_meters(meters, func="power_series", names=None, **load_kwargs):
+    """Returns a generator of pd.DataFrames with one column per meter,
+    aligned onto a shared grid.  Each meter is loaded in a single pass.
+    See `nilmtk.stats.align.align_streams`.
+
+    Parameters
+    ----------
+    meters : list of ElecMeter or MeterGroup instances
+    func : str, default='power_series'
+        Name of the method which loads each meter's data, e.g. 'when_on'.
+    names : list, optional
+        Column names.  Defaults to each meter's identifier.
+    sample_period : number, seconds, optional
+        Defaults to the longest sample period of `meters`.
+    **load_kwargs : key word arguments for `func`, e.g. `sections`
+    """
+    sample_period = load_kwargs.pop("sample_period", None)
+    if sample_period is None:
+        sample_period = max(meter.sample_period() for meter in meters)
+    if names is None:
+        names = [meter.identifier for meter in meters]
+    streams = [getattr(meter, func)(**load_kwargs) for meter in meters]
+    return align_streams(streams, sample_period, names)
 
-        master_chunk = master_chunk.resample(period_alias).mean()
 
-        yield pd.DataFrame({"master": master_chunk, "slave": slave_chunk})
+def aligned_power_values(meters, align_sample_period=None, **load_kwargs):
+    """Yields 2D arrays of the power of `meters`, one column per meter,
+    aligned onto a shared grid by `align_streams`.  Rows where any meter
+    has no value are removed.
+
+    Parameters
+    ----------
+    meters : list of ElecMeter or MeterGroup instances
+    align_sample_period : number, seconds, optional
+        Width of the bins of the shared grid.  Defaults to
+        `load_kwargs['sample_period']`, if given, or else to the longest
+        sample period of `meters`.
+    **load_kwargs : key word arguments for `power_series`
+    """
+    if align_sample_period is None:
+        align_sample_period = load_kwargs.get("sample_period")
+    if align_sample_period is None:
+        align_sample_period = max(meter.sample_period() for meter in meters)
+    streams = [meter.power_series(**load_kwargs) for meter in meters]
+    for chunk in align_streams(streams, align_sample_period):
+        values = chunk.to_numpy(dtype=np.float64)
+        yield values[~np.isnan(values).any(axis=1)]
 
 
 def activation_series_for_chunk(*args, **kwargs):
@@ -1031,11 +1213,26 @@ def get_activations(
     return activations
 
 
-def get_vampire_power(power_series):
-    # This is a very simple function at the moment but
-    # in the future we may want to implement a more
-    # sophisticated vampire power function, so it is worth
-    # calling `get_vampire_power` instead of just doing
-    # power_series.min() in case we get round to building
-    # a better vampire power function!
-    return power_series.min()
+def get_vampire_power(power_series, quantile=0.01):
+    """Estimates the standby power of `power_series` as a low quantile,
+    as `Electric.vampire_power` does.
+
+    .. note:: Deprecated
+      `get_vampire_power` will be removed in NILMTK v0.3.
+      Please use `Electric.vampire_power` instead.
+    """
+    warn(
+        "`get_vampire_power()` is deprecated."
+        "  Please use `Electric.vampire_power()` instead!",
+        DeprecationWarning,
+    )
+    sketch = QuantileSketch()
+    sketch.update(power_series)
+    return sketch.quantile(quantile)
+
+
+def _split_into_blocks(x, k):
+    """Splits `x` into blocks of at most MAX_SIZE_ENTROPY samples,
+    dropping any block too small for a k-nearest neighbour estimate."""
+    n_blocks = len(x) // MAX_SIZE_ENTROPY + 1
+    return [block for block in np.array_split(x, n_blocks) if len(block) > k]
@@ -1,9 +1,10 @@
 import gc
 import logging
 import warnings
-from collections import Counter, namedtuple
+from collections import namedtuple
 from copy import copy, deepcopy
 from datetime import timedelta
+from itertools import chain
 from sys import stdout
 
 import matplotlib.pyplot as plt
@@ -21,11 +22,15 @@ from nilmtk.datastore.memory import MAX_MEM_ALLOWANCE_IN_BYTES
 from nilmtk.elecmeter import ElecMeter, ElecMeterID
 from nilmtk.electric import Electric
 from nilmtk.measurement import AC_TYPES, LEVEL_NAMES, PHYSICAL_QUANTITIES_TO_AVERAGE
-from nilmtk.timeframe.timeframe import split_timeframes
+from nilmtk.stats.correlation import CoMoments
+from nilmtk.stats.switchevents import count_simultaneous_events
+from nilmtk.storedframe import StoredDataFrame
+from nilmtk.timeframe.timeframe import TimeFrame, split_timeframes
 from nilmtk.utils import (
     append_or_extend_list,
     capitalise_first_letter,
     convert_to_list,
+    datetime_index_to_ns,
     flatten_2d_list,
     most_common,
     nodes_adjacent_to_root,
@@ -57,6 +62,15 @@ class MeterGroup(Electric):
         self.meters = convert_to_list(meters)
         self.disabled_meters = convert_to_list(disabled_meters)
         self.name = ""
+        self._index = None
+
+    @property
+    def meters(self):
+        return self._meters
+
+    @meters.setter
+    def meters(self, meters):
+        self._meters = _MeterList(meters)
 
     def __hash__(self):
         """
@@ -236,37 +250,33 @@ class MeterGroup(Electric):
                     ):
                         return group
                 # Else try to find an ElecMeter with instance=(1,2)
-                for meter in self.meters:
-                    if meter.identifier == key:
-                        return meter
+                meters_by_id = self._meter_index().by_id
+                if key in meters_by_id:
+                    return meters_by_id[key]
             elif key.instance == 0:
                 metergroup_of_building = self.select(
                     building=key.building, dataset=key.dataset
                 )
                 return metergroup_of_building.mains()
             else:
-                for meter in self.meters:
-                    if meter.identifier == key:
-                        return meter
+                meters_by_id = self._meter_index().by_id
+                if key in meters_by_id:
+                    return meters_by_id[key]
             raise KeyError(key)
         elif isinstance(key, MeterGroupID):
-            key_meters = set(key.meters)
-            for group in self.nested_metergroups():
-                if set(group.identifier.meters) == key_meters:
-                    return group
-            raise KeyError(key)
+            try:
+                return self._meter_index().groups[frozenset(key.meters)]
+            except KeyError:
+                raise KeyError(key)
         # find MeterGroup from list of ElecMeterIDs
         elif isinstance(key, list):
             if not all([isinstance(item, tuple) for item in key]):
                 raise TypeError("requires a list of ElecMeterID objects.")
-            for meter in self.meters:  # TODO: write unit tests for this
-                # list of ElecMeterIDs.  Return existing MeterGroup
-                if isinstance(meter, MeterGroup):
-                    metergroup = meter
-                    meter_ids = set(metergroup.identifier.meters)
-                    if meter_ids == set(key):
-                        return metergroup
-            raise KeyError(key)
+            # list of ElecMeterIDs.  Return existing MeterGroup
+            try:
+                return self._meter_index().groups[frozenset(key)]
+            except KeyError:
+                raise KeyError(key)
         elif isinstance(key, tuple):
             if len(key) == 2:
                 if isinstance(key[0], str):
@@ -279,10 +289,7 @@ class MeterGroup(Electric):
             else:
                 raise TypeError()
         elif isinstance(key, dict):
-            meters = []
-            for meter in self.meters:
-                if meter.matches_appliances(key):
-                    meters.append(meter)
+            meters = self._meters_matching_appliances(key)
             if len(meters) == 1:
                 return meters[0]
             elif len(meters) > 1:
@@ -291,19 +298,14 @@ class MeterGroup(Electric):
                 raise KeyError(key)
         elif isinstance(key, int) and not isinstance(key, bool):
             meters_found = []
-            for meter in self.meters:
-                if isinstance(meter.instance(), int):
-                    if meter.instance() == key:
-                        meters_found.append(meter)
-                elif isinstance(meter.instance(), (tuple, list)):
-                    if key in meter.instance():
-                        if isinstance(meter, MeterGroup):
-                            LOGGER.debug(
-                                f"Meter {key} is in a nested meter group. Retrieving just the ElecMeter.",
-                            )
-                            meters_found.append(meter[key])
-                        else:
-                            meters_found.append(meter)
+            for meter in self._meter_index().by_instance.get(key, []):
+                if isinstance(meter, MeterGroup):
+                    LOGGER.debug(
+                        f"Meter {key} is in a nested meter group. Retrieving just the ElecMeter.",
+                    )
+                    meters_found.append(meter[key])
+                else:
+                    meters_found.append(meter)
             n_meters_found = len(meters_found)
             if n_meters_found > 1:
                 raise Exception(
@@ -318,6 +320,33 @@ class MeterGroup(Electric):
         else:
             raise TypeError()
 
+    def _meter_index(self):
+        """Returns a `_MeterIndex` of `self.meters`, which is built the
+        first time it is needed and rebuilt whenever `self.meters`
+        changes."""
+        index = getattr(self, "_index", None)
+        if index is None or not index.is_index_of(self.meters):
+            index = _MeterIndex(self.meters)
+            self._index = index
+        return index
+
+    def _meters_matching_appliances(self, key):
+        """Returns a list of the meters for which
+        `meter.matches_appliances(key)` is True."""
+        if set(key) == {"type", "instance"}:
+            try:
+                candidates = self._meter_index().by_appliance.get(
+                    (key["type"], key["instance"]), []
+                )
+            except TypeError:  # unhashable type or instance
+                candidates = []
+            meters = [meter for meter in candidates if meter.matches_appliances(key)]
+            # Appliances may have been attached to meters since the index
+            # was built, so only trust the index if it found something.
+            if meters:
+                return meters
+        return [meter for meter in self.meters if meter.matches_appliances(key)]
+
     def matches(self, key):
         for meter in self.meters:
             if meter.matches(key):
@@ -716,6 +745,18 @@ class MeterGroup(Electric):
             `columns` can't be used if `ac_type` and/or `physical_quantity` are set.
         preprocessing : list of Node subclass instances
             e.g. [Clip()]
+        gc_between_sections : bool, default=False
+            If True then run a full garbage collection after each section
+            has been yielded.  This bounds peak memory when very large
+            sections are loaded, at the cost of some throughput.
+        executor : concurrent.futures.Executor, optional
+            e.g. a ThreadPoolExecutor.  If set then, for each chunk, the
+            meters are loaded concurrently on `executor` and each meter's
+            data is added to the chunk as soon as it (and the meters
+            before it) have been loaded.  Meters hold open file handles,
+            so a ProcessPoolExecutor cannot be used.  HDFDataStore reads
+            under the store's `lock`; CSVDataStore opens the file afresh
+            for every read, so it needs no lock.
 
         Returns
         ---------
@@ -728,6 +769,8 @@ class MeterGroup(Electric):
         sample_period = kwargs.setdefault("sample_period", self.sample_period())
         sections = kwargs.pop("sections", [self.get_timeframe()])
         chunksize = kwargs.pop("chunksize", MAX_MEM_ALLOWANCE_IN_BYTES)
+        gc_between_sections = kwargs.pop("gc_between_sections", False)
+        executor = kwargs.pop("executor", None)
         duration_threshold = sample_period * chunksize
         columns = pd.MultiIndex.from_tuples(
             self._convert_physical_quantity_and_ac_type_to_cols(**kwargs)["columns"],
@@ -742,9 +785,17 @@ class MeterGroup(Electric):
             yield pd.DataFrame(columns=columns)
             return
 
+        # Load each meter with a single, long-lived generator over all
+        # the sections, and split its chunks at the boundaries of the
+        # output chunks.
+        kwargs["sections"] = sections
+        kwargs["chunksize"] = chunksize
+        streams = [
+            _ChunkStream(meter.load(**deepcopy(kwargs))) for meter in self.meters
+        ]
+
         # Loop through each section to load
         for section in split_timeframes(sections, duration_threshold):
-            kwargs["sections"] = [section]
             start = normalise_timestamp(section.start, freq)
             tz = None if start.tz is None else start.tz.zone
             index = pd.date_range(
@@ -754,8 +805,12 @@ class MeterGroup(Electric):
                 inclusive="left",
                 freq=freq,
             )
-            chunk = combine_chunks_from_generators(index, columns, self.meters, kwargs)
+            chunks = _chunks_before(streams, section.end, executor)
+            chunk = combine_chunks(index, columns, chunks)
             yield chunk
+            del chunk
+            if gc_between_sections:
+                gc.collect()
 
     def _convert_physical_quantity_and_ac_type_to_cols(self, **kwargs):
         all_columns = set()
@@ -792,24 +847,20 @@ class MeterGroup(Electric):
         Returns
         -------
         sim_switches : pd.Series of type {timestamp: number of
-        simultaneous switches}
+        simultaneous switches}.  Timestamps are int64 nanoseconds
+        since the epoch (UTC).
 
         Notes
         -----
         This function assumes that the submeters in this MeterGroup
         are all aligned.  If they are not then you should align the
-        meters, e.g. by using an `Apply` node with `resample`.
+        meters, e.g. by using a `Resample` node.
         """
         submeters = self.submeters().meters
-        count = Counter()
-        for meter in submeters:
-            switch_time_meter = meter.switch_times(threshold)
-            for timestamp in switch_time_meter:
-                count[timestamp] += 1
-        sim_switches = pd.Series(count)
+        switch_times = [meter.switch_times(threshold) for meter in submeters]
         # Should be 2 or more appliances changing state at the same time
-        sim_switches = sim_switches[sim_switches >= 2]
-        return sim_switches
+        times, counts = count_simultaneous_events(switch_times, min_count=2)
+        return pd.Series(counts, index=times)
 
     def mains(self):
         """
@@ -912,6 +963,28 @@ class MeterGroup(Electric):
                     total_energy_results += meter_energy
             return total_energy_results
 
+    def energy_per_period(self, offset_alias="D", **load_kwargs):
+        """Sums together the energy per calendar period for each meter.
+
+        Parameters
+        ----------
+        offset_alias : str, default='D'
+            A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+        **loader_kwargs : key word arguments for DataStore.load()
+
+        Returns
+        -------
+        pd.DataFrame with a row for each period and a column for each AC type.
+        """
+        energy = None
+        for meter in self.meters:
+            meter_energy = meter.energy_per_period(offset_alias, **load_kwargs)
+            if energy is None:
+                energy = meter_energy
+            else:
+                energy = energy.add(meter_energy, fill_value=0)
+        return energy
+
     def _collect_stats_on_all_meters(self, load_kwargs, func, full_results):
         collected_stats = []
         for meter in self.meters:
@@ -921,7 +994,7 @@ class MeterGroup(Electric):
             if (
                 full_results
                 and len(self.meters) > 1
-                and not meter.store.all_sections_smaller_than_chunksize
+                and not meter.store.sections_fit_in_one_chunk(meter.key)
             ):
                 warnings.warn(
                     "at least one section requested from '{}' required"
@@ -993,10 +1066,16 @@ class MeterGroup(Electric):
         else:
             return []
 
-    def dataframe_of_meters(self, **kwargs):
+    def dataframe_of_meters(self, store=None, key=None, **kwargs):
         """
         Parameters
         ----------
+        store : nilmtk.DataStore, optional
+            e.g. a TmpDataStore.  If given then each chunk is appended to
+            `store[key]` as soon as it is loaded, so the DataFrame never
+            has to fit in memory, and a `StoredDataFrame` is returned.
+        key : str
+            Required if `store` is given.
         sample_period : int or float, optional
             Number of seconds to use as sample period when reindexing meters.
             If not specified then will use the max of all meters' sample_periods.
@@ -1006,42 +1085,59 @@ class MeterGroup(Electric):
             any other key word arguments to pass to `self.store.load()` including:
         ac_type : string, defaults to 'best'
         physical_quantity: string, defaults to 'power'
+        executor : concurrent.futures.Executor, optional
+            If set then load the meters concurrently.  See `load`.
 
         Returns
         -------
-        DataFrame
+        DataFrame, or StoredDataFrame if `store` is given.
             Each column is a meter.
         """
+        if store is not None:
+            if key is None:
+                raise ValueError("`key` must be given with `store`.")
+            stored = StoredDataFrame(store, key, self.identifier.meters)
+            for segment in self._dataframes_of_meters(**kwargs):
+                stored.append(segment)
+            return stored
+
+        segments = list(self._dataframes_of_meters(**kwargs))
+        if segments:
+            return pd.concat(segments)
+        else:
+            return pd.DataFrame(columns=self.identifier.meters)
+
+    def _dataframes_of_meters(self, **kwargs):
+        """Generator of DataFrames, one per chunk, in which each column is
+        a meter.  Takes the same parameters as `dataframe_of_meters`."""
         kwargs.setdefault("sample_period", self.sample_period())
         kwargs.setdefault("ac_type", "best")
         kwargs.setdefault("physical_quantity", "power")
+        executor = kwargs.pop("executor", None)
         identifiers, generators = self._meter_generators(**kwargs)
-        segments = []
         while True:
+            if executor is None:
+                totals = map(_next_total, generators)
+            else:
+                futures = [
+                    executor.submit(_next_total, generator) for generator in generators
+                ]
+                totals = (future.result() for future in futures)
+
             chunks = []
             ids = []
-            for meter_id, generator in zip(identifiers, generators):
-                try:
-                    chunk_from_next_meter = next(generator)
-                except StopIteration:
-                    continue
-
-                if not chunk_from_next_meter.empty:
+            for meter_id, total in zip(identifiers, totals):
+                if total is not None:
                     ids.append(meter_id)
-                    chunks.append(chunk_from_next_meter.sum(axis=1))
+                    chunks.append(total)
 
             if chunks:
                 df = pd.concat(chunks, axis=1)
                 df.columns = ids
-                segments.append(df)
+                yield df
             else:
                 break
 
-        if segments:
-            return pd.concat(segments)
-        else:
-            return pd.DataFrame(columns=self.identifier.meters)
-
     def entropy_per_meter(self):
         """Finds the entropy of each meter in this MeterGroup.
 
@@ -1092,7 +1188,7 @@ class MeterGroup(Electric):
             for j, m_j in enumerate(self.meters):
                 id_i = m_i.identifier
                 id_j = m_j.identifier
-                print(id_i, id_j)
+                LOGGER.debug(f"Calculating {method} for {id_i} and {id_j}")
                 if i > j:
                     result[id_i][id_j] = result[id_j][id_i]
                 else:
@@ -1111,16 +1207,32 @@ class MeterGroup(Electric):
         """
         return self.pairwise("mutual_information")
 
-    def pairwise_correlation(self):
+    def pairwise_correlation(self, **load_kwargs):
         """
         Finds the pairwise correlation among different
         meters in a MeterGroup.
 
+        All meters are read once, in lockstep, and the co-moments of
+        every pair are accumulated in a single pass (see
+        `nilmtk.stats.correlation.CoMoments`).  Each pair of meters uses
+        only the timestamps where both have data.
+
+        Parameters
+        ----------
+        **load_kwargs : key word arguments for `dataframe_of_meters`
+
         Returns
         -------
         pd.DataFrame of correlation between pair of ElecMeters.
         """
-        return self.pairwise("correlation")
+        meter_identifiers = list(self.identifier.meters)
+        comoments = CoMoments(len(meter_identifiers))
+        for df in self._dataframes_of_meters(**load_kwargs):
+            df = df.reindex(columns=meter_identifiers)
+            comoments.update(df.to_numpy(dtype=np.float64))
+        return pd.DataFrame(
+            comoments.correlation(), index=meter_identifiers, columns=meter_identifiers
+        )
 
     def proportion_of_energy_submetered(self, **loader_kwargs):
         """
@@ -1869,48 +1981,74 @@ def iterate_through_submeters_of_two_metergroups(master, slave):
 
 
 def combine_chunks_from_generators(index, columns, meters, kwargs):
+    """Combines the first chunk loaded from each meter into a single
+    DataFrame.  See `combine_chunks`.
+
+    Returns
+    -------
+    DataFrame
+    """
+
+    def first_chunks():
+        for meter in meters:
+            LOGGER.debug(f"Loading data for meter {meter.identifier}")
+            chunk = next(meter.load(**deepcopy(kwargs)), None)
+            if chunk is not None:
+                yield chunk
+
+    return combine_chunks(index, columns, first_chunks())
+
+
+def combine_chunks(index, columns, chunks):
     """Combines chunks into a single DataFrame.
 
     Adds or averages columns, depending on whether each column is in
     PHYSICAL_QUANTITIES_TO_AVERAGE.
 
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+    columns : pd.MultiIndex
+    chunks : iterable of DataFrames
+        Chunks from the same meter must not overlap in time.
+
     Returns
     -------
     DataFrame
     """
     # Regarding columns (e.g. voltage) that we need to average:
     # The approach is that we first add everything together
-    # in the first for-loop, whilst also keeping a
-    # `columns_to_average_counter` DataFrame
-    # which tells us what to divide by in order to compute the
+    # in the first for-loop, whilst also counting, for each of
+    # those columns, how many meters had a value at each timestamp.
+    # We then divide by that count to compute the
     # mean for PHYSICAL_QUANTITIES_TO_AVERAGE.
 
     # Regarding doing an in-place addition:
-    # We convert out cumulator dataframe to a numpy matrix.
-    # This allows us to use np.add to do an in-place add.
-    # If we didn't do this then we'd get horrible memory fragmentation.
+    # The cumulator is a preallocated numpy array with one row per
+    # column, and each chunk's timestamps are mapped to positions in
+    # `index` with a single `searchsorted`.  Chunks are usually a
+    # contiguous run of `index`, in which case we add in-place into
+    # views of the cumulator.  Otherwise we gather, add and scatter
+    # back; timestamps within a chunk are unique, so no `np.add.at` is
+    # needed.  The boolean masks are allocated once and reused for
+    # every column of every chunk.
     # See http://stackoverflow.com/a/27526721/732596
 
     DTYPE = np.float32
-    cumulator = pd.DataFrame(np.nan, index=index, columns=columns, dtype=DTYPE)
-    cumulator_arr = cumulator.values
-    columns_to_average_counter = pd.DataFrame(dtype=np.uint16)
+    n_rows = len(index)
+    index_ns = datetime_index_to_ns(index)
+    cumulator_arr = np.full((len(columns), n_rows), np.nan, dtype=DTYPE)
+    physical_quantities = columns.get_level_values("physical_quantity")
+    is_averaged = np.asarray(physical_quantities.isin(PHYSICAL_QUANTITIES_TO_AVERAGE))
+    # Position of each column in `counter`, or -1 if it isn't averaged.
+    counter_positions = np.cumsum(is_averaged) - 1
+    counter = np.zeros((is_averaged.sum(), n_rows), dtype=np.uint16)
+    is_valid_buffer = np.empty(n_rows, dtype=bool)
+    is_nan_buffer = np.empty(n_rows, dtype=bool)
     timeframe = None
 
-    # Go through each generator to try sum values together
-    for meter in meters:
-        LOGGER.debug(f"Loading data for meter {meter.identifier}")
-        kwargs_copy = deepcopy(kwargs)
-        generator = meter.load(**kwargs_copy)
-        try:
-            chunk_from_next_meter = next(generator)
-        except StopIteration:
-            continue
-
-        del generator
-        del kwargs_copy
-        gc.collect()
-
+    # Go through each chunk to try sum values together
+    for chunk_from_next_meter in chunks:
         if chunk_from_next_meter.empty or not chunk_from_next_meter.attrs.get(
             "timeframe", None
         ):
@@ -1921,58 +2059,223 @@ def combine_chunks_from_generators(index, columns, meters, kwargs):
         else:
             timeframe = timeframe.union(chunk_from_next_meter.attrs["timeframe"])
 
+        # Map the chunk's columns and rows to the cumulator's
+        column_positions = columns.get_indexer(chunk_from_next_meter.columns)
+        chunk_positions = np.flatnonzero(column_positions >= 0)
+        if len(chunk_positions) == 0:
+            continue
+        times = datetime_index_to_ns(chunk_from_next_meter.index)
+        rows = np.searchsorted(index_ns, times)
+        on_grid = rows < n_rows
+        on_grid[on_grid] = index_ns[rows[on_grid]] == times[on_grid]
+        all_on_grid = on_grid.all()
+        if not all_on_grid:
+            rows = rows[on_grid]
+        n = len(rows)
+        if n == 0:
+            continue
+        if rows[-1] - rows[0] + 1 == n:
+            rows = slice(rows[0], rows[-1] + 1)
+        values = chunk_from_next_meter.to_numpy(dtype=DTYPE)
+        is_valid = is_valid_buffer[:n]
+        is_nan = is_nan_buffer[:n]
+
         # Add (in-place)
-        for i, column_name in enumerate(columns):
-            try:
-                column = chunk_from_next_meter[column_name]
-            except KeyError:
-                continue
+        for j in chunk_positions:
+            i = column_positions[j]
+            column = values[:, j] if all_on_grid else values[on_grid, j]
+            cumulator_col = cumulator_arr[i, rows]
+            np.isnan(column, out=is_valid)
+            np.logical_not(is_valid, out=is_valid)
+            # Cells which are NaN in the cumulator take the new value;
+            # cells where the new value is NaN are left untouched.
+            np.isnan(cumulator_col, out=is_nan)
+            np.logical_and(is_nan, is_valid, out=is_nan)
+            np.copyto(cumulator_col, 0, where=is_nan)
+            np.add(cumulator_col, column, out=cumulator_col, where=is_valid)
+            if not isinstance(rows, slice):
+                cumulator_arr[i, rows] = cumulator_col
+            if is_averaged[i]:
+                counter_col = counter[counter_positions[i], rows]
+                np.add(counter_col, is_valid, out=counter_col)
+                if not isinstance(rows, slice):
+                    counter[counter_positions[i], rows] = counter_col
+
+        del chunk_from_next_meter, values
 
-            aligned = column.reindex(index, copy=False).values
-            del column
-            cumulator_col = cumulator_arr[:, i]
-            where_both_are_nan = np.isnan(cumulator_col) & np.isnan(aligned)
-            np.nansum([cumulator_col, aligned], axis=0, out=cumulator_col, dtype=DTYPE)
-            cumulator_col[where_both_are_nan] = np.nan
-            del aligned
-            del where_both_are_nan
-            gc.collect()
-
-        # Update columns_to_average_counter - this is necessary so we do not
-        # add up columns like 'voltage' which should be averaged.
-        physical_quantities = chunk_from_next_meter.columns.get_level_values(
-            "physical_quantity"
-        )
-        columns_to_average = set(PHYSICAL_QUANTITIES_TO_AVERAGE).intersection(
-            physical_quantities
+    LOGGER.debug("Done loading data all meters for this chunk.")
+    cumulator = pd.DataFrame(cumulator_arr.T, index=index, columns=columns, copy=False)
+
+    # Create mean values by dividing any columns which need dividing.
+    # Means are float64, as they always have been.
+    for i in np.flatnonzero(is_averaged):
+        counter_col = counter[counter_positions[i]]
+        mean = np.full(n_rows, np.nan)
+        np.divide(
+            cumulator_arr[i],
+            counter_col,
+            out=mean,
+            where=counter_col > 0,
+            dtype=np.float64,
         )
-        if columns_to_average:
-            counter_increment = pd.DataFrame(
-                1,
-                columns=list(columns_to_average),
-                dtype=np.uint16,
-                index=chunk_from_next_meter.index,
-            )
-            columns_to_average_counter = columns_to_average_counter.add(
-                counter_increment, fill_value=0
-            )
-            del counter_increment
+        cumulator[columns[i]] = mean
 
-        del chunk_from_next_meter
-        gc.collect()
+    cumulator.attrs["timeframe"] = timeframe
+    return cumulator
 
-    del cumulator_arr
-    gc.collect()
 
-    # Create mean values by dividing any columns which need dividing
-    for column in columns_to_average_counter:
-        cumulator[column] /= columns_to_average_counter[column]
+def _chunks_before(streams, end, executor=None):
+    """Returns an iterable of the chunks before `end` from each
+    `_ChunkStream` in turn.  If `executor` is set then the streams are
+    read concurrently, but their chunks are still returned in order."""
+    if executor is None:
+        return chain.from_iterable(stream.chunks_before(end) for stream in streams)
+    futures = [executor.submit(list, stream.chunks_before(end)) for stream in streams]
+    return chain.from_iterable(future.result() for future in futures)
 
-    del columns_to_average_counter
-    gc.collect()
-    LOGGER.debug("Done loading data all meters for this chunk.")
-    cumulator.attrs["timeframe"] = timeframe
-    return cumulator
+
+def _next_total(generator):
+    """Returns the sum across the columns of the next chunk from
+    `generator`, or None if the generator is exhausted or the chunk is
+    empty."""
+    chunk = next(generator, None)
+    if chunk is None or chunk.empty:
+        return None
+    return chunk.sum(axis=1)
+
+
+class _MeterIndex(object):
+    """Dicts for looking up the meters of a MeterGroup in constant time.
+
+    Attributes
+    ----------
+    by_id : dict mapping each meter's identifier to the first meter with
+        that identifier.
+    by_instance : dict mapping each meter instance (int) to a list of the
+        meters which have, or contain, that instance.
+    by_appliance : dict mapping (appliance type, appliance instance) to a
+        list of the meters with that appliance.  Appliance type synonyms
+        are included, so candidates must be checked with
+        `meter.matches_appliances`.
+    groups : dict mapping a frozenset of ElecMeterIDs to the first nested
+        MeterGroup containing exactly those meters.
+    """
+
+    def __init__(self, meters):
+        self.meters = meters
+        self.version = meters.version
+        self.by_id = {}
+        self.by_instance = {}
+        self.by_appliance = {}
+        self.groups = {}
+        for meter in meters:
+            self.by_id.setdefault(meter.identifier, meter)
+
+            instance = meter.instance()
+            if isinstance(instance, int):
+                self.by_instance.setdefault(instance, []).append(meter)
+            elif isinstance(instance, (tuple, list)):
+                for sub_instance in set(instance):
+                    if isinstance(sub_instance, int):
+                        self.by_instance.setdefault(sub_instance, []).append(meter)
+
+            for appliance in meter.appliances:
+                appliance_type, appliance_instance = appliance.identifier
+                appliance_types = Appliance.appliance_types.get(appliance_type, {})
+                type_names = set(appliance_types.get("synonyms", []))
+                type_names.add(appliance_type)
+                for type_name in type_names:
+                    try:
+                        meters_for_key = self.by_appliance.setdefault(
+                            (type_name, appliance_instance), []
+                        )
+                    except TypeError:  # unhashable type or instance
+                        continue
+                    if meter not in meters_for_key:
+                        meters_for_key.append(meter)
+
+            if isinstance(meter, MeterGroup):
+                self.groups.setdefault(frozenset(meter.identifier.meters), meter)
+
+    def is_index_of(self, meters):
+        """Returns True if this index is up to date for `meters`."""
+        return meters is self.meters and meters.version == self.version
+
+
+def _counting_changes(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    mutate.__name__ = name
+    return mutate
+
+
+class _MeterList(list):
+    """A list which counts the changes made to it, so that a `_MeterIndex`
+    can tell when it is out of date."""
+
+    version = 0
+
+    append = _counting_changes("append")
+    extend = _counting_changes("extend")
+    insert = _counting_changes("insert")
+    remove = _counting_changes("remove")
+    pop = _counting_changes("pop")
+    clear = _counting_changes("clear")
+    sort = _counting_changes("sort")
+    reverse = _counting_changes("reverse")
+    __setitem__ = _counting_changes("__setitem__")
+    __delitem__ = _counting_changes("__delitem__")
+    __iadd__ = _counting_changes("__iadd__")
+    __imul__ = _counting_changes("__imul__")
+
+
+class _ChunkStream(object):
+    """Wraps a generator of chunks, sorted by time, so that they can be
+    consumed one section at a time."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.pending = None
+
+    def chunks_before(self, end):
+        """Yields the chunks (or parts of chunks) before `end`.  Any part
+        of a chunk at or after `end` is kept for the next call.  The
+        timeframe of each part is clipped to its side of `end`."""
+        while True:
+            if self.pending is None:
+                self.pending = next(self.generator, None)
+                if self.pending is None:
+                    return
+            chunk = self.pending
+            if chunk.empty:
+                self.pending = None
+                continue
+            if chunk.index[0] >= end:
+                return
+            n_before = chunk.index.searchsorted(end)
+            if n_before < len(chunk):
+                self.pending = _with_clipped_timeframe(
+                    chunk.iloc[n_before:], TimeFrame(start=end)
+                )
+                yield _with_clipped_timeframe(chunk.iloc[:n_before], TimeFrame(end=end))
+                return
+            self.pending = None
+            yield _with_clipped_timeframe(chunk, TimeFrame(end=end))
+
+
+def _with_clipped_timeframe(chunk, timeframe):
+    """Sets `chunk.attrs["timeframe"]` to its intersection with
+    `timeframe`, without changing the attrs of any other DataFrame."""
+    chunk_timeframe = chunk.attrs.get("timeframe")
+    if chunk_timeframe:
+        chunk.attrs = dict(
+            chunk.attrs, timeframe=chunk_timeframe.intersection(timeframe)
+        )
+    return chunk
 
 
 meter_sorting_key = lambda meter: meter.instance()
@@ -1,2 +1,3 @@
 from .clip import Clip
 from .apply import Apply
+from .resample import Resample
@@ -1,13 +1,19 @@
 from warnings import warn
 
+import numpy as np
+
 from nilmtk.base.node import Node
-from nilmtk.utils import index_of_column_name
 
 
 class Clip(Node):
     """Ensures that no value is below a lower limit or above an upper limit.
     If self.lower and self.upper are None then will use clip settings from
     'device': {'measurements': {'upper_limit' and 'lower_limit'}}.
+
+    Limits are resolved once per set of columns into `lower` and `upper`
+    vectors aligned with the chunk's columns, and each chunk is then clipped
+    with a single `np.clip` call (in place when the chunk is a single
+    float block).
     """
 
     # Not very well specified.  Really want to specify that
@@ -24,29 +30,79 @@ class Clip(Node):
         self.check_requirements()
         metadata = self.upstream.get_metadata()
         measurements = metadata["device"]["measurements"]
+        limits_for_columns = {}
         for chunk in self.upstream.process():
-            for measurement in chunk:
-                lower, upper = _find_limits(measurement, measurements)
-                lower = lower if self.lower is None else self.lower
-                upper = upper if self.upper is None else self.upper
-                if lower is not None and upper is not None:
-                    # We use `chunk.iloc[:,icol]` instead of iterating
-                    # through each column so we can to the clipping in place
-                    icol = index_of_column_name(chunk, measurement)
-                    chunk.iloc[:, icol] = chunk.iloc[:, icol].clip(lower, upper)
+            if chunk.empty:
+                yield chunk
+                continue
+
+            columns = tuple(chunk.columns)
+            try:
+                lower, upper = limits_for_columns[columns]
+            except KeyError:
+                lower, upper = self._limit_vectors(columns, measurements)
+                limits_for_columns[columns] = (lower, upper)
+
+            if lower is not None:
+                chunk = _clip_chunk(chunk, lower, upper)
 
             yield chunk
 
+    def _limit_vectors(self, columns, measurements):
+        """
+        Returns
+        -------
+        lower, upper : np.ndarray of floats, one element per column.
+            Columns without limits get -inf and +inf.  Both are None
+            if no column needs clipping.
+        """
+        limits = {
+            (m.get("physical_quantity"), m.get("type")): (
+                m.get("lower_limit"),
+                m.get("upper_limit"),
+            )
+            for m in measurements
+        }
+        lower = np.full(len(columns), -np.inf)
+        upper = np.full(len(columns), np.inf)
+        any_limits = False
+        for i, measurement in enumerate(columns):
+            try:
+                col_lower, col_upper = limits[measurement]
+            except KeyError:
+                warn(
+                    "No measurement limits for {}.".format(measurement), RuntimeWarning
+                )
+                col_lower, col_upper = None, None
+            col_lower = col_lower if self.lower is None else self.lower
+            col_upper = col_upper if self.upper is None else self.upper
+            if col_lower is not None and col_upper is not None:
+                lower[i] = col_lower
+                upper[i] = col_upper
+                any_limits = True
 
-def _find_limits(measurement, measurements):
-    """
-    Returns
-    -------
-    lower, upper : numbers
+        if any_limits:
+            return lower, upper
+        else:
+            return None, None
+
+
+def _clip_chunk(chunk, lower, upper):
+    """Clip every column of `chunk` between `lower[i]` and `upper[i]`.
+
+    If `chunk` is backed by a single, writeable float block then the
+    clipping is done in place on that block.  Otherwise a clipped copy
+    is returned.
     """
-    for m in measurements:
-        if (m.get("physical_quantity"), m.get("type")) == measurement:
-            return m.get("lower_limit"), m.get("upper_limit")
+    values = chunk.values
+    if (
+        values.dtype.kind == "f"
+        and values.flags.writeable
+        and np.shares_memory(values, chunk.values)
+    ):
+        np.clip(values, lower, upper, out=values)
+        return chunk
 
-    warn("No measurement limits for {}.".format(measurement), RuntimeWarning)
-    return None, None
+    clipped = chunk.clip(lower=lower, upper=upper, axis=1)
+    clipped.attrs = chunk.attrs
+    return clipped
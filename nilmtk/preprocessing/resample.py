@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+
+from nilmtk.base.node import Node
+from nilmtk.utils import datetime_index_to_ns, safe_resample
+
+# Aggregations which are computed with NumPy.  Any other `how`
+# falls back to `safe_resample`.
+FAST_AGGREGATIONS = ["mean", "sum", "max", "min"]
+
+# Position used in the forward-fill state when there is no valid value to fill
+_NO_VALID_POSITION = np.iinfo(np.int64).min // 2
+
+# Fill limit used for `ffill` without a `limit`
+_UNLIMITED = np.iinfo(np.int64).max // 4
+
+
+class Resample(Node):
+    """Resample each chunk to a fixed frequency, treating consecutive chunks
+    as one continuous stream.
+
+    Resampling each chunk independently produces a partial bin at each end of
+    every chunk and stops `ffill(limit=...)` at chunk boundaries.  Instead,
+    this node looks one chunk ahead: if the next chunk continues the current
+    one then the samples in the last bin of the current chunk are carried
+    over and aggregated together with the next chunk, and forward filling
+    resumes where the previous chunk left off.  Two chunks are continuous if
+    the next chunk's timeframe starts no more than `max(1, limit)` bins after
+    the end of the current chunk's timeframe.
+
+    Fixed frequencies (e.g. '6s') with `how` in FAST_AGGREGATIONS are computed
+    on the raw int64 index with `np.bincount` / `ufunc.reduceat`.  Anything
+    else (calendar rules, other aggregations or fill methods, extra
+    `resample_kwargs`, non-float data) falls back to `safe_resample` on each
+    chunk.
+    """
+
+    def __init__(
+        self,
+        upstream=None,
+        generator=None,
+        rule=None,
+        how="mean",
+        fill_method=None,
+        limit=None,
+        **resample_kwargs
+    ):
+        """
+        Parameters
+        ----------
+        rule : str or pd.DateOffset
+            e.g. '6s'
+        how : str, defaults to 'mean'
+        fill_method : None or 'ffill'
+        limit : int, optional
+            Maximum number of consecutive bins to fill.
+        **resample_kwargs : any other key word arguments for `safe_resample`
+        """
+        self.rule = rule
+        self.how = how
+        self.fill_method = fill_method
+        self.limit = limit
+        self.resample_kwargs = resample_kwargs
+        super(Resample, self).__init__(upstream, generator)
+
+    def process(self):
+        self.check_requirements()
+        period = self._period_ns()
+        if period is None:
+            for chunk in self.upstream.process():
+                yield self._resample_with_pandas(chunk)
+            return
+
+        if not self.fill_method:
+            fill_limit = None
+        elif self.limit is None:
+            fill_limit = _UNLIMITED
+        else:
+            fill_limit = self.limit
+        resampler = _StreamingResampler(
+            pd.tseries.frequencies.to_offset(self.rule), self.how, fill_limit
+        )
+        generator = self.upstream.process()
+        try:
+            chunk = next(generator)
+        except StopIteration:
+            return
+
+        for next_chunk in generator:
+            yield self._resample_chunk(
+                resampler, chunk, self._continuous(chunk, next_chunk, period)
+            )
+            chunk = next_chunk
+        yield self._resample_chunk(resampler, chunk, False)
+
+    def _period_ns(self):
+        """Returns the bin width in nanoseconds, or None if this rule and
+        configuration are not supported by the fast path."""
+        if self.resample_kwargs or self.how not in FAST_AGGREGATIONS:
+            return
+        if self.fill_method not in [None, "ffill"]:
+            return
+        offset = pd.tseries.frequencies.to_offset(self.rule)
+        if not isinstance(offset, pd.offsets.Tick) or isinstance(
+            offset, pd.offsets.Day
+        ):
+            # Calendar rules depend on the local calendar
+            return
+        return offset.nanos
+
+    def _resample_chunk(self, resampler, chunk, continues):
+        if not _fast_path_applies(chunk):
+            resampler.reset()
+            return self._resample_with_pandas(chunk)
+        return resampler.resample(chunk, continues)
+
+    def _resample_with_pandas(self, chunk):
+        resample_kwargs = dict(self.resample_kwargs, rule=self.rule, how=self.how)
+        if self.fill_method:
+            resample_kwargs.update(fill_method=self.fill_method, limit=self.limit)
+        new_chunk = safe_resample(chunk, **resample_kwargs)
+        new_chunk.attrs = chunk.attrs
+        return new_chunk
+
+    def _continuous(self, chunk, next_chunk, period):
+        if not (_fast_path_applies(chunk) and _fast_path_applies(next_chunk)):
+            return False
+        end = _timeframe_edge(chunk, "end", -1)
+        start = _timeframe_edge(next_chunk, "start", 0)
+        max_gap = period * max(1, self.limit or 0)
+        return 0 <= start - end <= max_gap
+
+
+class _StreamingResampler(object):
+    """Fixed-frequency resampler which keeps the partially filled last bin
+    and the forward-fill state between chunks.
+
+    Bins follow pandas' default `origin='start_day'`: they are multiples of
+    the frequency counted from midnight (local time) of the first timestamp
+    of each continuous run of chunks.
+    """
+
+    def __init__(self, offset, how, fill_limit):
+        """
+        Parameters
+        ----------
+        offset : pd.offsets.Tick
+        how : str, one of FAST_AGGREGATIONS
+        fill_limit : int or None
+            Maximum number of bins to forward fill.  None means no filling.
+        """
+        self.offset = offset
+        self.period = offset.nanos
+        self.how = how
+        self.fill_limit = fill_limit
+        self.reset()
+
+    def reset(self):
+        self.origin = None
+        self.carry_index = None
+        self.carry_values = None
+        self.last_values = None
+        self.last_position = None
+        self.next_bin = None
+
+    def resample(self, chunk, continues):
+        """
+        Parameters
+        ----------
+        chunk : pd.DataFrame with a DatetimeIndex and float columns.
+        continues : bool
+            True if the next chunk continues this one, in which case the last
+            bin is held back until the next call.
+
+        Returns
+        -------
+        pd.DataFrame (possibly empty) with the same attrs as `chunk`.
+        """
+        index = chunk.index
+        timestamps = datetime_index_to_ns(index)
+        values = chunk.to_numpy()
+        if self.carry_index is not None:
+            timestamps = np.concatenate([self.carry_index, timestamps])
+            values = np.concatenate([self.carry_values, values])
+        timestamps, values = _sorted_without_duplicates(timestamps, values)
+        if self.carry_index is None:
+            # Start of a new continuous run of chunks
+            first = _timestamp_from_ns(timestamps[0], index.tz)
+            self.origin = first.normalize().value
+            self.last_values = None
+            self.last_position = None
+
+        bins = (timestamps - self.origin) // self.period
+        if self.next_bin is None:
+            first_bin = bins[0]
+        else:
+            first_bin = self.next_bin
+        if continues:
+            last_bin = bins[-1] - 1
+            split = np.searchsorted(bins, bins[-1], side="left")
+            self.carry_index = timestamps[split:]
+            self.carry_values = values[split:]
+            self.next_bin = bins[-1]
+            values = values[:split]
+            bins = bins[:split]
+        else:
+            last_bin = bins[-1]
+            self.carry_index = None
+            self.carry_values = None
+            self.next_bin = None
+
+        n_bins = int(last_bin - first_bin) + 1
+        if n_bins <= 0:
+            resampled = chunk.iloc[0:0]
+        else:
+            aggregated = self._aggregate(bins - first_bin, values, n_bins)
+            if self.fill_limit:
+                self._ffill(aggregated)
+            start = _timestamp_from_ns(self.origin + first_bin * self.period, index.tz)
+            new_index = pd.date_range(
+                start, periods=n_bins, freq=self.offset, name=index.name
+            )
+            resampled = pd.DataFrame(
+                aggregated.astype(values.dtype, copy=False),
+                index=new_index,
+                columns=chunk.columns,
+            )
+
+        resampled.attrs = chunk.attrs
+        return resampled
+
+    def _aggregate(self, bins, values, n_bins):
+        """Aggregates rows of `values` into `n_bins` bins.
+
+        Parameters
+        ----------
+        bins : np.ndarray of int64, sorted, bin number of each row in [0, n_bins)
+        values : 2D np.ndarray of floats
+
+        Returns
+        -------
+        2D np.ndarray of float64 with shape (n_bins, n_columns)
+        """
+        n_columns = values.shape[1]
+        if self.how in ["max", "min"]:
+            # Rows are sorted so each bin is a contiguous run of rows.
+            starts = np.flatnonzero(np.diff(bins, prepend=-1))
+            ufunc = np.fmax if self.how == "max" else np.fmin
+            aggregated = np.full((n_bins, n_columns), np.nan)
+            aggregated[bins[starts]] = ufunc.reduceat(values, starts, axis=0)
+            return aggregated
+
+        aggregated = np.empty((n_bins, n_columns))
+        for i in range(n_columns):
+            column = values[:, i]
+            valid = ~np.isnan(column)
+            sums = np.bincount(
+                bins, weights=np.where(valid, column, 0), minlength=n_bins
+            )
+            if self.how == "sum":
+                aggregated[:, i] = sums
+            else:
+                counts = np.bincount(bins[valid], minlength=n_bins)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    aggregated[:, i] = sums / counts
+        return aggregated
+
+    def _ffill(self, aggregated):
+        """Forward fill NaNs in `aggregated` (in place) by up to
+        `self.fill_limit` bins, continuing from the state left by the previous
+        chunk and updating that state."""
+        n_bins, n_columns = aggregated.shape
+        if self.last_values is None:
+            self.last_values = np.full(n_columns, np.nan)
+            self.last_position = np.full(n_columns, _NO_VALID_POSITION)
+
+        positions = np.arange(n_bins)[:, np.newaxis]
+        valid = ~np.isnan(aggregated)
+        last_valid = np.maximum.accumulate(
+            np.where(valid, positions, self.last_position), axis=0
+        )
+        fill = ~valid & (positions - last_valid <= self.fill_limit)
+        fill_values = np.take_along_axis(
+            aggregated, np.clip(last_valid, 0, None), axis=0
+        )
+        fill_values = np.where(last_valid >= 0, fill_values, self.last_values)
+        aggregated[fill] = fill_values[fill]
+
+        # Positions are relative to the start of the next chunk.
+        self.last_values = fill_values[-1]
+        self.last_position = np.maximum(last_valid[-1] - n_bins, _NO_VALID_POSITION)
+
+
+def _fast_path_applies(chunk):
+    return (
+        isinstance(chunk, pd.DataFrame)
+        and not chunk.empty
+        and isinstance(chunk.index, pd.DatetimeIndex)
+        and all(dtype.kind == "f" for dtype in chunk.dtypes)
+    )
+
+
+def _timeframe_edge(chunk, attr, i):
+    """Returns start or end of the chunk's timeframe as int64 nanoseconds,
+    using the chunk's index if the timeframe is not available."""
+    timeframe = chunk.attrs.get("timeframe")
+    edge = None if timeframe is None else getattr(timeframe, attr)
+    if edge is None:
+        edge = chunk.index[i]
+    return edge.value
+
+
+def _timestamp_from_ns(value, tz):
+    timestamp = pd.Timestamp(value, tz="UTC")
+    return timestamp.tz_localize(None) if tz is None else timestamp.tz_convert(tz)
+
+
+def _sorted_without_duplicates(timestamps, values):
+    """Sorts rows by timestamp and keeps the first of any duplicates,
+    as `safe_resample` does."""
+    if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        values = values[order]
+    if len(timestamps) > 1:
+        keep = np.diff(timestamps, prepend=timestamps[0] - 1) != 0
+        if not keep.all():
+            timestamps = timestamps[keep]
+            values = values[keep]
+    return timestamps, values
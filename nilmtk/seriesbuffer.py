@@ -0,0 +1,128 @@
+from tempfile import TemporaryFile
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.utils import datetime_index_to_ns, ns_to_datetime_index
+
+BYTES_PER_TIMESTAMP = 8
+
+
+class SeriesBuffer(object):
+    """Builds one long pd.Series from a sequence of chunks by copying each
+    chunk into preallocated, contiguous arrays, rather than keeping every
+    chunk and concatenating them at the end (which needs memory for two
+    copies of the data).
+
+    If the arrays would use more than `memory_budget` bytes then they
+    are memory-mapped temporary files, so the data can be larger than
+    RAM.
+
+    Parameters
+    ----------
+    capacity : int
+        Expected number of rows.  The arrays grow if more rows arrive.
+    dtype : numpy dtype of the values, default float32
+    memory_budget : int or None
+        Bytes.  If None then never use memory-mapped files.
+    """
+
+    def __init__(self, capacity, dtype=np.float32, memory_budget=None):
+        self.dtype = np.dtype(dtype)
+        self.memory_budget = memory_budget
+        self.n_rows = 0
+        self.tz = None
+        self.name = None
+        self._times = self._empty(capacity, np.int64)
+        self._values = self._empty(capacity, self.dtype)
+
+    @property
+    def capacity(self):
+        return len(self._values)
+
+    @property
+    def is_memmap(self):
+        return isinstance(self._values, np.memmap)
+
+    def append(self, chunk):
+        """Copy a chunk into the buffer.  Rows which are not after the end
+        of the previous chunk (i.e. overlaps between chunks) are dropped.
+
+        Parameters
+        ----------
+        chunk : pd.Series
+        """
+        if len(chunk) == 0:
+            return
+        if self.name is None:
+            self.name = chunk.name
+            self.tz = getattr(chunk.index, "tz", None)
+        times = datetime_index_to_ns(chunk.index)
+        values = chunk.to_numpy()
+        if self.n_rows:
+            first = np.searchsorted(times, self._times[self.n_rows - 1], side="right")
+            times = times[first:]
+            values = values[first:]
+        end = self.n_rows + len(times)
+        if end > self.capacity:
+            self._reallocate(max(end, 2 * self.capacity))
+        self._times[self.n_rows : end] = times
+        self._values[self.n_rows : end] = values
+        self.n_rows = end
+
+    def to_series(self):
+        """Returns a pd.Series which is a view of (not a copy of) the
+        buffer, or None if nothing was appended.  The buffer is first
+        shrunk to `n_rows`, so the Series does not keep unused capacity
+        alive."""
+        if self.name is None:
+            return None
+        self._shrink()
+        times = self._times.view("M8[ns]")
+        index = _datetime_index_view(times, self.tz)
+        return pd.Series(self._values, index=index, name=self.name)
+
+    def _shrink(self):
+        if self.capacity == self.n_rows:
+            return
+        if self.is_memmap:
+            # Copy into smaller files, rather than into memory
+            self._reallocate(self.n_rows)
+        else:
+            # There are no views of the arrays yet (`to_series` shrinks
+            # them before making any) so they can be shrunk in place,
+            # without a copy.
+            self._times.resize(self.n_rows, refcheck=False)
+            self._values.resize(self.n_rows, refcheck=False)
+
+    def _reallocate(self, capacity):
+        times = self._empty(capacity, np.int64)
+        values = self._empty(capacity, self.dtype)
+        times[: self.n_rows] = self._times[: self.n_rows]
+        values[: self.n_rows] = self._values[: self.n_rows]
+        self._times = times
+        self._values = values
+
+    def _empty(self, capacity, dtype):
+        capacity = max(int(capacity), 1)
+        n_bytes = capacity * (BYTES_PER_TIMESTAMP + self.dtype.itemsize)
+        if self.memory_budget is not None and n_bytes > self.memory_budget:
+            # The file is deleted when it is closed, and the mapping
+            # keeps its own reference to the file.
+            with TemporaryFile() as file:
+                return np.memmap(file, dtype=dtype, mode="w+", shape=(capacity,))
+        return np.empty(capacity, dtype=dtype)
+
+
+def _datetime_index_view(times, tz):
+    """Returns a pd.DatetimeIndex in `tz` which shares memory with `times`
+    (a datetime64[ns] array of UTC times) where Pandas allows it."""
+    if tz is None:
+        return pd.DatetimeIndex(times, copy=False)
+    try:
+        array = pd.arrays.DatetimeArray._simple_new(
+            times, dtype=pd.DatetimeTZDtype(tz=tz)
+        )
+    except (AttributeError, TypeError):
+        return ns_to_datetime_index(times.view(np.int64), tz)
+    return pd.DatetimeIndex(array, copy=False)
@@ -1,4 +1,7 @@
 from .totalenergy import TotalEnergy
+from .energyindex import EnergyIndex
+from .energyperperiod import EnergyPerPeriod
 from .goodsections import GoodSections
 from .dropoutrate import DropoutRate
+from .powerquantiles import PowerQuantiles
 from .histogram import histogram_from_generator
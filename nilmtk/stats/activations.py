@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.timeframe.timeframe import is_gap_between
+from nilmtk.utils import datetime_index_to_ns, ns_to_datetime_index
+
+ACTIVATION_COLUMNS = ["start", "end", "energy", "peak"]
+
+
+class ActivationDetector(object):
+    """Finds activations (runs of on-power) in a stream of power chunks.
+
+    Open activations, and the last sample of each chunk, are carried over
+    to the next chunk, so activations which span chunk boundaries are
+    found.  Each activation is summarised as a compact record, rather
+    than as a slice of the data.
+
+    Activations are found as in `nilmtk.electric.get_activations`: an
+    activation starts at the first sample at or above
+    `on_power_threshold` and ends at the next sample below it.  Off
+    periods shorter than `min_off_duration` are smoothed over, and
+    activations shorter than `min_on_duration` or with NaNs between
+    `start` and `end` are discarded.  A NaN at `end` (a NaN counts as
+    off) does not discard the activation, as `get_activations` does not
+    slice that sample unless `border > 0`.  An activation still open
+    when the stream ends is discarded.
+
+    Nothing is carried over a gap in the data, i.e. when a chunk's
+    timeframe starts after the previous chunk's timeframe ends: an
+    activation still open before the gap is discarded, as at the end of
+    the stream.
+
+    Parameters
+    ----------
+    min_off_duration : number, seconds
+    min_on_duration : number, seconds
+    on_power_threshold : number, watts
+    max_sample_period : number, seconds, optional
+        The time between successive samples is clipped to this when
+        calculating energy, as in `nilmtk.stats.totalenergy`.
+
+    Examples
+    --------
+    >>> detector = ActivationDetector(on_power_threshold=10)
+    >>> for chunk in meter.power_series():
+    ...     activations = detector.process(chunk)
+    >>> activations = detector.finish()
+    """
+
+    def __init__(
+        self,
+        min_off_duration=0,
+        min_on_duration=0,
+        on_power_threshold=5,
+        max_sample_period=None,
+    ):
+        self.min_off_duration_ns = int(min_off_duration * 1e9)
+        self.min_on_duration_ns = int(min_on_duration * 1e9)
+        self.on_power_threshold = on_power_threshold
+        self.max_sample_period_ns = (
+            None if max_sample_period is None else int(max_sample_period * 1e9)
+        )
+        self.tz = None
+        # The last sample of the previous chunk: (time, power), and the
+        # previous chunk's timeframe
+        self._last_sample = None
+        self._last_timeframe = None
+        # Energy (joules) and number of NaNs before the first sample of
+        # the current chunk
+        self._joules = 0.0
+        self._n_nans = 0
+        # The activation which is currently on, and the last completed
+        # activation (which may yet be merged with the next one).
+        # Both are dicts with keys start, end, joules_start,
+        # joules_end, nans_start, nans_end and peak.
+        self._open = None
+        self._pending = None
+
+    def process(self, chunk):
+        """Process the next chunk of power data.
+
+        Parameters
+        ----------
+        chunk : pd.Series
+
+        Returns
+        -------
+        pd.DataFrame of the activations completed so far which will not
+        change with later data.  See `activations_frame`.
+        """
+        if chunk.empty:
+            return self._frame([])
+        completed = []
+        timeframe = chunk.attrs.get("timeframe")
+        if is_gap_between(self._last_timeframe, timeframe):
+            completed.extend(self._break())
+        self._last_timeframe = timeframe
+        if self.tz is None:
+            self.tz = getattr(chunk.index, "tz", None)
+        times = datetime_index_to_ns(chunk.index)
+        values = chunk.to_numpy(dtype=np.float64)
+        if self._last_sample is not None:
+            times = np.concatenate([[self._last_sample[0]], times])
+            values = np.concatenate([[self._last_sample[1]], values])
+
+        is_nan = np.isnan(values)
+        is_on = values >= self.on_power_threshold
+        # Energy and NaN count before each sample
+        timedeltas = np.diff(times)
+        if self.max_sample_period_ns is not None:
+            np.minimum(timedeltas, self.max_sample_period_ns, out=timedeltas)
+        joules = np.concatenate(
+            [[0.0], np.cumsum(np.where(is_nan[:-1], 0.0, values[:-1]) * timedeltas)]
+        )
+        joules = self._joules + joules / 1e9
+        n_nans = np.concatenate([[0], np.cumsum(is_nan)])
+        n_nans = self._n_nans + n_nans[:-1]
+
+        # Runs of constant state, and the peak power in each run
+        events = np.flatnonzero(is_on[1:] != is_on[:-1]) + 1
+        run_starts = np.concatenate([[0], events])
+        peaks = np.maximum.reduceat(np.where(is_nan, -np.inf, values), run_starts)
+
+        if self._open is not None:
+            self._open["peak"] = max(self._open["peak"], peaks[0])
+        for run, i in enumerate(events, start=1):
+            if is_on[i]:
+                self._open = dict(
+                    start=times[i],
+                    joules_start=joules[i],
+                    nans_start=n_nans[i],
+                    peak=peaks[run],
+                )
+            elif self._open is not None:
+                activation = self._open
+                activation.update(
+                    end=times[i], joules_end=joules[i], nans_end=n_nans[i]
+                )
+                self._open = None
+                completed.extend(self._complete(activation))
+
+        # Carry the last sample over to the next chunk.  Its energy is
+        # counted once the time to the next sample is known.
+        self._last_sample = (times[-1], values[-1])
+        self._joules = joules[-1]
+        self._n_nans = n_nans[-1]
+
+        # The pending activation cannot be merged with a later activation
+        # if the off period after it is already long enough.
+        if (
+            self._pending is not None
+            and self._open is None
+            and times[-1] - self._pending["end"] >= self.min_off_duration_ns
+        ):
+            completed.extend(self._emit(self._pending))
+            self._pending = None
+        return self._frame(completed)
+
+    def finish(self):
+        """Call once the stream has ended.  Returns the last activation,
+        if any, as a pd.DataFrame."""
+        return self._frame(self._break())
+
+    def break_run(self):
+        """Call at a gap in the data, before processing the chunk after
+        the gap.  Returns the last activation before the gap, if any, as
+        a pd.DataFrame.  `process` calls this itself if the chunks have
+        a `timeframe` attribute."""
+        self._last_timeframe = None
+        return self._frame(self._break())
+
+    @property
+    def first_unfinished_start(self):
+        """The start (int64 nanoseconds) of the earliest activation which
+        has not been returned yet but may still be, or None."""
+        starts = [
+            activation["start"]
+            for activation in (self._pending, self._open)
+            if activation is not None
+        ]
+        return min(starts) if starts else None
+
+    def _break(self):
+        completed = [] if self._pending is None else self._emit(self._pending)
+        self._pending = None
+        self._open = None
+        self._last_sample = None
+        return completed
+
+    def _complete(self, activation):
+        pending = self._pending
+        if (
+            pending is not None
+            and activation["start"] - pending["end"] < self.min_off_duration_ns
+        ):
+            # Smooth over the short off period
+            pending.update(
+                end=activation["end"],
+                joules_end=activation["joules_end"],
+                nans_end=activation["nans_end"],
+                peak=max(pending["peak"], activation["peak"]),
+            )
+            return []
+        self._pending = activation
+        return [] if pending is None else self._emit(pending)
+
+    def _emit(self, activation):
+        if activation["end"] - activation["start"] < self.min_on_duration_ns:
+            return []
+        # Throw away any activation with any NaN values before its end
+        if activation["nans_end"] > activation["nans_start"]:
+            return []
+        return [activation]
+
+    def _frame(self, activations):
+        return activations_frame(
+            np.array([a["start"] for a in activations], dtype=np.int64),
+            np.array([a["end"] for a in activations], dtype=np.int64),
+            np.array(
+                [(a["joules_end"] - a["joules_start"]) for a in activations],
+                dtype=np.float64,
+            )
+            / JOULES_PER_KWH,
+            np.array([a["peak"] for a in activations], dtype=np.float64),
+            self.tz,
+        )
+
+
+def slice_activations(chunks, detector, border=1):
+    """Finds activations with `detector` and yields the data of each one,
+    in a single pass over `chunks`.
+
+    Each activation is sliced as in `nilmtk.electric.get_activations`,
+    with `border` samples after the activation and `border + 1` samples
+    before it, but without being limited to a single chunk.  Borders are
+    not extended across a gap in the data.  Between chunks only the
+    samples which may still be needed by an activation are kept.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.Series
+    detector : ActivationDetector
+    border : int
+
+    Yields
+    ------
+    pd.Series, one per activation
+    """
+    buffer = None
+    # (start, end) of the activations waiting for samples after them
+    waiting = []
+
+    def ready(final=False):
+        if buffer is None:
+            return
+        index = datetime_index_to_ns(buffer.index)
+        remaining = []
+        for start, end in waiting:
+            on = max(np.searchsorted(index, start) - 1 - border, 0)
+            off = np.searchsorted(index, end) + border
+            if off <= len(index) or final:
+                yield buffer.iloc[on:off]
+            else:
+                remaining.append((start, end))
+        waiting[:] = remaining
+
+    def wait_for(records):
+        waiting.extend(
+            zip(
+                datetime_index_to_ns(records["start"]),
+                datetime_index_to_ns(records["end"]),
+            )
+        )
+
+    last_timeframe = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        timeframe = chunk.attrs.get("timeframe")
+        if is_gap_between(last_timeframe, timeframe):
+            wait_for(detector.break_run())
+            yield from ready(final=True)
+            buffer = None
+        last_timeframe = timeframe
+        wait_for(detector.process(chunk))
+        buffer = chunk if buffer is None else pd.concat([buffer, chunk])
+        yield from ready()
+
+        # Drop the samples which no activation can need
+        starts = [start for start, _ in waiting]
+        if detector.first_unfinished_start is not None:
+            starts.append(detector.first_unfinished_start)
+        if starts:
+            index = datetime_index_to_ns(buffer.index)
+            keep = max(np.searchsorted(index, min(starts)) - 1 - border, 0)
+        else:
+            keep = max(len(buffer) - 1 - border, 0)
+        buffer = buffer.iloc[keep:]
+
+    wait_for(detector.finish())
+    yield from ready(final=True)
+
+
+def activations_frame(starts, ends, energy, peaks, tz=None):
+    """
+    Parameters
+    ----------
+    starts, ends : np.ndarray of int64 nanoseconds
+    energy : np.ndarray, kWh
+    peaks : np.ndarray, watts
+    tz : timezone or None
+
+    Returns
+    -------
+    pd.DataFrame with one row per activation and columns:
+        `start` : time of the first sample at or above the threshold
+        `end` : time of the first sample below the threshold after `start`
+        `energy` : kWh
+        `peak` : watts
+    """
+    return pd.DataFrame(
+        {
+            "start": ns_to_datetime_index(starts, tz),
+            "end": ns_to_datetime_index(ends, tz),
+            "energy": energy,
+            "peak": peaks,
+        },
+        columns=ACTIVATION_COLUMNS,
+    )
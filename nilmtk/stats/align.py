@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from nilmtk.utils import datetime_index_to_ns, ns_to_datetime_index
+
+_NEVER = np.iinfo(np.int64).max
+
+
+def align_streams(streams, sample_period, names=None):
+    """Aligns any number of streams of chunks onto a shared grid of
+    `sample_period`-second bins, in a single pass over each stream.
+
+    Each value is assigned to the bin which contains it and each bin
+    holds the mean of its values.  A bin is only yielded once every
+    stream has moved past it, so bins which span chunk boundaries are
+    complete.  Until then, each stream's partial bins are held in a small
+    carry-over buffer.  The stream which is furthest behind is always
+    advanced next, so the streams move in lockstep and only about one
+    chunk per stream is held in memory.
+
+    Parameters
+    ----------
+    streams : list of iterables of pd.Series
+        Each stream must be sorted by time, e.g. `meter.power_series()`.
+    sample_period : number, seconds
+    names : list, optional
+        Column names.  Defaults to 0, 1, ...
+
+    Yields
+    ------
+    pd.DataFrame
+        Indexed by the start of each bin, with one column per stream.
+        NaN where a stream has no valid data in a bin.
+    """
+    n_streams = len(streams)
+    if names is None:
+        names = list(range(n_streams))
+    iterators = [iter(stream) for stream in streams]
+    period_ns = int(round(sample_period * 1e9))
+    # For each stream, the last bin seen so far, which may not be
+    # complete yet.  _NEVER once the stream is exhausted.
+    frontiers = np.full(n_streams, np.iinfo(np.int64).min)
+    buffers = [_BinBuffer() for _ in range(n_streams)]
+    tz = None
+
+    while (frontiers != _NEVER).any():
+        i = frontiers.argmin()
+        try:
+            chunk = next(iterators[i])
+        except StopIteration:
+            frontiers[i] = _NEVER
+        else:
+            if len(chunk) == 0:
+                continue
+            if tz is None:
+                tz = getattr(chunk.index, "tz", None)
+            bins = datetime_index_to_ns(chunk.index) // period_ns * period_ns
+            frontiers[i] = max(frontiers[i], bins.max())
+            buffers[i].add(bins, chunk.to_numpy(dtype=np.float64))
+
+        ready = [buffer.pop_before(frontiers.min()) for buffer in buffers]
+        index = np.unique(np.concatenate([bins for bins, _ in ready]))
+        if len(index) == 0:
+            continue
+        data = {}
+        for name, (bins, means) in zip(names, ready):
+            column = np.full(len(index), np.nan)
+            column[np.searchsorted(index, bins)] = means
+            data[name] = column
+        yield pd.DataFrame(data, index=ns_to_datetime_index(index, tz), columns=names)
+
+
+class _BinBuffer(object):
+    """Running sums and counts of the bins of one stream which have not
+    been yielded yet."""
+
+    def __init__(self):
+        self.bins = np.empty(0, dtype=np.int64)
+        self.sums = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def add(self, bins, values):
+        valid = ~np.isnan(values)
+        bins = np.concatenate([self.bins, bins[valid]])
+        values = np.concatenate([self.sums, values[valid]])
+        counts = np.concatenate([self.counts, np.ones(valid.sum(), dtype=np.int64)])
+        self.bins, inverse = np.unique(bins, return_inverse=True)
+        self.sums = np.bincount(inverse, weights=values, minlength=len(self.bins))
+        self.counts = np.bincount(inverse, weights=counts, minlength=len(self.bins))
+        self.counts = self.counts.astype(np.int64)
+
+    def pop_before(self, end):
+        """Removes and returns (bins, means) for the bins before `end`."""
+        n = np.searchsorted(self.bins, end)
+        bins, sums, counts = self.bins[:n], self.sums[:n], self.counts[:n]
+        self.bins, self.sums, self.counts = (
+            self.bins[n:],
+            self.sums[n:],
+            self.counts[n:],
+        )
+        return bins, sums / counts
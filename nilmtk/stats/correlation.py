@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class CoMoments(object):
+    """Streaming, numerically stable means, variances and covariances of
+    several variables, from which the Pearson correlation can be found.
+
+    Each pair of variables uses only the samples where both are valid
+    (i.e. not NaN), as in `pd.DataFrame.corr`.  Each chunk of data is
+    summarised on its own and then merged into the running state with
+    Chan et al.'s pairwise update, so states computed independently
+    (e.g. for different sections, in parallel) can be combined with
+    `merge`.
+
+    Attributes
+    ----------
+    n : np.ndarray, shape (k, k)
+        n[i, j] is the number of samples where variables i and j are valid.
+    mean : np.ndarray, shape (k, k)
+        mean[i, j] is the mean of variable i over the samples where
+        variables i and j are valid.
+    m2 : np.ndarray, shape (k, k)
+        m2[i, j] is the sum of squared deviations of variable i from
+        mean[i, j] over the samples where variables i and j are valid.
+    c : np.ndarray, shape (k, k)
+        c[i, j] is the sum of the products of the deviations of
+        variables i and j over the samples where both are valid.
+    """
+
+    def __init__(self, n_variables):
+        shape = (n_variables, n_variables)
+        self.n = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.c = np.zeros(shape)
+
+    @classmethod
+    def from_array(cls, values):
+        """Summarise a single chunk of data.
+
+        Parameters
+        ----------
+        values : np.ndarray, shape (n_samples, k)
+            May contain NaNs.
+
+        Returns
+        -------
+        CoMoments
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        # Shift each variable by its first valid value, so the sums
+        # below don't lose precision when the mean is far from zero.
+        first_valid = valid.argmax(axis=0)
+        shift = values[first_valid, np.arange(values.shape[1])]
+        shift[~valid.any(axis=0)] = 0.0
+        x = np.where(valid, values - shift, 0.0)
+        v = valid.astype(np.float64)
+
+        comoments = cls(values.shape[1])
+        n = v.T @ v
+        sums = x.T @ v
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shifted_mean = np.where(n > 0, sums / n, 0.0)
+        comoments.n = n
+        comoments.mean = shifted_mean + shift[:, np.newaxis]
+        comoments.m2 = np.maximum((x * x).T @ v - sums * shifted_mean, 0.0)
+        comoments.c = x.T @ x - sums * shifted_mean.T
+        return comoments
+
+    def update(self, values):
+        """Add a chunk of data.  See `from_array`."""
+        self.merge(self.from_array(values))
+
+    def merge(self, other):
+        """Merge the state of `other` into `self`.
+
+        Parameters
+        ----------
+        other : CoMoments for the same variables
+        """
+        n = self.n + other.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(n > 0, other.n / n, 0.0)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * weight
+        correction = self.n * weight
+        self.m2 = self.m2 + other.m2 + delta * delta * correction
+        self.c = self.c + other.c + delta * delta.T * correction
+        self.n = n
+
+    def correlation(self):
+        """Returns the matrix of Pearson correlation coefficients.  Pairs
+        with fewer than two shared samples or zero variance are NaN."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.c / np.sqrt(self.m2 * self.m2.T)
+        corr[(self.n < 2) | ~np.isfinite(corr)] = np.nan
+        return np.clip(corr, -1, 1)
+
+    def covariance(self):
+        """Returns the matrix of sample covariances."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self.c / (self.n - 1)
+        cov[self.n < 2] = np.nan
+        return cov
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from nilmtk.utils import datetime_index_to_ns, ns_to_datetime_index
+
+
+class MinMaxDecimator(object):
+    """Reduces a stream of chunks to the minimum and maximum value in each
+    of `n_bins` equal-width time bins (e.g. one bin per pixel), so that
+    spikes survive decimation for plotting.
+
+    Only `n_bins` minima and maxima are kept, however much data is seen.
+
+    Parameters
+    ----------
+    start, end : pd.Timestamp
+        `end` is included.
+    n_bins : int
+
+    Examples
+    --------
+    >>> decimator = MinMaxDecimator(timeframe.start, timeframe.end, 800)
+    >>> for chunk in meter.power_series(sections=[timeframe]):
+    ...     decimator.update(chunk)
+    >>> series = decimator.to_series()
+    """
+
+    def __init__(self, start, end, n_bins):
+        self.start_ns = pd.Timestamp(start).value
+        duration_ns = pd.Timestamp(end).value - self.start_ns
+        self.bin_ns = max(-(-duration_ns // n_bins), 1)
+        # Add a bin if needed to include `end`
+        n_bins = duration_ns // self.bin_ns + 1
+        self.mins = np.full(n_bins, np.nan)
+        self.maxs = np.full(n_bins, np.nan)
+        self.tz = getattr(pd.Timestamp(start), "tz", None)
+        self.name = None
+
+    def update(self, chunk):
+        """
+        Parameters
+        ----------
+        chunk : pd.Series, sorted by time
+        """
+        if self.name is None:
+            self.name = chunk.name
+        if len(chunk) == 0:
+            return
+        bins = (datetime_index_to_ns(chunk.index) - self.start_ns) // self.bin_ns
+        values = chunk.to_numpy(dtype=np.float64)
+        keep = (bins >= 0) & (bins < len(self.mins)) & ~np.isnan(values)
+        bins = bins[keep]
+        values = values[keep]
+        if len(bins) == 0:
+            return
+        # Bins are sorted, so reduce each run of equal bins
+        run_starts = np.flatnonzero(np.diff(bins, prepend=-1))
+        run_bins = bins[run_starts]
+        self.mins[run_bins] = np.fmin(
+            self.mins[run_bins], np.minimum.reduceat(values, run_starts)
+        )
+        self.maxs[run_bins] = np.fmax(
+            self.maxs[run_bins], np.maximum.reduceat(values, run_starts)
+        )
+
+    def to_series(self):
+        """Returns a pd.Series with two points per bin: the minimum at a
+        quarter of the way through the bin and the maximum at three
+        quarters of the way.  Empty bins are NaN, so plotted lines are
+        broken across gaps in the data."""
+        bin_starts = self.start_ns + np.arange(len(self.mins)) * self.bin_ns
+        times = np.column_stack(
+            [bin_starts + self.bin_ns // 4, bin_starts + (3 * self.bin_ns) // 4]
+        ).ravel()
+        values = np.column_stack([self.mins, self.maxs]).ravel()
+        return pd.Series(
+            values, index=ns_to_datetime_index(times, self.tz), name=self.name
+        )
@@ -0,0 +1,94 @@
+import numpy as np
+
+from nilmtk.base.node import Node
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.stats.energyindexresults import EnergyIndexResults
+from nilmtk.stats.totalenergy import (
+    TotalEnergy,
+    _clipped_timedelta_secs,
+    select_energy_columns,
+)
+from nilmtk.utils import datetime_index_to_ns
+
+
+class EnergyIndex(Node):
+    """Accumulates energy into fixed-width time bins (e.g. one minute),
+    so that the energy over any range of whole bins can be looked up
+    with `EnergyIndexResults.energy` instead of re-reading the data.
+    """
+
+    requirements = TotalEnergy.requirements
+    postconditions = {"statistics": {"energy_index": {}}}
+    results_class = EnergyIndexResults
+
+    def __init__(self, upstream=None, generator=None, resolution="1min"):
+        """
+        Parameters
+        ----------
+        resolution : str or pd.Timedelta, width of each bin
+        """
+        self.resolution = resolution
+        super(EnergyIndex, self).__init__(upstream, generator)
+
+    def reset(self):
+        self.results = EnergyIndexResults(self.resolution)
+
+    def process(self):
+        self.check_requirements()
+        metadata = self.upstream.get_metadata()
+        max_sample_period = metadata["device"]["max_sample_period"]
+        for chunk in self.upstream.process():
+            if not chunk.empty:
+                bins, energy, ac_types = get_energy_per_bin(
+                    chunk, max_sample_period, self.results.resolution.value
+                )
+                self.results.append_bins(bins, energy, ac_types, chunk.index.tz)
+            yield chunk
+
+    def required_measurements(self, state):
+        return TotalEnergy.required_measurements(self, state)
+
+
+def get_energy_per_bin(df, max_sample_period, resolution_ns):
+    """Calculate the energy in each fixed-width time bin of a dataframe.
+
+    Energy is calculated as in `get_total_energy`.  In particular, the
+    energy of each power sample is its value multiplied by the time to the
+    next valid sample, clipped to `max_sample_period`.  The energy of
+    each sample is assigned to the bin containing that sample.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    max_sample_period : float or int
+    resolution_ns : int
+        Width of each bin in nanoseconds.  Bins are aligned to the epoch.
+
+    Returns
+    -------
+    bins : np.ndarray of int64
+        The bin number (bin start // resolution_ns) of each non-empty bin.
+    energy : 2D np.ndarray of floats, shape (len(bins), len(ac_types))
+        kWh (or equivalent for reactive and apparent power).
+    ac_types : list of strings
+    """
+    columns = select_energy_columns(df.columns)
+    index = datetime_index_to_ns(df.index)
+    bins, sample_bin = np.unique(index // resolution_ns, return_inverse=True)
+    energy = np.zeros((len(bins), len(columns)))
+    for i, (physical_quantity, ac_type) in enumerate(columns):
+        values = df[(physical_quantity, ac_type)].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        if physical_quantity == "power":
+            timedelta_secs = _clipped_timedelta_secs(index[valid], max_sample_period)
+            sample_energy = values[valid[:-1]] * timedelta_secs / JOULES_PER_KWH
+            valid = valid[:-1]
+        elif physical_quantity == "cumulative energy":
+            sample_energy = np.diff(values[valid])
+            valid = valid[:-1]
+        else:
+            sample_energy = values[valid]
+        energy[:, i] = np.bincount(
+            sample_bin[valid], weights=sample_energy, minlength=len(bins)
+        )
+    return bins, energy, [ac_type for _, ac_type in columns]
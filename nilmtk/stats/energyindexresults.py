@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from nilmtk.base.results import Results
+from nilmtk.timeframe.timeframe import TimeFrame
+from nilmtk.utils import datetime_index_to_ns, get_tz, ns_to_datetime_index
+
+
+class EnergyIndexResults(Results):
+    """Energy per fixed-width time bin, with prefix sums so that the energy
+    over any range of whole bins is the difference of two lookups.
+
+    Only bins which contain samples are stored.  Bins are aligned to the
+    epoch, so one-minute bins always start on the minute.
+
+    Attributes
+    ----------
+    resolution : pd.Timedelta
+        Width of each bin.
+    _data : pd.DataFrame
+        index is the start of each bin
+        `end` is the end of each bin
+        one column per AC type, holding energy in kWh
+        (or equivalent for reactive and apparent power)
+    """
+
+    name = "energy_index"
+
+    def __init__(self, resolution="1min"):
+        self.resolution = pd.Timedelta(resolution)
+        self._pending = []
+        self._prefix_sums = None
+        super(EnergyIndexResults, self).__init__()
+
+    @property
+    def cache_name(self):
+        """Name used to cache this index, which includes its resolution."""
+        return "{}_{:d}s".format(self.name, int(self.resolution.total_seconds()))
+
+    @property
+    def _data(self):
+        if self._pending:
+            self._consolidate()
+        return self._binned
+
+    @_data.setter
+    def _data(self, data):
+        self._binned = data
+        self._pending = []
+        self._prefix_sums = None
+
+    def append_bins(self, bins, energy, ac_types, tz=None):
+        """Add energy per bin from a new chunk of data.
+
+        Parameters
+        ----------
+        bins : np.ndarray of int64, bin numbers (bin start // resolution)
+        energy : 2D np.ndarray, shape (len(bins), len(ac_types)), kWh
+        ac_types : list of strings
+        tz : timezone of the data, or None
+        """
+        self._pending.append((bins, energy, list(ac_types), tz))
+        self._prefix_sums = None
+
+    def _consolidate(self):
+        """Merge pending chunks into self._binned, summing bins which
+        appear in more than one chunk."""
+        tz = next((tz for _, _, _, tz in self._pending if tz is not None), None)
+        resolution_ns = self.resolution.value
+        frames = [] if self._binned.empty else [self._binned.drop(columns="end")]
+        for bins, energy, ac_types, _ in self._pending:
+            index = ns_to_datetime_index(bins * resolution_ns, tz)
+            frames.append(pd.DataFrame(energy, index=index, columns=ac_types))
+        self._pending = []
+
+        data = pd.concat(frames, sort=False)
+        if not data.index.is_unique:
+            data = data.groupby(level=0, sort=False).sum(min_count=1)
+        data.sort_index(inplace=True)
+        data.insert(0, "end", data.index + self.resolution)
+        self._binned = data
+
+    def energy(self, sections):
+        """Energy over `sections` using the index.
+
+        Parameters
+        ----------
+        sections : list of nilmtk.TimeFrame objects
+
+        Returns
+        -------
+        energy : pd.Series
+            kWh per AC type for the whole bins within `sections`.
+        edges : list of nilmtk.TimeFrame objects
+            The parts of `sections` which do not cover whole bins.
+            Energy for these must be calculated from the raw data.
+        """
+        bin_starts, cumulative, ac_types = self._get_prefix_sums()
+        resolution_ns = self.resolution.value
+        tz = get_tz(self._data)
+        energy = np.zeros(len(ac_types))
+        edges = []
+        for section in sections:
+            if not section or section.empty:
+                continue
+            start, end = section.start_ns, section.end_ns
+            # First and last whole bins within the section
+            first = None if start is None else -(-start // resolution_ns)
+            last = None if end is None else end // resolution_ns
+            if first is not None and last is not None and first >= last:
+                edges.append(section)
+                continue
+            if first is None:
+                i_first = 0
+            else:
+                i_first = np.searchsorted(bin_starts, first * resolution_ns)
+                if start < first * resolution_ns:
+                    edges.append(TimeFrame.from_ns(start, first * resolution_ns, tz))
+            if last is None:
+                i_last = len(bin_starts)
+            else:
+                i_last = np.searchsorted(bin_starts, last * resolution_ns)
+                if last * resolution_ns < end:
+                    edges.append(
+                        TimeFrame.from_ns(
+                            last * resolution_ns, end, tz, section.include_end
+                        )
+                    )
+            energy += cumulative[i_last] - cumulative[i_first]
+        return pd.Series(energy, index=ac_types), edges
+
+    def _get_prefix_sums(self):
+        if self._prefix_sums is None:
+            data = self._data
+            ac_types = self._columns_with_end_removed()
+            values = data[ac_types].fillna(0).to_numpy(dtype=np.float64)
+            cumulative = np.zeros((len(data) + 1, len(ac_types)))
+            np.cumsum(values, axis=0, out=cumulative[1:])
+            bin_starts = datetime_index_to_ns(data.index) if len(data) else []
+            self._prefix_sums = (np.asarray(bin_starts, np.int64), cumulative, ac_types)
+        return self._prefix_sums
+
+    def to_dict(self):
+        return {
+            "statistics": {
+                "energy_index": {"resolution": self.resolution.total_seconds()}
+            }
+        }
+
+    def import_from_cache(self, cached_stat, sections=None):
+        """The index covers all of the meter's data, so `sections` is
+        ignored."""
+        if cached_stat.empty:
+            return
+        data = cached_stat.drop(columns="end")
+        data.insert(0, "end", data.index + self.resolution)
+        self._data = data
+
+    def export_to_cache(self):
+        return self._data.fillna(0).apply(pd.to_numeric)
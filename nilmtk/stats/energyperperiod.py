@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import Day, Tick
+
+from nilmtk.base.node import Node
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.stats.energyperperiodresults import EnergyPerPeriodResults
+from nilmtk.stats.totalenergy import TotalEnergy, select_energy_columns
+from nilmtk.utils import datetime_index_to_ns
+
+
+class EnergyPerPeriod(Node):
+    """Accumulates energy into calendar periods (e.g. days or months) in
+    the timezone of the data.
+
+    Attributes
+    ----------
+    offset_alias : str
+        A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+    """
+
+    requirements = TotalEnergy.requirements
+    postconditions = {"statistics": {"energy_per_period": {}}}
+    results_class = EnergyPerPeriodResults
+
+    def __init__(self, upstream=None, generator=None, offset_alias="D"):
+        self.offset_alias = offset_alias
+        super(EnergyPerPeriod, self).__init__(upstream, generator)
+
+    def reset(self):
+        self.results = EnergyPerPeriodResults(self.offset_alias)
+
+    def process(self):
+        self.check_requirements()
+        metadata = self.upstream.get_metadata()
+        max_sample_period = metadata["device"]["max_sample_period"]
+        for chunk in self.upstream.process():
+            if not chunk.empty:
+                starts, ends, energy, ac_types = get_energy_per_period(
+                    chunk, max_sample_period, self.offset_alias
+                )
+                self.results.append_periods(
+                    starts, ends, energy, ac_types, chunk.index.tz
+                )
+            yield chunk
+
+    def required_measurements(self, state):
+        return TotalEnergy.required_measurements(self, state)
+
+
+def get_energy_per_period(df, max_sample_period, offset_alias):
+    """Calculate the energy in each calendar period of a dataframe.
+
+    The energy of each power sample is its value multiplied by the time
+    to the next valid sample (clipped to `max_sample_period`) and is
+    spread evenly over that time, so a sample which straddles the
+    boundary between two periods is split between them.  Likewise, each
+    increment of a cumulative energy meter is spread over the time since
+    the previous reading.  Energy samples are assigned to the period
+    which contains them.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    max_sample_period : float or int
+    offset_alias : str
+        A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+
+    Returns
+    -------
+    starts, ends : np.ndarray of int64 nanoseconds
+        The start and end of each period which contains data.
+    energy : 2D np.ndarray of floats, shape (len(starts), len(ac_types))
+        kWh (or equivalent for reactive and apparent power).
+    ac_types : list of strings
+    """
+    columns = select_energy_columns(df.columns)
+    index = datetime_index_to_ns(df.index)
+    if not df.index.is_monotonic_increasing:
+        order = np.argsort(index, kind="stable")
+        index = index[order]
+        df = df.iloc[order]
+    edges = calendar_period_edges(
+        index[0], index[-1], offset_alias, getattr(df.index, "tz", None)
+    )
+
+    energy = np.empty((len(edges), len(columns)))
+    for i, (physical_quantity, ac_type) in enumerate(columns):
+        values = df[(physical_quantity, ac_type)].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        timestamps = index[valid]
+        values = values[valid]
+        if physical_quantity == "power":
+            durations = np.minimum(np.diff(timestamps), max_sample_period * 1e9)
+            interval_starts = timestamps[:-1]
+            interval_ends = interval_starts + durations.astype(np.int64)
+            sample_energy = values[:-1] * durations / 1e9 / JOULES_PER_KWH
+        elif physical_quantity == "cumulative energy":
+            interval_starts = timestamps[:-1]
+            interval_ends = timestamps[1:]
+            sample_energy = np.diff(values)
+        else:
+            interval_starts = interval_ends = timestamps
+            sample_energy = values
+        energy[:, i] = _cumulative_energy_at(
+            edges, interval_starts, interval_ends, sample_energy
+        )
+
+    energy = np.diff(energy, axis=0)
+    # Only keep periods which contain samples or energy
+    sample_period = np.searchsorted(edges, index, side="right") - 1
+    has_data = np.bincount(sample_period, minlength=len(edges) - 1) > 0
+    has_data |= (energy != 0).any(axis=1)
+    return (
+        edges[:-1][has_data],
+        edges[1:][has_data],
+        energy[has_data],
+        [ac_type for _, ac_type in columns],
+    )
+
+
+def _cumulative_energy_at(times, interval_starts, interval_ends, energy):
+    """Returns the energy accumulated up to each of `times`, where each
+    element of `energy` is spread evenly over its (non-overlapping,
+    sorted) interval."""
+    cumulative = np.concatenate([[0.0], np.cumsum(energy)])
+    n_complete = np.searchsorted(interval_ends, times, side="left")
+    result = cumulative[n_complete]
+
+    # Add the part of any interval which straddles each time
+    straddling = np.flatnonzero(n_complete < len(energy))
+    i = n_complete[straddling]
+    elapsed = times[straddling] - interval_starts[i]
+    partial = elapsed > 0
+    straddling, i, elapsed = straddling[partial], i[partial], elapsed[partial]
+    duration = interval_ends[i] - interval_starts[i]
+    result[straddling] += energy[i] * elapsed / duration
+    return result
+
+
+def calendar_period_edges(first, last, offset_alias, tz=None):
+    """Boundaries of the calendar periods which cover `first` to `last`.
+
+    Periods of a day or longer follow the wall clock in `tz`, so days
+    are 23 or 25 hours long when daylight saving time starts or ends.
+    Shorter periods (e.g. hours) have a fixed length.
+
+    Parameters
+    ----------
+    first, last : int, nanoseconds since the epoch (UTC)
+    offset_alias : str
+        A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+    tz : timezone or None
+
+    Returns
+    -------
+    np.ndarray of int64 nanoseconds
+        The start of each period followed by the end of the last period.
+    """
+    wall = pd.DatetimeIndex(np.array([first, last], dtype=np.int64).view("M8[ns]"))
+    if tz is not None:
+        wall = wall.tz_localize("UTC").tz_convert(tz).tz_localize(None)
+    periods = wall.to_period(offset_alias)
+
+    freq = periods.freq
+    if isinstance(freq, Tick) and not isinstance(freq, Day):
+        start = _localize(wall[0].floor(freq), tz, ambiguous=True)
+        end = _localize(wall[1].floor(freq) + freq, tz, ambiguous=False)
+        edges = pd.date_range(start, end, freq=freq)
+    else:
+        edges = pd.period_range(periods[0], periods[1] + 1).start_time
+        if tz is not None:
+            edges = edges.tz_localize(
+                tz,
+                ambiguous=np.ones(len(edges), dtype=bool),
+                nonexistent="shift_forward",
+            )
+    return datetime_index_to_ns(edges)
+
+
+def _localize(timestamp, tz, ambiguous):
+    if tz is None:
+        return timestamp
+    return timestamp.tz_localize(tz, ambiguous=ambiguous, nonexistent="shift_forward")
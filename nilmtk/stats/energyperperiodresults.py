@@ -0,0 +1,103 @@
+import pandas as pd
+
+from nilmtk.base.results import Results
+from nilmtk.utils import get_tz, ns_to_datetime_index
+
+
+class EnergyPerPeriodResults(Results):
+    """Energy per calendar period (e.g. per day).
+
+    Attributes
+    ----------
+    offset_alias : str
+        A Pandas period alias, e.g. 'h', 'D', 'W', 'M' or 'Y'.
+    _data : pd.DataFrame
+        index is the start of each period
+        `end` is the end of each period
+        one column per AC type, holding energy in kWh
+        (or equivalent for reactive and apparent power)
+    """
+
+    name = "energy_per_period"
+
+    def __init__(self, offset_alias="D"):
+        self.offset_alias = offset_alias
+        self._pending = []
+        super(EnergyPerPeriodResults, self).__init__()
+
+    @property
+    def cache_name(self):
+        """Name used to cache these results, which includes the period."""
+        return "{}_{}".format(self.name, self.offset_alias)
+
+    @property
+    def _data(self):
+        if self._pending:
+            self._consolidate()
+        return self._periods
+
+    @_data.setter
+    def _data(self, data):
+        self._periods = data
+        self._pending = []
+
+    def append_periods(self, starts, ends, energy, ac_types, tz=None):
+        """Add energy per period from a new chunk of data.
+
+        Parameters
+        ----------
+        starts, ends : np.ndarray of int64 nanoseconds
+        energy : 2D np.ndarray, shape (len(starts), len(ac_types)), kWh
+        ac_types : list of strings
+        tz : timezone of the data, or None
+        """
+        self._pending.append((starts, ends, energy, list(ac_types), tz))
+
+    def _consolidate(self):
+        """Merge pending chunks into self._periods, summing periods which
+        appear in more than one chunk (i.e. which straddle chunk
+        boundaries)."""
+        tz = next((tz for _, _, _, _, tz in self._pending if tz is not None), None)
+        frames = [] if self._periods.empty else [self._periods]
+        for starts, ends, energy, ac_types, _ in self._pending:
+            data = pd.DataFrame(
+                energy, index=ns_to_datetime_index(starts, tz), columns=ac_types
+            )
+            data.insert(0, "end", ns_to_datetime_index(ends, tz))
+            frames.append(data)
+        self._pending = []
+
+        data = pd.concat(frames, sort=False)
+        if not data.index.is_unique:
+            grouped = data.groupby(level=0, sort=False)
+            ends = grouped["end"].first()
+            data = grouped[self._ac_types(data)].sum(min_count=1)
+            data.insert(0, "end", ends)
+        data.sort_index(inplace=True)
+        self._periods = data
+
+    def simple(self):
+        """Returns a pd.DataFrame of energy per period.  The index is the
+        start of each period and there is a column per AC type."""
+        return self._data[self._ac_types(self._data)]
+
+    def to_dict(self):
+        return {
+            "statistics": {"energy_per_period": {"offset_alias": self.offset_alias}}
+        }
+
+    def import_from_cache(self, cached_stat, sections=None):
+        """The cache covers all of the meter's data, so `sections` is
+        ignored."""
+        if cached_stat.empty:
+            return
+        data = cached_stat.copy()
+        data["end"] = ns_to_datetime_index(data["end"], get_tz(data))
+        self._data = data
+
+    def export_to_cache(self):
+        return self._data.fillna(0).apply(pd.to_numeric)
+
+    @staticmethod
+    def _ac_types(data):
+        return [column for column in data.columns if column != "end"]
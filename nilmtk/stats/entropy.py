@@ -0,0 +1,133 @@
+"""k-nearest-neighbour estimators of entropy and mutual information.
+
+These are vectorised versions of the estimators in the NPEET toolbox,
+whose authors kindly allowed us to use their code.  As a courtesy, you
+may wish to cite their paper if you use these functions.
+"""
+
+from math import log
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.special import digamma
+
+# Small noise added to break degeneracy between identical samples
+NOISE_INTENSITY = 1e-10
+
+
+def knn_entropy(x, k=3, base=2, rng=None):
+    """The classic Kozachenko-Leonenko k-nearest neighbour continuous
+    entropy estimator.
+
+    Parameters
+    ----------
+    x : np.ndarray, shape (n_samples,) or (n_samples, n_dimensions)
+    k : int
+    base : number, base of the logarithm
+    rng : np.random.Generator, optional
+
+    Returns
+    -------
+    float
+    """
+    x = _add_noise(x, rng)
+    n, d = x.shape
+    if k > n - 1:
+        raise ValueError("Set k smaller than num. samples - 1")
+    tree = cKDTree(x)
+    nn = tree.query(x, k + 1, p=np.inf, workers=-1)[0][:, k]
+    const = digamma(n) - digamma(k) + d * log(2)
+    return (const + d * np.mean(np.log(nn))) / log(base)
+
+
+def knn_mutual_information(x, y, k=3, base=2, rng=None):
+    """The Kraskov et al. k-nearest neighbour mutual information estimator.
+
+    Parameters
+    ----------
+    x, y : np.ndarray, shape (n_samples,) or (n_samples, n_dimensions)
+    k : int
+    base : number, base of the logarithm
+    rng : np.random.Generator, optional
+
+    Returns
+    -------
+    float
+    """
+    x = _add_noise(x, rng)
+    y = _add_noise(y, rng)
+    n = len(x)
+    if k > n - 1:
+        raise ValueError("Set k smaller than num. samples - 1")
+    # Find nearest neighbors in joint space, p=inf means max-norm
+    points = np.hstack([x, y])
+    tree = cKDTree(points)
+    dvec = tree.query(points, k + 1, p=np.inf, workers=-1)[0][:, k]
+    a, b, c, d = (
+        _avg_digamma(x, dvec),
+        _avg_digamma(y, dvec),
+        digamma(k),
+        digamma(n),
+    )
+    return (-a - b + c + d) / log(base)
+
+
+def _avg_digamma(points, dvec):
+    """Finds the number of neighbours within `dvec` of each point in the
+    marginal space and returns the expectation value of <psi(nx)>."""
+    tree = cKDTree(points)
+    # subtlety, we don't include the boundary point,
+    # but we are implicitly adding 1 to kraskov def bc center point is included
+    num_points = tree.query_ball_point(
+        points, dvec - 1e-15, p=np.inf, return_length=True, workers=-1
+    )
+    return np.mean(digamma(num_points))
+
+
+def _add_noise(x, rng):
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    if rng is None:
+        rng = np.random.default_rng()
+    return x + NOISE_INTENSITY * rng.random(x.shape)
+
+
+def reservoir_sample(chunks, size, rng=None, n_columns=None):
+    """Uniform random sample of rows from a stream of arrays, without
+    holding the stream in memory (Vitter's Algorithm R).
+
+    Parameters
+    ----------
+    chunks : iterable of np.ndarray, each of shape (n_rows, n_columns)
+    size : int, number of rows to sample
+    rng : np.random.Generator, optional
+    n_columns : int, optional
+        Number of columns of the returned array if `chunks` yields
+        nothing.  If None then an empty 1D array is returned.
+
+    Returns
+    -------
+    np.ndarray with at most `size` rows
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    reservoir = None
+    n_seen = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if reservoir is None:
+            reservoir = np.empty((size,) + chunk.shape[1:], dtype=chunk.dtype)
+        # Fill the reservoir
+        n_fill = max(0, min(size - n_seen, len(chunk)))
+        reservoir[n_seen : n_seen + n_fill] = chunk[:n_fill]
+        # Then replace a random element with row t with probability size/(t+1)
+        rest = chunk[n_fill:]
+        t = n_seen + n_fill + np.arange(len(rest))
+        slots = rng.integers(0, t + 1)
+        accept = slots < size
+        reservoir[slots[accept]] = rest[accept]
+        n_seen += len(chunk)
+    if reservoir is None:
+        return np.empty((0,) if n_columns is None else (0, n_columns))
+    return reservoir[: min(size, n_seen)]
@@ -1,11 +1,10 @@
-import gc
-
-from numpy import concatenate, diff
+import numpy as np
 
 from nilmtk.base.node import Node
 from nilmtk.stats.goodsectionsresults import GoodSectionsResults
 from nilmtk.timeframe.timeframe import TimeFrame
-from nilmtk.utils import timedelta64_to_secs
+from nilmtk.timeframe.timeframegroup import OPEN_END, OPEN_START
+from nilmtk.utils import datetime_index_to_ns
 
 
 class GoodSections(Node):
@@ -100,87 +99,127 @@ def get_good_sections(
         `end=None`.  If this df starts with an open-ended good section
         then the first TimeFrame will have `start=None`.
     """
-    index = df.dropna().sort_index().index
-    del df
-
-    if len(index) < 2:
-        return []
+    starts, ends = get_good_section_bounds(
+        _valid_index_ns(df),
+        max_sample_period,
+        _first_valid_ns(look_ahead),
+        previous_chunk_ended_with_open_ended_good_section,
+    )
+    tz = getattr(df.index, "tz", None)
+    return [
+        TimeFrame.from_ns(
+            None if start == OPEN_START else start,
+            None if end == OPEN_END else end,
+            tz,
+        )
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
 
-    timedeltas_sec = timedelta64_to_secs(diff(index.values))
-    timedeltas_check = timedeltas_sec <= max_sample_period
 
-    # Memory management
-    del timedeltas_sec
-    gc.collect()
+def get_good_section_bounds(
+    index,
+    max_sample_period,
+    look_ahead_start=None,
+    previous_chunk_ended_with_open_ended_good_section=False,
+):
+    """Locates good sections in a sorted int64 index.
 
-    timedeltas_check = concatenate(
-        [[previous_chunk_ended_with_open_ended_good_section], timedeltas_check]
-    )
-    transitions = diff(timedeltas_check.astype(int))
+    Parameters
+    ----------
+    index : np.ndarray of int64 nanoseconds, sorted
+        Timestamps of the valid samples in the chunk.
+    max_sample_period : number, seconds
+    look_ahead_start : int, optional
+        Timestamp (in nanoseconds) of the first valid sample after the chunk.
+    previous_chunk_ended_with_open_ended_good_section : bool
 
-    # Memory management
-    last_timedeltas_check = timedeltas_check[-1]
-    del timedeltas_check
-    gc.collect()
+    Returns
+    -------
+    starts, ends : np.ndarray of int64 nanoseconds
+        The start and end of each good section.  If the chunk starts
+        with an open-ended good section then starts[0] is OPEN_START.
+        If it ends with an open-ended good section (assessed by
+        examining `look_ahead_start`) then ends[-1] is OPEN_END.
+    """
+    if len(index) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
 
-    good_sect_starts = list(index[:-1][transitions == 1])
-    good_sect_ends = list(index[:-1][transitions == -1])
+    max_sample_period_ns = max_sample_period * 1e9
+    timedeltas_check = np.empty(len(index), dtype=np.int8)
+    timedeltas_check[0] = previous_chunk_ended_with_open_ended_good_section
+    np.less_equal(np.diff(index), max_sample_period_ns, out=timedeltas_check[1:])
+    transitions = np.diff(timedeltas_check)
 
-    # Memory management
-    last_index = index[-1]
-    del index
-    gc.collect()
+    good_sect_starts = [index[:-1][transitions == 1]]
+    good_sect_ends = [index[:-1][transitions == -1]]
+    n_starts = len(good_sect_starts[0])
+    n_ends = len(good_sect_ends[0])
 
     # Use look_ahead to see if we need to append a
     # good sect start or good sect end.
-    look_ahead_valid = look_ahead is not None and not look_ahead.empty
+    last_index = index[-1]
+    look_ahead_valid = look_ahead_start is not None
     if look_ahead_valid:
-        look_ahead_timedelta = look_ahead.dropna().index[0] - last_index
-        look_ahead_gap = look_ahead_timedelta.total_seconds()
-    if last_timedeltas_check:  # current chunk ends with a good section
-        if not look_ahead_valid or look_ahead_gap > max_sample_period:
+        look_ahead_gap_ns = look_ahead_start - last_index
+    if timedeltas_check[-1]:  # current chunk ends with a good section
+        if not look_ahead_valid or look_ahead_gap_ns > max_sample_period_ns:
             # current chunk ends with a good section which needs to
             # be closed because next chunk either does not exist
             # or starts with a sample which is more than max_sample_period
             # away from df.index[-1]
-            good_sect_ends += [last_index]
-    elif look_ahead_valid and look_ahead_gap <= max_sample_period:
+            good_sect_ends.append([last_index])
+            n_ends += 1
+    elif look_ahead_valid and look_ahead_gap_ns <= max_sample_period_ns:
         # Current chunk appears to end with a bad section
         # but last sample is the start of a good section
-        good_sect_starts += [last_index]
-
-    # Work out if this chunk ends with an open ended good section
-    if len(good_sect_ends) == 0:
-        ends_with_open_ended_good_section = (
-            len(good_sect_starts) > 0
-            or previous_chunk_ended_with_open_ended_good_section
-        )
-    elif len(good_sect_starts) > 0:
-        # We have good_sect_ends and good_sect_starts
-        ends_with_open_ended_good_section = good_sect_ends[-1] < good_sect_starts[-1]
-    else:
-        # We have good_sect_ends but no good_sect_starts
-        ends_with_open_ended_good_section = False
+        good_sect_starts.append([last_index])
+        n_starts += 1
+
+    # Work out if this chunk ends with an open ended good section.
+    # Starts and ends alternate so, after the first start, the chunk
+    # ends with an open-ended good section if there are as many
+    # starts as ends (or more starts than ends if the chunk started
+    # with a good section).
+    ends_with_open_ended_good_section = (
+        n_starts + previous_chunk_ended_with_open_ended_good_section > n_ends
+    )
 
     # If this chunk starts or ends with an open-ended
-    # good section then the relevant TimeFrame needs to have
-    # a None as the start or end.
+    # good section then the relevant bound is OPEN_START or OPEN_END.
     if previous_chunk_ended_with_open_ended_good_section:
-        good_sect_starts = [None] + good_sect_starts
+        good_sect_starts.insert(0, [OPEN_START])
     if ends_with_open_ended_good_section:
-        good_sect_ends += [None]
+        good_sect_ends.append([OPEN_END])
 
-    assert len(good_sect_starts) == len(good_sect_ends)
+    starts = np.concatenate(good_sect_starts).astype(np.int64, copy=False)
+    ends = np.concatenate(good_sect_ends).astype(np.int64, copy=False)
+    assert len(starts) == len(ends)
 
-    sections = [
-        TimeFrame(start, end)
-        for start, end in zip(good_sect_starts, good_sect_ends)
-        if not (start == end and start is not None)
-    ]
+    non_empty = starts != ends
+    return starts[non_empty], ends[non_empty]
 
-    # Memory management
-    del good_sect_starts
-    del good_sect_ends
-    gc.collect()
 
-    return sections
+def _valid_index_ns(df):
+    """Returns the int64 index of the rows of `df` without NaNs, sorted."""
+    index = df.index
+    if all(dtype.kind == "f" for dtype in df.dtypes):
+        valid = ~np.isnan(df.to_numpy()).any(axis=1)
+    else:
+        valid = df.notna().all(axis=1).to_numpy()
+    index_ns = datetime_index_to_ns(index)
+    if not valid.all():
+        index_ns = index_ns[valid]
+    if not index.is_monotonic_increasing:
+        index_ns = np.sort(index_ns)
+    return index_ns
+
+
+def _first_valid_ns(look_ahead):
+    """Returns the timestamp (int64 nanoseconds) of the first row of
+    `look_ahead` without NaNs, or None."""
+    if look_ahead is None or look_ahead.empty:
+        return None
+    index_ns = _valid_index_ns(look_ahead)
+    if len(index_ns) == 0:
+        return None
+    return index_ns[0]
@@ -1,11 +1,14 @@
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 
 from nilmtk.base.results import Results
-from nilmtk.timeframe.timeframe import TimeFrame, convert_none_to_nat
-from nilmtk.timeframe.timeframegroup import TimeFrameGroup
-from nilmtk.utils import get_tz, tz_localize_naive
+from nilmtk.timeframe.timeframegroup import OPEN_END, OPEN_START, TimeFrameGroup
+from nilmtk.utils import datetime_index_to_ns, get_tz, ns_to_datetime_index
+
+# int64 representation of NaT, used for open-ended sections in the cache
+NAT = np.iinfo(np.int64).min
 
 
 class GoodSectionsResults(Results):
@@ -45,56 +48,75 @@ class GoodSectionsResults(Results):
         -------
         sections : TimeFrameGroup (a subclass of Python's list class)
         """
-        sections = TimeFrameGroup()
-        end_date_of_prev_row = None
-        for index, row in self._data.iterrows():
-            row_sections = row["sections"]
-
-            # Check if first TimeFrame of row_sections needs to be merged with
-            # last TimeFrame of previous section
-            if end_date_of_prev_row is not None:
-                rows_are_adjacent = (
-                    (end_date_of_prev_row - self.max_sample_period_td)
-                    <= index
-                    <= end_date_of_prev_row
-                )
-
-                if rows_are_adjacent and row_sections[0].start is None:
-                    assert sections[-1].end is None
-                    sections[-1].end = row_sections[0].end
-                    row_sections.pop(0)
-                else:
-                    # row_sections[0] and sections[-1] were not in adjacent chunks
-                    # so check if they are both open-ended and close them...
-                    if sections and sections[-1].end is None:
-                        try:
-                            sections[-1].end = end_date_of_prev_row
-                        except (
-                            ValueError
-                        ):  # end_date_of_prev_row before sections[-1].start
-                            pass
-                    if row_sections and row_sections[0].start is None:
-                        try:
-                            row_sections[0].start = index
-                        except ValueError:
-                            pass
-
-            end_date_of_prev_row = row["end"]
-            sections.extend(row_sections)
-
-        if sections:
-            sections[-1].include_end = True
-            if sections[-1].end is None:
-                sections[-1].end = end_date_of_prev_row
-
-        return sections
+        if self._data.empty:
+            return TimeFrameGroup()
+        (
+            row_starts,
+            row_ends,
+            section_rows,
+            section_starts,
+            section_ends,
+        ) = self._flat_arrays()
+        tz = get_tz(self._data)
+        if len(section_starts) == 0:
+            return TimeFrameGroup()
+
+        # The first section of each row, and the last section before it
+        n_sections_per_row = np.bincount(section_rows, minlength=len(row_starts))
+        is_first_in_row = np.diff(section_rows, prepend=-1) != 0
+        first_in_row = np.flatnonzero(is_first_in_row)
+        first_in_row = first_in_row[section_rows[first_in_row] > 0]
+        rows = section_rows[first_in_row]
+        end_of_prev_row = row_ends[rows - 1]
+        rows_are_adjacent = (
+            end_of_prev_row - pd.Timedelta(self.max_sample_period_td).value
+            <= row_starts[rows]
+        ) & (row_starts[rows] <= end_of_prev_row)
+
+        # Join the first section of a row with the last section of the
+        # previous row if both are open-ended and the rows are adjacent.
+        joins_previous = np.zeros(len(section_starts), dtype=bool)
+        joins_previous[first_in_row] = (
+            rows_are_adjacent
+            & (section_starts[first_in_row] == OPEN_START)
+            & (section_ends[first_in_row - 1] == OPEN_END)
+            & (n_sections_per_row[rows - 1] > 0)
+        )
+
+        # Otherwise close open-ended sections at the edge of their row,
+        # unless that would make the section empty.
+        opens_row = first_in_row[~joins_previous[first_in_row]]
+        section_starts = section_starts.copy()
+        row_start = row_starts[section_rows[opens_row]]
+        can_close = (section_starts[opens_row] == OPEN_START) & (
+            row_start < section_ends[opens_row]
+        )
+        section_starts[opens_row[can_close]] = row_start[can_close]
+
+        group_starts = np.flatnonzero(~joins_previous)
+        group_ends = np.append(group_starts[1:], len(section_starts)) - 1
+        starts = section_starts[group_starts]
+        ends = section_ends[group_ends].copy()
+        row_end = row_ends[section_rows[group_ends]]
+        row_end[-1] = row_ends[-1]
+        can_close = (ends == OPEN_END) & (row_end > starts)
+        ends[can_close] = row_end[can_close]
+
+        include_end = np.zeros(len(starts), dtype=bool)
+        include_end[-1] = True
+        return TimeFrameGroup.from_arrays(starts, ends, include_end, tz)
 
     def unify(self, other):
         super(GoodSectionsResults, self).unify(other)
-        for start, row in self._data.iterrows():
-            other_sections = other._data["sections"].loc[start]
-            intersection = row["sections"].intersection(other_sections)
-            self._data["sections"].loc[start] = intersection
+        other_sections = other._data["sections"].loc[self._data.index]
+        self._data["sections"] = _object_array(
+            [
+                sections.intersection(other_row_sections)
+                for sections, other_row_sections in zip(
+                    self._data["sections"], other_sections
+                )
+            ]
+        )
 
     def to_dict(self):
         good_sections = self.combined()
@@ -109,20 +131,55 @@ class GoodSectionsResults(Results):
 
     def import_from_cache(self, cached_stat, sections):
         # we (deliberately) use duplicate indices to cache GoodSectionResults
-        grouped_by_index = cached_stat.groupby(level=0)
+        if cached_stat.empty:
+            return
+
         tz = get_tz(cached_stat)
-        for tf_start, df_grouped_by_index in grouped_by_index:
-            grouped_by_end = df_grouped_by_index.groupby("end")
-            for tf_end, sections_df in grouped_by_end:
-                end = tz_localize_naive(tf_end, tz)
-                timeframe = TimeFrame(tf_start, end)
-                if timeframe in sections:
-                    timeframes = []
-                    for _, row in sections_df.iterrows():
-                        section_start = tz_localize_naive(row["section_start"], tz)
-                        section_end = tz_localize_naive(row["section_end"], tz)
-                        timeframes.append(TimeFrame(section_start, section_end))
-                    self.append(timeframe, {"sections": [timeframes]})
+        row_starts = datetime_index_to_ns(cached_stat.index)
+        row_ends = cached_stat["end"].to_numpy(dtype=np.int64)
+        wanted = [(section.start_ns, section.end_ns) for section in sections if section]
+        if not wanted:
+            return
+        usable = pd.MultiIndex.from_arrays([row_starts, row_ends]).isin(wanted)
+        if not usable.any():
+            return
+
+        # Sort by (start, end) and split into one group of rows per chunk
+        order = np.flatnonzero(usable)
+        order = order[np.lexsort((row_ends[order], row_starts[order]))]
+        row_starts = row_starts[order]
+        row_ends = row_ends[order]
+        section_starts = cached_stat["section_start"].to_numpy(dtype=np.int64)[order]
+        section_ends = cached_stat["section_end"].to_numpy(dtype=np.int64)[order]
+        new_chunk = np.flatnonzero(
+            (np.diff(row_starts, prepend=row_starts[0] - 1) != 0)
+            | (np.diff(row_ends, prepend=row_ends[0] - 1) != 0)
+        )
+        chunk_bounds = np.append(new_chunk, len(order))
+
+        # NaT marks an open-ended section
+        section_starts[section_starts == NAT] = OPEN_START
+        section_ends[section_ends == NAT] = OPEN_END
+        sections_per_chunk = [
+            TimeFrameGroup.from_arrays(
+                section_starts[first:last], section_ends[first:last], tz=tz
+            )
+            for first, last in zip(chunk_bounds[:-1], chunk_bounds[1:])
+        ]
+
+        index = ns_to_datetime_index(row_starts[new_chunk], tz)
+        data = pd.DataFrame(
+            {
+                "end": ns_to_datetime_index(row_ends[new_chunk], tz),
+                "sections": _object_array(sections_per_chunk),
+            },
+            index=index,
+        )
+        if self._data.empty:
+            self._data = data
+        else:
+            self._data = pd.concat([self._data, data], sort=False)
+            self._data.sort_index(inplace=True)
 
     def export_to_cache(self):
         """
@@ -136,23 +193,59 @@ class GoodSectionsResults(Results):
             When we import from cache, we assume the timezone for the data
             columns is the same as the tz for the index.
         """
-        index_for_cache = []
-        data_for_cache = (
-            []
-        )  # list of dicts with keys 'end', 'section_end', 'section_start'
-        for index, row in self._data.iterrows():
-            for section in row["sections"]:
-                index_for_cache.append(index)
-                data_for_cache.append(
-                    {
-                        "end": row["end"],
-                        "section_start": convert_none_to_nat(section.start),
-                        "section_end": convert_none_to_nat(section.end),
-                    }
-                )
-        df = pd.DataFrame(data_for_cache, index=index_for_cache)
-        try:
-            df = df.apply(pd.to_numeric)
-        except Exception as e:
-            print(e)
-        return df
+        if self._data.empty:
+            return pd.DataFrame()
+        row_starts, row_ends, section_rows, section_starts, section_ends = (
+            self._flat_arrays()
+        )
+        # Open-ended sections are stored as NaT
+        section_starts[section_starts == OPEN_START] = NAT
+        section_ends[section_ends == OPEN_END] = NAT
+        return pd.DataFrame(
+            {
+                "end": row_ends[section_rows],
+                "section_start": section_starts,
+                "section_end": section_ends,
+            },
+            index=self._data.index[section_rows],
+        )
+
+    def _flat_arrays(self):
+        """
+        Returns
+        -------
+        row_starts, row_ends : np.ndarray of int64 nanoseconds
+            The start and end of each chunk (row of self._data).
+        section_rows : np.ndarray of ints
+            The row of self._data each section belongs to.
+        section_starts, section_ends : np.ndarray of int64 nanoseconds
+            The start and end of each section, in the order they are stored,
+            with OPEN_START and OPEN_END for open-ended sections.
+        """
+        row_starts = datetime_index_to_ns(self._data.index)
+        row_ends = datetime_index_to_ns(self._data["end"])
+        starts = []
+        ends = []
+        for sections in self._data["sections"]:
+            sections = TimeFrameGroup(sections)
+            starts.append([section.start_ns for section in sections])
+            ends.append([section.end_ns for section in sections])
+        n_sections = [len(row) for row in starts]
+        section_rows = np.repeat(np.arange(len(row_starts)), n_sections)
+        section_starts = np.array(
+            [OPEN_START if start is None else start for row in starts for start in row],
+            dtype=np.int64,
+        )
+        section_ends = np.array(
+            [OPEN_END if end is None else end for row in ends for end in row],
+            dtype=np.int64,
+        )
+        return row_starts, row_ends, section_rows, section_starts, section_ends
+
+
+def _object_array(items):
+    """Returns a 1D object array holding `items` (which may be lists)."""
+    array = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        array[i] = item
+    return array
@@ -1,6 +1,13 @@
 from warnings import warn
 
 import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import Tick, Week
+
+from nilmtk.stats.quantilesketch import QuantileSketch
+from nilmtk.utils import datetime_index_to_ns
+
+DAY_NS = 24 * 60 * 60 * 10**9
 
 
 def histogram_from_generator(generator, bins=None, range=None, **kwargs):
@@ -12,7 +19,9 @@ def histogram_from_generator(generator, bins=None, range=None, **kwargs):
     range : None or (min, max)
         range differs from np.histogram's interpretation of 'range' in
         that either element can be None, in which case the min or max
-        of the first chunk is used.
+        of all the data is used.  That is only known once all the data
+        has been seen, so the counts are then estimated from a
+        `QuantileSketch` of the data rather than counted exactly.
     bins : None or int
         if None then uses int(range[1]-range[0])
     """
@@ -20,17 +29,27 @@ def histogram_from_generator(generator, bins=None, range=None, **kwargs):
     if "density" in kwargs or "normed" in kwargs:
         warn("This function is not designed to output densities.")
 
+    if range is None:
+        range = (None, None)
+    if range[0] is None or range[1] is None:
+        sketch = QuantileSketch()
+        for chunk in generator:
+            sketch.update(chunk)
+        if sketch.n == 0:
+            return None, bins
+        range = (
+            sketch.min if range[0] is None else range[0],
+            sketch.max if range[1] is None else range[1],
+        )
+        if bins is None:
+            bins = max(int(range[1] - range[0]), 1)
+        hist, bins = sketch.histogram(bins=bins, range=range, **kwargs)
+        return hist.astype(np.int64), bins
+
+    if bins is None:
+        bins = max(int(range[1] - range[0]), 1)
     histogram_cumulator = None
     for chunk in generator:
-        if range is None:
-            range = (chunk.min(), chunk.max())
-        else:
-            if range[0] is None:
-                range = (chunk.min(), range[1])
-            if range[1] is None:
-                range = (range[0], chunk.max())
-        if bins is None:
-            bins = int(range[1] - range[0])
         hist, bins = np.histogram(chunk, bins=bins, range=range, **kwargs)
         if histogram_cumulator is None:
             histogram_cumulator = hist
@@ -38,3 +57,75 @@ def histogram_from_generator(generator, bins=None, range=None, **kwargs):
             histogram_cumulator += hist
 
     return histogram_cumulator, bins
+
+
+def time_of_period_bins(index, period="D", bin_duration="h"):
+    """Maps each timestamp to the number of the `bin_duration`-long bin,
+    counted from the start of its `period`, which it falls in.  Uses
+    local (wall clock) time if `index` is timezone-aware.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+    period : str
+        Pandas offset alias with a fixed length (e.g. 'D') or a week
+        (e.g. 'W', which starts on Monday).
+    bin_duration : str
+        Pandas offset alias which must exactly divide `period`.
+
+    Returns
+    -------
+    np.ndarray of int64, in the range [0, period / bin_duration)
+    """
+    period_ns, bin_ns, origin_ns = _period_and_bin_ns(period, bin_duration)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    local_ns = datetime_index_to_ns(index)
+    return ((local_ns - origin_ns) % period_ns) // bin_ns
+
+
+def activity_histogram_from_generator(generator, period="D", bin_duration="h"):
+    """Counts how often the appliance is on in each `bin_duration`-long
+    bin of `period`, e.g. in each hour of the day.
+
+    Parameters
+    ----------
+    generator : iterable of boolean pd.Series
+        e.g. `Electric.when_on()`, resampled to `bin_duration`.
+        NaNs count as off.
+    period, bin_duration : str
+        See `time_of_period_bins`.
+
+    Returns
+    -------
+    np.ndarray of int, length period / bin_duration
+    """
+    period_ns, bin_ns, _ = _period_and_bin_ns(period, bin_duration)
+    n_bins = period_ns // bin_ns
+    hist = np.zeros(n_bins, dtype=int)
+    for chunk in generator:
+        is_on = chunk.to_numpy(dtype=np.float64, na_value=0) > 0
+        if not is_on.any():
+            continue
+        bins = time_of_period_bins(chunk.index[is_on], period, bin_duration)
+        hist += np.bincount(bins, minlength=n_bins)
+    return hist
+
+
+def _period_and_bin_ns(period, bin_duration):
+    period_offset = pd.tseries.frequencies.to_offset(period)
+    if isinstance(period_offset, Week) and period_offset.n == 1:
+        period_ns = 7 * DAY_NS
+        # 1970-01-01 was a Thursday.  Weeks anchored on day `weekday`
+        # end on that day, so start on the next day.
+        weekday = 6 if period_offset.weekday is None else period_offset.weekday
+        origin_ns = ((weekday + 1 - 3) % 7) * DAY_NS
+    elif isinstance(period_offset, Tick):
+        period_ns = period_offset.nanos
+        origin_ns = 0
+    else:
+        raise ValueError("`period` must be a fixed frequency or a week")
+    bin_ns = pd.tseries.frequencies.to_offset(bin_duration).nanos
+    if period_ns % bin_ns:
+        raise ValueError("`bin_duration` must exactly divide the chosen `period`")
+    return period_ns, bin_ns, origin_ns
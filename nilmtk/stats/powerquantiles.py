@@ -0,0 +1,38 @@
+from nilmtk.base.node import Node
+from nilmtk.stats.powerquantilesresults import PowerQuantilesResults
+from nilmtk.stats.quantilesketch import DEFAULT_K
+
+
+class PowerQuantiles(Node):
+    """Sketches the distribution of power values, from which quantiles
+    and histograms can be found in bounded memory.
+
+    Attributes
+    ----------
+    k : int
+        Accuracy parameter of the sketch.  See `QuantileSketch`.
+    """
+
+    postconditions = {"statistics": {"power_quantiles": {}}}
+    results_class = PowerQuantilesResults
+
+    def __init__(self, upstream=None, generator=None, k=DEFAULT_K):
+        self.k = k
+        super(PowerQuantiles, self).__init__(upstream, generator)
+
+    def reset(self):
+        self.results = PowerQuantilesResults(self.k)
+
+    def process(self):
+        self.check_requirements()
+        for chunk in self.upstream.process():
+            if not chunk.empty:
+                self.results.append_values(chunk["power"].to_numpy())
+            yield chunk
+
+    def required_measurements(self, state):
+        return [
+            (measurement["physical_quantity"], measurement["type"])
+            for measurement in state["device"]["measurements"]
+            if measurement["physical_quantity"] == "power"
+        ]
@@ -0,0 +1,71 @@
+from nilmtk.base.results import Results
+from nilmtk.stats.quantilesketch import DEFAULT_K, QuantileSketch
+
+
+class PowerQuantilesResults(Results):
+    """Approximate distribution of power values.
+
+    Attributes
+    ----------
+    sketch : nilmtk.stats.quantilesketch.QuantileSketch
+    _data : pd.DataFrame
+        The stored values of `sketch`.  See `QuantileSketch.to_frame`.
+    """
+
+    name = "power_quantiles"
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.sketch = QuantileSketch(k)
+        super(PowerQuantilesResults, self).__init__()
+
+    @property
+    def cache_name(self):
+        return self.name
+
+    @property
+    def _data(self):
+        return self.sketch.to_frame()
+
+    @_data.setter
+    def _data(self, data):
+        if "value" in data.columns:
+            self.sketch = QuantileSketch.from_frame(data, self.k)
+
+    def append_values(self, values):
+        """Add power values from a new chunk of data."""
+        self.sketch.update(values)
+
+    def combined(self):
+        return self.sketch
+
+    def simple(self):
+        return self.sketch
+
+    def update(self, new_result):
+        """Add results from other sections of the same meter."""
+        if not isinstance(new_result, self.__class__):
+            raise TypeError("new_results must be of type '{}'".format(self.__class__))
+        self.sketch.merge(new_result.sketch)
+
+    def unify(self, other):
+        """Merge the sketch of another meter into this one.  The result
+        is the distribution of the power values of both meters, pooled.
+        (The distribution of their sum cannot be found from the
+        distribution of each meter.)"""
+        if not isinstance(other, self.__class__):
+            raise TypeError("other must be of type '{}'".format(self.__class__))
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self):
+        return {"statistics": {"power_quantiles": {"k": self.k}}}
+
+    def import_from_cache(self, cached_stat, sections=None):
+        """The cache covers all of the meter's good sections, so
+        `sections` is ignored."""
+        if cached_stat.empty:
+            return
+        self._data = cached_stat
+
+    def export_to_cache(self):
+        return self._data
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Default accuracy parameter.  The rank error of the quantiles is
+# roughly 1.7 / k, i.e. under 1% for k = 200.
+DEFAULT_K = 200
+
+# Default quantiles reported by `Electric.power_quantiles`
+QUANTILES = [0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1]
+
+
+class QuantileSketch(object):
+    """Streaming, mergeable approximation of a distribution, from which
+    quantiles and histograms can be found in bounded memory (the KLL
+    sketch of Karnin, Lang and Liberty, 2016).
+
+    Values are stored in a hierarchy of levels.  Each value in level h
+    stands for 2**h of the values seen.  When a level grows beyond its
+    capacity, it is sorted and every other value (starting at a random
+    offset) is promoted to the level above.  Capacities shrink
+    geometrically towards the lower levels, so only O(k) values are kept
+    however many values are seen.
+
+    Parameters
+    ----------
+    k : int
+        Accuracy parameter.  See `DEFAULT_K`.
+    seed : int or None
+        Seeds the random offsets used when compacting.
+
+    Attributes
+    ----------
+    n : int
+        Number of (non-NaN) values seen.
+    min, max : float
+        Smallest and largest values seen.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add values.  NaNs are ignored.
+
+        Parameters
+        ----------
+        values : array-like
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Merge the state of `other` into `self`.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+        """
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, values in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], values])
+        self._compress()
+
+    def quantile(self, q):
+        """
+        Parameters
+        ----------
+        q : float or array-like of floats in [0, 1]
+
+        Returns
+        -------
+        float or np.ndarray, NaN if no values have been seen.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)[()]
+        values, weights = self._sorted_values_and_weights()
+        cumulative_weights = np.cumsum(weights)
+        i = np.searchsorted(cumulative_weights, q * cumulative_weights[-1])
+        result = values[np.minimum(i, len(values) - 1)]
+        # The extremes are known exactly
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+        return result[()]
+
+    def cdf(self, x):
+        """Returns the approximate fraction of values <= x."""
+        if self.n == 0:
+            return np.full(np.shape(x), np.nan)[()]
+        values, weights = self._sorted_values_and_weights()
+        cumulative_weights = np.concatenate([[0], np.cumsum(weights)])
+        i = np.searchsorted(values, x, side="right")
+        return (cumulative_weights[i] / cumulative_weights[-1])[()]
+
+    def histogram(self, bins=10, range=None, **kwargs):
+        """Approximate histogram of the values seen.  Apart from
+        `weights`, takes the same arguments and returns the same objects
+        as `np.histogram`.  If `range` is None then uses
+        (self.min, self.max)."""
+        if range is None:
+            range = (self.min, self.max)
+        values, weights = self._sorted_values_and_weights()
+        return np.histogram(values, bins=bins, range=range, weights=weights, **kwargs)
+
+    def to_frame(self):
+        """Returns a pd.DataFrame with one row per stored value.  The index
+        is the level of each value and the column `value` holds the
+        value.  See `from_frame`."""
+        levels = np.repeat(
+            np.arange(len(self._levels)), [len(values) for values in self._levels]
+        )
+        return pd.DataFrame(
+            {"value": np.concatenate(self._levels)},
+            index=pd.Index(levels, name="level"),
+        )
+
+    @classmethod
+    def from_frame(cls, frame, k=DEFAULT_K, seed=None):
+        """Rebuild a sketch from `to_frame()`.  `min` and `max` become
+        the smallest and largest stored values."""
+        sketch = cls(k, seed)
+        levels = frame.index.to_numpy(dtype=np.int64)
+        values = frame["value"].to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return sketch
+        sketch._levels = [values[levels == level] for level in range(levels.max() + 1)]
+        sketch.n = int(np.sum(np.left_shift(1, levels)))
+        sketch.min = values.min()
+        sketch.max = values.max()
+        return sketch
+
+    def __len__(self):
+        """Number of values stored (not seen)."""
+        return sum(len(values) for values in self._levels)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            values = self._levels[level]
+            if len(values) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                values = np.sort(values)
+                # Keep one value back if there are an odd number of
+                # values, so the total weight is unchanged.
+                keep = values[: len(values) % 2]
+                values = values[len(keep) :]
+                promoted = values[self._rng.integers(2) :: 2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], promoted]
+                )
+            level += 1
+
+    def _sorted_values_and_weights(self):
+        values = np.concatenate(self._levels)
+        weights = np.repeat(
+            np.left_shift(1, np.arange(len(self._levels), dtype=np.int64)),
+            [len(values) for values in self._levels],
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
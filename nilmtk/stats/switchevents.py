@@ -0,0 +1,78 @@
+import numpy as np
+
+from nilmtk.timeframe.timeframe import is_gap_between
+from nilmtk.utils import datetime_index_to_ns
+
+
+def switch_events(power_series, threshold=40, max_sample_period=None):
+    """Finds the times at which the power changes by more than `threshold`
+    between successive samples.
+
+    The last sample of each chunk is carried over and compared with the
+    first sample of the next chunk, so switches at chunk boundaries are
+    not lost.  It is not carried over a gap: that is, if the next chunk's
+    timeframe starts after the previous chunk's timeframe ends, or if
+    the time between the two samples exceeds `max_sample_period`.
+
+    Parameters
+    ----------
+    power_series : iterable of pd.Series
+        e.g. the generator returned by `Electric.power_series()`.
+    threshold : number, watts
+    max_sample_period : number, seconds, optional
+
+    Yields
+    ------
+    np.ndarray of int64
+        For each chunk, the times of the switches in nanoseconds since
+        the epoch (UTC), sorted.
+    """
+    last_value = np.nan
+    last_time = None
+    last_timeframe = None
+    for power in power_series:
+        values = power.to_numpy(dtype=np.float64)
+        timeframe = power.attrs.get("timeframe")
+        if len(values) == 0:
+            continue
+        times = datetime_index_to_ns(power.index)
+        if is_gap_between(last_timeframe, timeframe):
+            last_value = np.nan
+        elif (
+            max_sample_period is not None
+            and last_time is not None
+            and times[0] - last_time > max_sample_period * 1e9
+        ):
+            last_value = np.nan
+        delta = np.empty_like(values)
+        delta[0] = values[0] - last_value
+        np.subtract(values[1:], values[:-1], out=delta[1:])
+        is_switch = np.abs(delta, out=delta) > threshold
+        last_value = values[-1]
+        last_time = times[-1]
+        last_timeframe = timeframe
+        yield times[is_switch]
+
+
+def count_simultaneous_events(event_times, min_count=2):
+    """Counts how many of the streams in `event_times` have an event at
+    each time.
+
+    Parameters
+    ----------
+    event_times : list of np.ndarray of int64
+        One array of event times per stream, e.g. per meter.
+    min_count : int
+        Only return times at which at least this many streams have an event.
+
+    Returns
+    -------
+    times, counts : np.ndarray of int64
+    """
+    # Each stream counts at most once per time
+    event_times = [np.unique(times) for times in event_times]
+    if not event_times:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    times, counts = np.unique(np.concatenate(event_times), return_counts=True)
+    keep = counts >= min_count
+    return times[keep].astype(np.int64), counts[keep]
@@ -1,12 +1,10 @@
-import gc
-
 import numpy as np
 
 from nilmtk.base.node import Node
 from nilmtk.consts import JOULES_PER_KWH
 from nilmtk.measurement import AC_TYPES
 from nilmtk.stats.totalenergyresults import TotalEnergyResults
-from nilmtk.utils import timedelta64_to_secs
+from nilmtk.utils import datetime_index_to_ns
 
 
 class TotalEnergy(Node):
@@ -55,52 +53,78 @@ def get_total_energy(df, max_sample_period):
         Values are energy in kWh (or equivalent for reactive and apparent power).
     """
 
-    # Select a column based on ordered preferences
+    index = None
+    timedelta_secs = None
+    energy = {}
+    for col in select_energy_columns(df.columns):
+        physical_quantity, ac_type = col
+        values = df[col].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        all_valid = valid.all()
+        if physical_quantity == "power":
+            if index is None:
+                index = datetime_index_to_ns(df.index)
+            if all_valid:
+                # The clipped timedeltas are the same for every column
+                # without NaNs, so compute them once per chunk.
+                if timedelta_secs is None:
+                    timedelta_secs = _clipped_timedelta_secs(index, max_sample_period)
+                joules = np.dot(values[:-1], timedelta_secs)
+            else:
+                joules = np.dot(
+                    values[valid][:-1],
+                    _clipped_timedelta_secs(index[valid], max_sample_period),
+                )
+            energy[ac_type] = joules / JOULES_PER_KWH
+        elif physical_quantity == "cumulative energy":
+            if not all_valid:
+                values = values[valid]
+            energy[ac_type] = values[-1] - values[0] if len(values) else 0.0
+        elif physical_quantity == "energy":
+            energy[ac_type] = values.sum() if all_valid else values[valid].sum()
+
+    return energy
+
+
+def select_energy_columns(columns):
+    """Select one column per AC type, preferring cumulative energy over
+    energy over power.
+
+    Parameters
+    ----------
+    columns : list of (physical_quantity, ac_type) tuples
+
+    Returns
+    -------
+    list of (physical_quantity, ac_type) tuples
+    """
     PHYSICAL_QUANTITY_PREFS = ["cumulative energy", "energy", "power"]
     selected_columns = []
     for ac_type in AC_TYPES:
         physical_quantities = [
             physical_quantity
-            for (physical_quantity, col_ac_type) in df.keys()
+            for (physical_quantity, col_ac_type) in columns
             if col_ac_type == ac_type
         ]
         for pq in PHYSICAL_QUANTITY_PREFS:
             if pq in physical_quantities:
                 selected_columns.append((pq, ac_type))
                 break
+    return selected_columns
 
-    energy = {}
-    for col in selected_columns:
-        (physical_quantity, ac_type) = col
-        series = df[col]
-        if physical_quantity == "power":
-            energy[ac_type] = _energy_for_power_series(series, max_sample_period)
-        elif physical_quantity == "cumulative energy":
-            energy[ac_type] = series.iloc[-1] - series.iloc[0]
-        elif physical_quantity == "energy":
-            energy[ac_type] = series.sum()
 
-    return energy
+def _clipped_timedelta_secs(index, max_sample_period):
+    """Seconds between consecutive samples, clipped to `max_sample_period`.
 
-
-def _energy_for_power_series(series, max_sample_period):
-    """
     Parameters
     ----------
-    series : pd.Series
+    index : np.ndarray of int64 nanoseconds
     max_sample_period : float or int
 
     Returns
     -------
-    energy : float
-        kWh
+    np.ndarray of floats, one shorter than `index`
     """
-    series = series.dropna()
-    timedelta = np.diff(series.index.values)
-    timedelta_secs = timedelta64_to_secs(timedelta)
-    del timedelta
-    gc.collect()
-    timedelta_secs = timedelta_secs.clip(max=max_sample_period)
-    joules = (timedelta_secs * series.values[:-1]).sum()
-    kwh = joules / JOULES_PER_KWH
-    return kwh
+    timedelta_secs = np.diff(index) / 1e9
+    np.minimum(timedelta_secs, max_sample_period, out=timedelta_secs)
+    return timedelta_secs
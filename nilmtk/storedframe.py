@@ -0,0 +1,68 @@
+import pandas as pd
+
+
+class StoredDataFrame(object):
+    """A handle to a DataFrame which has been written, chunk by chunk, to
+    a table in a DataStore, so that it can be read back one chunk at a
+    time without ever being held in memory all at once.
+
+    The table's columns are named 'column0', 'column1', ... because
+    DataStores can only store string column names.  The handle maps them
+    back to the original column labels (e.g. ElecMeterIDs).
+
+    Parameters
+    ----------
+    store : nilmtk.DataStore
+    key : str
+    columns : list
+        The original column labels, in the order they were written.
+
+    Examples
+    --------
+    >>> stored = elec.dataframe_of_meters(store=store, key="/matrix")
+    >>> for chunk in stored.load(chunksize=100000):
+    ...     train(chunk)
+    """
+
+    def __init__(self, store, key, columns):
+        self.store = store
+        self.key = key
+        self.columns = list(columns)
+
+    @staticmethod
+    def stored_column_names(n_columns):
+        return ["column{:d}".format(i) for i in range(n_columns)]
+
+    def append(self, df):
+        """Appends `df` to the table.  Columns of `df` which are not in
+        `self.columns` are ignored and missing columns are filled with NaN.
+        """
+        df = df.reindex(columns=self.columns)
+        df.columns = self.stored_column_names(len(self.columns))
+        self.store.append(self.key, df)
+
+    def load(self, **kwargs):
+        """Returns a generator of DataFrames with the original column
+        labels.
+
+        Parameters
+        ----------
+        **kwargs : passed to `self.store.load()`, e.g. `sections` or
+            `chunksize`.
+        """
+        for chunk in self.store.load(key=self.key, **kwargs):
+            if chunk.empty:
+                continue
+            chunk.columns = self.columns
+            yield chunk
+
+    def __iter__(self):
+        return self.load()
+
+    def to_dataframe(self):
+        """Loads the whole table into memory."""
+        chunks = list(self.load())
+        if chunks:
+            return pd.concat(chunks)
+        else:
+            return pd.DataFrame(columns=self.columns)
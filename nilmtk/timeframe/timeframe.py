@@ -13,14 +13,22 @@ class TimeFrame(object):
     """A TimeFrame is a single time span or period,
     e.g. from "2013" to "2014".
 
+    Start and end are stored as int64 nanoseconds (UTC for tz-aware
+    timestamps) so that comparisons, hashing and intersections do not
+    need to touch pd.Timestamp objects.  The `start` and `end`
+    Timestamps are created lazily and cached.
+
     Attributes
     ----------
-    _start : pd.Timestamp or None
+    _start_ns : int or None
         if None and empty if False
         then behave as if start is infinitely far into the past
-    _end : pd.Timestamp or None
+    _end_ns : int or None
         if None and empty is False
         then behave as if end is infinitely far into the future
+    _start, _end : pd.Timestamp or None
+        Cached Timestamps for _start_ns and _end_ns.
+    _tz : timezone of the start and end, or None if tz-naive.
     enabled : boolean
         If False then behave as if both _end and _start are None
     _empty : boolean
@@ -28,6 +36,17 @@ class TimeFrame(object):
     include_end : boolean
     """
 
+    __slots__ = (
+        "enabled",
+        "include_end",
+        "_start_ns",
+        "_end_ns",
+        "_start",
+        "_end",
+        "_tz",
+        "_empty",
+    )
+
     def __init__(
         self,
         start: Optional[pd.Timestamp] = None,
@@ -35,33 +54,91 @@ class TimeFrame(object):
         tz=None,
     ):
         self.enabled: bool
+        self.include_end: bool
+        self._start_ns: Optional[int]
+        self._end_ns: Optional[int]
         self._start: Optional[pd.Timestamp]
         self._end: Optional[pd.Timestamp]
         self._empty: bool
 
-        self.clear()
         if isinstance(start, TimeFrame):
+            self.clear()
             self.copy_constructor(start)
-        else:
-            self.start = start
-            self.end = end
-            self.include_end = False
-            if tz is not None:
-                if self._start:
-                    self._start = self._start.tz_localize(tz)
-                if self._end:
-                    self._end = self._end.tz_localize(tz)
+            return
+
+        start = _to_timestamp(start)
+        end = _to_timestamp(end)
+        if tz is not None:
+            start = None if start is None else start.tz_localize(tz)
+            end = None if end is None else end.tz_localize(tz)
+        start_ns = None if start is None else start.value
+        end_ns = None if end is None else end.value
+        if start_ns is not None and end_ns is not None and end_ns <= start_ns:
+            raise ValueError("end date must be after start date")
+
+        self.enabled = True
+        self.include_end = False
+        self._start_ns = start_ns
+        self._end_ns = end_ns
+        self._start = start
+        self._end = end
+        self._tz = end.tz if end is not None else getattr(start, "tz", None)
+        self._empty = False
+
+    @classmethod
+    def from_ns(cls, start_ns, end_ns, tz=None, include_end=False, empty=False):
+        """Fast constructor which does not validate its arguments.
+
+        Parameters
+        ----------
+        start_ns, end_ns : int or None
+            Nanoseconds since the epoch (UTC if `tz` is not None).
+            None means open-ended.
+        tz : timezone, optional
+        """
+        timeframe = cls.__new__(cls)
+        timeframe.enabled = True
+        timeframe.include_end = include_end
+        timeframe._start_ns = start_ns
+        timeframe._end_ns = end_ns
+        timeframe._start = None
+        timeframe._end = None
+        timeframe._tz = tz
+        timeframe._empty = empty
+        return timeframe
 
     def copy_constructor(self, other) -> None:
-        for key, value in other.__dict__.items():
-            setattr(self, key, value)
+        for key in TimeFrame.__slots__:
+            setattr(self, key, getattr(other, key))
 
     def clear(self) -> None:
         self.enabled = True
+        self.include_end = False
+        self._start_ns = None
+        self._end_ns = None
         self._start = None
         self._end = None
+        self._tz = None
         self._empty = False
 
+    def __copy__(self):
+        return self._copy()
+
+    def __deepcopy__(self, memo):
+        return self._copy()
+
+    def __getstate__(self):
+        return {key: getattr(self, key) for key in TimeFrame.__slots__}
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def _copy(self):
+        timeframe = TimeFrame.__new__(TimeFrame)
+        timeframe.copy_constructor(self)
+        return timeframe
+
     @classmethod
     def from_dict(cls, d):
         def key_to_timestamp(key):
@@ -74,37 +151,63 @@ class TimeFrame(object):
 
     @property
     def start(self):
-        if self.enabled:
+        if self.enabled and self._start_ns is not None:
+            if self._start is None:
+                self._start = _timestamp_from_ns(self._start_ns, self._tz)
             return self._start
 
     @start.setter
     def start(self, new_start):
-        new_start = convert_nat_to_none(new_start)
+        new_start = _to_timestamp(new_start)
         if new_start is None:
+            self._start_ns = None
             self._start = None
             return
-        new_start = pd.Timestamp(new_start)
-        if self.end and new_start >= self.end:
+        new_start_ns = new_start.value
+        if self.end_ns is not None and new_start_ns >= self.end_ns:
             raise ValueError("start date must be before end date")
         else:
+            self._start_ns = new_start_ns
             self._start = new_start
+            self._tz = new_start.tz
 
     @property
     def end(self):
-        if self.enabled:
+        if self.enabled and self._end_ns is not None:
+            if self._end is None:
+                self._end = _timestamp_from_ns(self._end_ns, self._tz)
             return self._end
 
     @end.setter
     def end(self, new_end):
-        new_end = convert_nat_to_none(new_end)
+        new_end = _to_timestamp(new_end)
         if new_end is None:
+            self._end_ns = None
             self._end = None
             return
-        new_end = pd.Timestamp(new_end)
-        if self.start and new_end <= self.start:
+        new_end_ns = new_end.value
+        if self.start_ns is not None and new_end_ns <= self.start_ns:
             raise ValueError("end date must be after start date")
         else:
+            self._end_ns = new_end_ns
             self._end = new_end
+            self._tz = new_end.tz
+
+    @property
+    def start_ns(self):
+        """Start as int64 nanoseconds, or None if open-ended."""
+        if self.enabled:
+            return self._start_ns
+
+    @property
+    def end_ns(self):
+        """End as int64 nanoseconds, or None if open-ended."""
+        if self.enabled:
+            return self._end_ns
+
+    @property
+    def tz(self):
+        return self._tz
 
     @property
     def empty(self):
@@ -123,14 +226,14 @@ class TimeFrame(object):
         Does not yet handle case where self or other is open-ended.
         """
         assert gap >= 0
-        gap_td = timedelta(seconds=gap)
+        gap_ns = int(gap * 1e9)
 
         if self.empty or other.empty:
             return False
 
         return (
-            other.start - gap_td <= self.end <= other.start
-            or self.start - gap_td <= other.end <= self.start
+            other.start_ns - gap_ns <= self.end_ns <= other.start_ns
+            or self.start_ns - gap_ns <= other.end_ns <= self.start_ns
         )
 
     def union(self, other):
@@ -141,8 +244,8 @@ class TimeFrame(object):
 
     @property
     def timedelta(self):
-        if self.end and self.start:
-            return self.end - self.start
+        if self.end_ns is not None and self.start_ns is not None:
+            return pd.Timedelta(self.end_ns - self.start_ns)
         elif self.empty:
             return timedelta(0)
 
@@ -156,43 +259,30 @@ class TimeFrame(object):
 
         assert isinstance(other, TimeFrame)
 
-        include_end = False
+        tz = other._tz if self._tz is None else self._tz
         if self.empty or other.empty:
-            start = None
-            end = None
-            empty = True
-        else:
-            if other.start is None:
-                start = self.start
-            elif self.start is None:
-                start = other.start
-            else:
-                start = max(self.start, other.start)
+            return TimeFrame.from_ns(None, None, tz, empty=True)
 
-            if other.end is None:
-                end = self.end
-            elif self.end is None:
-                end = other.end
-            else:
-                end = min(self.end, other.end)
-
-            # set include_end
-            if end == other.end:
-                include_end = other.include_end
-            elif end == self.end:
-                include_end = self.include_end
+        self_start, other_start = self.start_ns, other.start_ns
+        if other_start is None or (
+            self_start is not None and self_start >= other_start
+        ):
+            start_ns, start = self_start, self._start
+        else:
+            start_ns, start = other_start, other._start
 
-            empty = False
+        self_end, other_end = self.end_ns, other.end_ns
+        if other_end is None or (self_end is not None and self_end < other_end):
+            end_ns, end, include_end = self_end, self._end, self.include_end
+        else:
+            end_ns, end, include_end = other_end, other._end, other.include_end
 
-            if (start is not None) and (end is not None):
-                if start >= end:
-                    start = None
-                    end = None
-                    empty = True
+        if start_ns is not None and end_ns is not None and start_ns >= end_ns:
+            return TimeFrame.from_ns(None, None, tz, empty=True)
 
-        intersect = TimeFrame(start, end)
-        intersect._empty = empty
-        intersect.include_end = include_end
+        intersect = TimeFrame.from_ns(start_ns, end_ns, tz, include_end)
+        intersect._start = start
+        intersect._end = end
         return intersect
 
     def query_terms(self, variable_name="timeframe"):
@@ -230,7 +320,7 @@ class TimeFrame(object):
         if self.empty:
             return False
         else:
-            return (self.start is not None) or (self.end is not None)
+            return (self.start_ns is not None) or (self.end_ns is not None)
 
     def __repr__(self):
         return "TimeFrame(start='{}', end='{}', empty={})".format(
@@ -238,21 +328,24 @@ class TimeFrame(object):
         )
 
     def __eq__(self, other):
+        if not isinstance(other, TimeFrame):
+            return NotImplemented
         return (
-            (other.start == self.start)
-            and (other.end == self.end)
+            (other.start_ns == self.start_ns)
+            and (other.end_ns == self.end_ns)
             and (other.empty == self.empty)
         )
 
     def __lt__(self, other):
-        if self.start is None and other.start is not None:
+        self_start, other_start = self.start_ns, other.start_ns
+        if self_start is None and other_start is not None:
             return True
-        if other.start is None and self.start is not None:
+        if other_start is None and self_start is not None:
             return False
-        return self.start < other.start
+        return self_start < other_start
 
     def __hash__(self):
-        return hash((self.start, self.end, self.empty))
+        return hash((self.start_ns, self.end_ns, self.empty))
 
     def to_dict(self):
         dct = {}
@@ -351,6 +444,22 @@ def merge_timeframes(timeframes, gap=0):
     return merged
 
 
+def is_gap_between(previous, timeframe):
+    """Returns True if `timeframe` starts after `previous` ends, e.g. if
+    two consecutive chunks of data come from different good sections.
+
+    Parameters
+    ----------
+    previous, timeframe : TimeFrame or None
+        Returns False if either is None or open-ended.
+    """
+    if previous is None or timeframe is None:
+        return False
+    if previous.end is None or timeframe.start is None:
+        return False
+    return timeframe.start > previous.end
+
+
 def list_of_timeframe_dicts(timeframes):
     """
     Parameters
@@ -374,6 +483,21 @@ def list_of_timeframes_from_list_of_dicts(dicts):
     return [timeframe_from_dict(d) for d in dicts]
 
 
+def _to_timestamp(timestamp):
+    """Converts anything accepted by pd.Timestamp to a pd.Timestamp,
+    or None if `timestamp` is None or NaT."""
+    timestamp = convert_nat_to_none(timestamp)
+    if timestamp is None or isinstance(timestamp, pd.Timestamp):
+        return timestamp
+    return convert_nat_to_none(pd.Timestamp(timestamp))
+
+
+def _timestamp_from_ns(value, tz):
+    if tz is None:
+        return pd.Timestamp(value)
+    return pd.Timestamp(value, tz="UTC").tz_convert(tz)
+
+
 def convert_none_to_nat(timestamp):
     return pd.NaT if timestamp is None else timestamp
 
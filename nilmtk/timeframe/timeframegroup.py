@@ -1,24 +1,153 @@
 from datetime import timedelta
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 # NILMTK imports
 from nilmtk.timeframe.timeframe import TimeFrame
+from nilmtk.utils import datetime_index_to_ns
+
+# int64 nanoseconds used for open-ended starts and ends
+OPEN_START = np.iinfo(np.int64).min
+OPEN_END = np.iinfo(np.int64).max
+
+
+def _invalidates_arrays(method):
+    """Wraps a list method which modifies the group so that the cached
+    start and end arrays are rebuilt on next use."""
+
+    def wrapper(self, *args, **kwargs):
+        self._arrays = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
 
 
 class TimeFrameGroup(list):
-    """A collection of nilmtk.TimeFrame objects."""
+    """A collection of nilmtk.TimeFrame objects.
+
+    The group behaves as a Python list of TimeFrames.  Set operations
+    (`intersection`, `union`, `difference`, `merge`, `split`) work on
+    sorted int64 arrays of start and end times (UTC nanoseconds), which
+    are built from the TimeFrames on first use and cached until the list,
+    or one of its TimeFrames, is modified.  Open-ended TimeFrames are
+    represented by OPEN_START and OPEN_END.  Empty TimeFrames are ignored
+    by the set operations.
+    """
 
     def __init__(self, timeframes=None):
+        self._arrays = None
         if isinstance(timeframes, pd.PeriodIndex):
             periods = timeframes
-            timeframes = [
-                TimeFrame(period.start_time, period.end_time) for period in periods
-            ]
+            timeframes = TimeFrameGroup.from_arrays(
+                datetime_index_to_ns(periods.start_time),
+                datetime_index_to_ns(periods.end_time),
+            )
         args = [timeframes] if timeframes else []
         super(TimeFrameGroup, self).__init__(*args)
 
+    @classmethod
+    def from_arrays(cls, starts, ends, include_end=None, tz=None):
+        """
+        Parameters
+        ----------
+        starts, ends : array-like of int64 nanoseconds (UTC if `tz` is set)
+            OPEN_START and OPEN_END mark open-ended TimeFrames.
+        include_end : array-like of bools, optional
+        tz : str or tzinfo, optional
+
+        Returns
+        -------
+        TimeFrameGroup
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if include_end is None:
+            include_end = np.zeros(len(starts), dtype=bool)
+        else:
+            include_end = np.asarray(include_end, dtype=bool)
+
+        timeframes = [
+            TimeFrame.from_ns(
+                None if start == OPEN_START else start,
+                None if end == OPEN_END else end,
+                tz,
+                inc,
+            )
+            for start, end, inc in zip(
+                starts.tolist(), ends.tolist(), include_end.tolist()
+            )
+        ]
+
+        tfg = cls(timeframes)
+        if len(starts) < 2 or (np.diff(starts) >= 0).all():
+            tfg._set_arrays(starts, ends, include_end, tz)
+        return tfg
+
+    def to_arrays(self):
+        """
+        Returns
+        -------
+        starts, ends : np.ndarray of int64 nanoseconds, sorted by start.
+            Open-ended TimeFrames use OPEN_START and OPEN_END.
+        include_end : np.ndarray of bools
+        tz : the timezone of the TimeFrames, or None if they are tz-naive.
+        """
+        if self._arrays is None or self._state != self._members_state():
+            starts = []
+            ends = []
+            include_end = []
+            tz = None
+            for timeframe in self:
+                if timeframe.empty:
+                    continue
+                start, end = timeframe.start_ns, timeframe.end_ns
+                if tz is None:
+                    tz = timeframe.tz
+                starts.append(OPEN_START if start is None else start)
+                ends.append(OPEN_END if end is None else end)
+                include_end.append(timeframe.include_end)
+            starts = np.array(starts, dtype=np.int64)
+            ends = np.array(ends, dtype=np.int64)
+            include_end = np.array(include_end, dtype=bool)
+            if len(starts) > 1 and (np.diff(starts) < 0).any():
+                order = np.argsort(starts, kind="stable")
+                starts, ends, include_end = (
+                    starts[order],
+                    ends[order],
+                    include_end[order],
+                )
+            self._set_arrays(starts, ends, include_end, tz)
+        return self._arrays
+
+    def _set_arrays(self, starts, ends, include_end, tz):
+        self._arrays = (starts, ends, include_end, tz)
+        self._state = self._members_state()
+
+    def _members_state(self):
+        """The state of every TimeFrame in the group, used to tell whether
+        the cached arrays are out of date because a TimeFrame was changed
+        in place (e.g. `tfg[0].end = ...`)."""
+        return [
+            (tf.start_ns, tf.end_ns, tf.include_end, tf.empty, tf.tz) for tf in self
+        ]
+
+    append = _invalidates_arrays(list.append)
+    extend = _invalidates_arrays(list.extend)
+    insert = _invalidates_arrays(list.insert)
+    remove = _invalidates_arrays(list.remove)
+    pop = _invalidates_arrays(list.pop)
+    clear = _invalidates_arrays(list.clear)
+    sort = _invalidates_arrays(list.sort)
+    reverse = _invalidates_arrays(list.reverse)
+    __setitem__ = _invalidates_arrays(list.__setitem__)
+    __delitem__ = _invalidates_arrays(list.__delitem__)
+    __iadd__ = _invalidates_arrays(list.__iadd__)
+    __imul__ = _invalidates_arrays(list.__imul__)
+
     def plot(self, ax=None, y=0, height=1, gap=0.05, color="b", **kwargs):
         if ax is None:
             ax = plt.gca()
@@ -45,26 +174,185 @@ class TimeFrameGroup(list):
                intersection():  |---##-----##-----------###|
         """
         assert isinstance(other, (TimeFrameGroup, list))
-        new_tfg = TimeFrameGroup()
-        for self_timeframe in self:
-            for other_timeframe in other:
-                intersect = self_timeframe.intersection(other_timeframe)
-                if not intersect.empty:
-                    new_tfg.append(intersect)
-        return new_tfg
+        other = _as_timeframegroup(other)
+        starts, ends, include_end, tz = self._disjoint_arrays()
+        other_starts, other_ends, other_include_end, other_tz = other._disjoint_arrays()
+        return TimeFrameGroup.from_arrays(
+            *_intersect(
+                (starts, ends, include_end),
+                (other_starts, other_ends, other_include_end),
+            ),
+            tz=_first_tz(tz, other_tz)
+        )
+
+    def union(self, other):
+        """Returns a new TimeFrameGroup covering every instant which is in
+        self or in other.  Overlapping and touching TimeFrames are merged."""
+        assert isinstance(other, (TimeFrameGroup, list))
+        other = _as_timeframegroup(other)
+        starts, ends, include_end, tz = self.to_arrays()
+        other_starts, other_ends, other_include_end, other_tz = other.to_arrays()
+        starts = np.concatenate([starts, other_starts])
+        ends = np.concatenate([ends, other_ends])
+        include_end = np.concatenate([include_end, other_include_end])
+        order = np.argsort(starts, kind="stable")
+        return TimeFrameGroup.from_arrays(
+            *_merge(starts[order], ends[order], include_end[order], gap=0),
+            tz=_first_tz(tz, other_tz)
+        )
+
+    def difference(self, other):
+        """Returns a new TimeFrameGroup of self with every instant in other
+        removed.
+
+        Illustrated example:
+
+          self:  |######----#####-----######|
+         other:  |---##---####----##-----###|
+          diff:  |###--#------###-----###---|
+        """
+        assert isinstance(other, (TimeFrameGroup, list))
+        other = _as_timeframegroup(other)
+        starts, ends, include_end, tz = self._disjoint_arrays()
+        other_starts, other_ends, _, other_tz = other.to_arrays()
+        other_starts, other_ends, _ = _merge(
+            other_starts, other_ends, np.zeros(len(other_starts), dtype=bool), gap=0
+        )
+        # Intersect with the gaps between other's TimeFrames
+        gap_starts = np.concatenate([[OPEN_START], other_ends])
+        gap_ends = np.concatenate([other_starts, [OPEN_END]])
+        non_empty = gap_starts < gap_ends
+        gaps = (
+            gap_starts[non_empty],
+            gap_ends[non_empty],
+            np.zeros(non_empty.sum(), dtype=bool),
+        )
+        return TimeFrameGroup.from_arrays(
+            *_intersect((starts, ends, include_end), gaps), tz=_first_tz(tz, other_tz)
+        )
+
+    def merge(self, gap=0):
+        """Returns a new TimeFrameGroup where TimeFrames which overlap, or are
+        separated by no more than `gap` seconds, are merged.
+
+        Parameters
+        ----------
+        gap : float or int, seconds
+        """
+        assert gap >= 0
+        starts, ends, include_end, tz = self.to_arrays()
+        return TimeFrameGroup.from_arrays(
+            *_merge(starts, ends, include_end, gap=int(gap * 1e9)), tz=tz
+        )
+
+    def split(self, duration_threshold):
+        """Returns a new TimeFrameGroup where each TimeFrame is split into
+        adjacent TimeFrames no longer than `duration_threshold`.
+
+        Parameters
+        ----------
+        duration_threshold : int, seconds
+        """
+        starts, ends, include_end, tz = self.to_arrays()
+        if (starts == OPEN_START).any() or (ends == OPEN_END).any():
+            raise ValueError("Cannot split a TimeFrame if `start` or `end` is None")
+        duration = int(duration_threshold * 1e9)
+        n_pieces = np.maximum(-(-(ends - starts) // duration), 1)
+        piece = np.arange(n_pieces.sum()) - np.repeat(
+            np.cumsum(n_pieces) - n_pieces, n_pieces
+        )
+        new_starts = np.repeat(starts, n_pieces) + piece * duration
+        new_ends = np.minimum(new_starts + duration, np.repeat(ends, n_pieces))
+        is_last = piece == np.repeat(n_pieces, n_pieces) - 1
+        new_include_end = np.repeat(include_end, n_pieces) & is_last
+        return TimeFrameGroup.from_arrays(new_starts, new_ends, new_include_end, tz)
 
     def uptime(self):
         """Returns total timedelta of all timeframes joined together."""
-        uptime = timedelta(0)
-        for timeframe in self:
-            uptime += timeframe.timedelta
-        return uptime
+        starts, ends, _, _ = self.to_arrays()
+        if (starts == OPEN_START).any() or (ends == OPEN_END).any():
+            raise ValueError("Cannot compute the uptime of open-ended TimeFrames")
+        return timedelta(microseconds=int((ends - starts).sum()) / 1e3)
 
     def remove_shorter_than(self, threshold):
-        """Removes TimeFrames shorter than `threshold` seconds."""
+        """Removes TimeFrames shorter than `threshold` seconds.
+
+        Returns a new TimeFrameGroup of the remaining TimeFrames (the same
+        objects, in the same order).  Open-ended TimeFrames are kept and
+        empty TimeFrames are removed.
+        """
+        threshold_ns = threshold * 1e9
         new_tfg = TimeFrameGroup()
         for timeframe in self:
-            if timeframe.timedelta.total_seconds() >= threshold:
+            if timeframe.empty:
+                continue
+            start, end = timeframe.start_ns, timeframe.end_ns
+            if start is None or end is None or end - start >= threshold_ns:
                 new_tfg.append(timeframe)
-
         return new_tfg
+
+    def _disjoint_arrays(self):
+        """Like `to_arrays` but with overlapping (not merely touching)
+        TimeFrames merged, as needed by the sweep-line intersection."""
+        starts, ends, include_end, tz = self.to_arrays()
+        if len(starts) > 1 and (starts[1:] < np.maximum.accumulate(ends)[:-1]).any():
+            starts, ends, include_end = _merge(starts, ends, include_end, gap=-1)
+        return starts, ends, include_end, tz
+
+
+def _as_timeframegroup(timeframes):
+    if isinstance(timeframes, TimeFrameGroup):
+        return timeframes
+    return TimeFrameGroup(timeframes)
+
+
+def _first_tz(tz, other_tz):
+    return other_tz if tz is None else tz
+
+
+def _merge(starts, ends, include_end, gap):
+    """Merges TimeFrames (sorted by start) which are separated by no more
+    than `gap` nanoseconds.  A `gap` of -1 merges only TimeFrames which
+    overlap, leaving touching TimeFrames separate."""
+    if len(starts) == 0:
+        return starts, ends, include_end
+    max_end_so_far = np.maximum.accumulate(ends)
+    gaps = starts[1:].astype(np.float64) - max_end_so_far[:-1].astype(np.float64)
+    group_starts = np.flatnonzero(np.concatenate([[True], gaps > gap]))
+    new_ends = np.maximum.reduceat(ends, group_starts)
+    group_end = np.repeat(new_ends, np.diff(np.append(group_starts, len(ends))))
+    new_include_end = np.logical_or.reduceat(
+        include_end & (ends == group_end), group_starts
+    )
+    return starts[group_starts], new_ends, new_include_end
+
+
+def _intersect(a, b):
+    """Intersects two sets of sorted, non-overlapping TimeFrames.
+
+    Parameters
+    ----------
+    a, b : tuples of (starts, ends, include_end) arrays
+
+    Returns
+    -------
+    starts, ends, include_end : np.ndarrays
+    """
+    a_starts, a_ends, a_include_end = a
+    b_starts, b_ends, b_include_end = b
+    # For each TimeFrame in `a`, the TimeFrames in `b` which overlap it
+    # are the contiguous run b[first[i]:last[i]].
+    first = np.searchsorted(b_ends, a_starts, side="right")
+    last = np.searchsorted(b_starts, a_ends, side="left")
+    n_overlaps = np.maximum(last - first, 0)
+    a_index = np.repeat(np.arange(len(a_starts)), n_overlaps)
+    b_index = np.arange(n_overlaps.sum()) + np.repeat(
+        first - (np.cumsum(n_overlaps) - n_overlaps), n_overlaps
+    )
+    starts = np.maximum(a_starts[a_index], b_starts[b_index])
+    ends = np.minimum(a_ends[a_index], b_ends[b_index])
+    include_end = np.where(
+        ends == b_ends[b_index], b_include_end[b_index], a_include_end[a_index]
+    )
+    non_empty = starts < ends
+    return starts[non_empty], ends[non_empty], include_end[non_empty]
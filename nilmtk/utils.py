@@ -73,6 +73,37 @@ def timedelta64_to_secs(timedelta):
         return timedelta / np.timedelta64(1, "s")
 
 
+def datetime_index_to_ns(index):
+    """Returns the timestamps of `index` as int64 nanoseconds since the
+    epoch (UTC if `index` is tz-aware), whatever the resolution of `index`.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex or datetime-like pd.Series
+
+    Returns
+    -------
+    np.ndarray of int64
+    """
+    return pd.DatetimeIndex(index).as_unit("ns").asi8
+
+
+def ns_to_datetime_index(values, tz=None):
+    """Inverse of `datetime_index_to_ns`.
+
+    Parameters
+    ----------
+    values : np.ndarray of int64 nanoseconds since the epoch (UTC)
+    tz : timezone or None
+
+    Returns
+    -------
+    pd.DatetimeIndex in `tz`
+    """
+    index = pd.DatetimeIndex(np.asarray(values, dtype=np.int64).view("M8[ns]"))
+    return index if tz is None else index.tz_localize("UTC").tz_convert(tz)
+
+
 def tree_root(graph):
     """Returns the object that is the root of the tree.
 
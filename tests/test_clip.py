@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.base.node import Node
+from nilmtk.elecmeter import ElecMeter
+from nilmtk.measurement import LEVEL_NAMES
+from nilmtk.preprocessing import Clip
+from nilmtk.timeframe.timeframe import TimeFrame
+
+MEASUREMENTS = [
+    {
+        "physical_quantity": "power",
+        "type": "active",
+        "lower_limit": 0,
+        "upper_limit": 100,
+    },
+    {
+        "physical_quantity": "power",
+        "type": "reactive",
+        "lower_limit": -50,
+        "upper_limit": 50,
+    },
+    {"physical_quantity": "voltage", "type": ""},
+]
+
+
+def make_chunk(n=20, columns=None):
+    if columns is None:
+        columns = [("power", "active"), ("power", "reactive"), ("voltage", "")]
+    index = pd.date_range("2014-01-01", periods=n, freq="6s", tz="Europe/London")
+    data = np.linspace(-200, 200, n * len(columns)).reshape(n, len(columns))
+    data[3, 0] = np.nan
+    chunk = pd.DataFrame(
+        data,
+        index=index,
+        columns=pd.MultiIndex.from_tuples(columns, names=LEVEL_NAMES),
+        dtype=np.float32,
+    )
+    chunk.attrs["timeframe"] = TimeFrame(index[0], index[-1])
+    return chunk
+
+
+class TestClip(unittest.TestCase):
+    def _run(self, chunks, **attrs):
+        meter = ElecMeter(metadata={"device": {"measurements": MEASUREMENTS}})
+        clip = Clip(Node(meter, generator=iter(chunks)))
+        for key, value in attrs.items():
+            setattr(clip, key, value)
+        return list(clip.process())
+
+    def test_clip_uses_measurement_limits(self):
+        chunk = make_chunk()
+        expected = chunk.copy()
+        expected[("power", "active")] = expected[("power", "active")].clip(0, 100)
+        expected[("power", "reactive")] = expected[("power", "reactive")].clip(-50, 50)
+
+        (clipped,) = self._run([chunk])
+        pd.testing.assert_frame_equal(clipped, expected)
+        self.assertTrue(np.isnan(clipped.iloc[3, 0]))
+        self.assertEqual(clipped.attrs["timeframe"], chunk.attrs["timeframe"])
+
+    def test_clip_overrides_limits(self):
+        (clipped,) = self._run([make_chunk()], lower=-10, upper=10)
+        values = clipped.values
+        self.assertTrue(np.nanmin(values) >= -10)
+        self.assertTrue(np.nanmax(values) <= 10)
+
+    def test_mixed_dtypes_and_missing_limits(self):
+        chunk = make_chunk(columns=[("power", "active"), ("energy", "active")])
+        chunk[("energy", "active")] = np.arange(len(chunk), dtype=np.int64)
+        with self.assertWarns(RuntimeWarning):
+            (clipped,) = self._run([chunk])
+        self.assertTrue(np.nanmax(clipped[("power", "active")]) <= 100)
+        np.testing.assert_array_equal(
+            clipped[("energy", "active")].values, np.arange(len(chunk))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -105,6 +105,24 @@ class SuperTestDataStore(object):
                 <= chunk.attrs["timeframe"].end
             )
 
+    def test_sections_fit_in_one_chunk(self):
+        self.datastore.window.clear()
+        section = [TimeFrame("2012-01-01 00:00:00", "2012-01-01 00:01:00")]
+        # Interleaved loads of different keys are tracked separately
+        small = self.datastore.load(key=self.keys[0], sections=section, chunksize=20)
+        large = self.datastore.load(key=self.keys[1], sections=section)
+        next(small)
+        next(large)
+        list(small)
+        list(large)
+        if isinstance(self.datastore, HDFDataStore):
+            self.assertFalse(self.datastore.sections_fit_in_one_chunk(self.keys[0]))
+            self.assertFalse(self.datastore.all_sections_smaller_than_chunksize)
+        self.assertTrue(self.datastore.sections_fit_in_one_chunk(self.keys[1]))
+        list(self.datastore.load(key=self.keys[0], sections=section))
+        self.assertTrue(self.datastore.sections_fit_in_one_chunk(self.keys[0]))
+        self.assertTrue(self.datastore.all_sections_smaller_than_chunksize)
+
     # --------- helper functions ---------------------#
 
     def _apply_mask(self):
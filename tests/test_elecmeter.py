@@ -65,6 +65,28 @@ class TestElecMeter(unittest.TestCase):
         )
         self.assertEqual(meter.proportion_of_energy(meter), 1.0)
 
+    def test_correlation_with_itself(self):
+        meter = ElecMeter(
+            store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
+        )
+        self.assertAlmostEqual(meter.correlation(meter), 1.0)
+
+    def test_power_series_all_data_preallocated(self):
+        meter = ElecMeter(
+            store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
+        )
+        expected = meter.power_series_all_data()
+        self.assertEqual(meter._estimate_n_rows(), len(expected))
+        for memory_budget in [None, 0]:
+            power = meter.power_series_all_data(
+                preallocate=True, memory_budget=memory_budget
+            )
+            pd.testing.assert_series_equal(power, expected)
+        power = meter.power_series_all_data(preallocate=True, sample_period=5)
+        pd.testing.assert_series_equal(
+            power, meter.power_series_all_data(sample_period=5), check_freq=False
+        )
+
     def correlation(self):
         meter_1 = ElecMeter(
             store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
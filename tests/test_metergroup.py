@@ -1,16 +1,25 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from os.path import join
 
+import numpy as np
+import pandas as pd
+
 from nilmtk import (
     Appliance,
     DataSet,
     ElecMeter,
     HDFDataStore,
     MeterGroup,
+    TimeFrame,
+    TmpDataStore,
     global_meter_group,
 )
 from nilmtk.building import BuildingID
 from nilmtk.elecmeter import ElecMeterID
+from nilmtk.measurement import LEVEL_NAMES
+from nilmtk.metergroup import combine_chunks, combine_chunks_from_generators
+from nilmtk.timeframe.timeframe import split_timeframes
 
 from .testingtools import data_dir
 
@@ -56,6 +65,37 @@ class TestMeterGroup(unittest.TestCase):
             with self.assertRaises(TypeError):
                 mg[key]
 
+    def test_getitem_after_changes(self):
+        meters = [ElecMeter(meter_id=ElecMeterID(i, 1, "REDD")) for i in [1, 2]]
+        mg = MeterGroup(meters)
+        self.assertIs(mg[1], meters[0])
+        with self.assertRaises(KeyError):
+            mg[3]
+
+        # Changes to the list of meters are picked up
+        meter3 = ElecMeter(meter_id=ElecMeterID(3, 1, "REDD"))
+        mg.meters.append(meter3)
+        self.assertIs(mg[3], meter3)
+        self.assertIs(mg[ElecMeterID(3, 1, "REDD")], meter3)
+        mg.meters.remove(meters[0])
+        with self.assertRaises(KeyError):
+            mg[1]
+        mg.meters = meters
+        self.assertIs(mg[1], meters[0])
+        with self.assertRaises(KeyError):
+            mg[3]
+
+        # Appliances attached after the first lookup are found
+        with self.assertRaises(KeyError):
+            mg["fridge"]
+        meters[1].appliances = [Appliance({"type": "fridge", "instance": 1})]
+        self.assertIs(mg["fridge"], meters[1])
+
+        # Nested groups
+        mg.meters[:] = [meters[0], MeterGroup([meters[1], meter3])]
+        self.assertIs(mg[3], meter3)
+        self.assertIs(mg[[meters[1].identifier, meter3.identifier]], mg.meters[1])
+
     def test_select(self):
         fridge_meter = ElecMeter()
         fridge = Appliance({"type": "fridge", "instance": 1})
@@ -172,6 +212,28 @@ class TestMeterGroup(unittest.TestCase):
         ds.buildings[1].elec.clear_cache()
         ds.store.close()
 
+    def test_pairwise_correlation(self):
+        ds = DataSet(join(data_dir(), "random.h5"))
+        elec = ds.buildings[1].elec
+        expected = elec.dataframe_of_meters().corr()
+        correlation = elec.pairwise_correlation()
+        pd.testing.assert_frame_equal(correlation, expected, check_names=False)
+        ds.store.close()
+
+    def test_dataframe_of_meters_to_store(self):
+        ds = DataSet(join(data_dir(), "random.h5"))
+        elec = ds.buildings[1].elec
+        expected = elec.dataframe_of_meters()
+        store = TmpDataStore()
+        stored = elec.dataframe_of_meters(store=store, key="/matrix", chunksize=300)
+        self.assertEqual(stored.columns, list(expected.columns))
+        self.assertGreater(len(list(stored.load(chunksize=300))), 1)
+        pd.testing.assert_frame_equal(stored.to_dataframe(), expected, check_freq=False)
+        with self.assertRaises(ValueError):
+            elec.dataframe_of_meters(store=store)
+        store.close()
+        ds.store.close()
+
     def test_load(self):
         filename = join(data_dir(), "energy.h5")
         ds = DataSet(filename)
@@ -187,6 +249,112 @@ class TestMeterGroup(unittest.TestCase):
         self.assertEqual(df.columns.levels, [["power"], ["active"]])
         ds.store.close()
 
+    def test_load_small_chunks(self):
+        ds = DataSet(join(data_dir(), "random.h5"))
+        elec = ds.buildings[1].elec
+        for sample_period in [None, 60]:
+            kwargs = {} if sample_period is None else {"sample_period": sample_period}
+            expected = pd.concat(elec.load(chunksize=10**9, **kwargs))
+            chunks = list(elec.load(chunksize=100, **kwargs))
+            self.assertGreater(len(chunks), 1)
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+        ds.store.close()
+
+    def test_load_chunk_timeframes(self):
+        # Each meter's chunks are split at the output chunks' boundaries,
+        # and each output chunk's timeframe must cover only its own rows.
+        ds = DataSet(join(data_dir(), "co_test.h5"))
+        elec = ds.buildings[1].elec
+        for chunksize in [100, 1000]:
+            timeframes = [
+                chunk.attrs["timeframe"]
+                for chunk in elec.load(chunksize=chunksize, sample_period=6)
+            ]
+            expected = list(split_timeframes([elec.get_timeframe()], 6 * chunksize))
+            self.assertGreater(len(expected), 1)
+            self.assertEqual(timeframes, expected)
+        ds.store.close()
+
+    def test_load_with_executor(self):
+        ds = DataSet(join(data_dir(), "random.h5"))
+        elec = ds.buildings[1].elec
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for kwargs in [{}, {"sample_period": 60}]:
+                expected = pd.concat(elec.load(chunksize=300, **kwargs))
+                loaded = pd.concat(
+                    elec.load(chunksize=300, executor=executor, **kwargs)
+                )
+                pd.testing.assert_frame_equal(loaded, expected)
+            pd.testing.assert_frame_equal(
+                elec.dataframe_of_meters(executor=executor),
+                elec.dataframe_of_meters(),
+            )
+        ds.store.close()
+
+    def test_combine_chunks_from_generators(self):
+        index = pd.date_range("2014-01-01", periods=4, freq="6s")
+        columns = pd.MultiIndex.from_tuples(
+            [("power", "active"), ("voltage", "")], names=LEVEL_NAMES
+        )
+
+        class FakeMeter(object):
+            def __init__(self, identifier, values):
+                self.identifier = identifier
+                self.chunk = pd.DataFrame(values, index=index, columns=columns)
+                self.chunk.attrs["timeframe"] = TimeFrame(index[0], index[-1])
+
+            def load(self, **kwargs):
+                yield self.chunk
+
+        meters = [
+            FakeMeter(1, [[1, 240], [np.nan, 240], [np.nan, np.nan], [4, 250]]),
+            FakeMeter(2, [[10, 230], [20, np.nan], [np.nan, np.nan], [40, 230]]),
+        ]
+        combined = combine_chunks_from_generators(index, columns, meters, {})
+        np.testing.assert_array_equal(
+            combined[("power", "active")], [11, 20, np.nan, 44]
+        )
+        np.testing.assert_array_equal(
+            combined[("voltage", "")], [235, 240, np.nan, 240]
+        )
+        # Sums are float32; means are float64
+        self.assertEqual(combined[("power", "active")].dtype, np.float32)
+        self.assertEqual(combined[("voltage", "")].dtype, np.float64)
+        self.assertEqual(combined.attrs["timeframe"], TimeFrame(index[0], index[-1]))
+
+    def test_combine_chunks_off_grid(self):
+        index = pd.date_range("2014-01-01", periods=6, freq="6s", tz="Europe/London")
+        columns = pd.MultiIndex.from_tuples(
+            [("power", "active"), ("voltage", "")], names=LEVEL_NAMES
+        )
+        chunk_columns = pd.MultiIndex.from_tuples(
+            [("voltage", ""), ("power", "reactive"), ("power", "active")],
+            names=LEVEL_NAMES,
+        )
+        # Rows 1 and 4, a timestamp between rows and one after the end
+        chunk_index = pd.DatetimeIndex(
+            [index[1], index[2] + pd.Timedelta("1s"), index[4], index[-1] + index.freq]
+        )
+        chunk = pd.DataFrame(
+            [[230, 1, 5], [0, 0, 0], [np.nan, 1, 7], [0, 0, 0]],
+            index=chunk_index,
+            columns=chunk_columns,
+        )
+        chunk.attrs["timeframe"] = TimeFrame(chunk_index[0], chunk_index[-1])
+        full = pd.DataFrame(
+            [[1, 240]] * len(index), index=index, columns=columns, dtype=float
+        )
+        full.attrs["timeframe"] = TimeFrame(index[0], index[-1])
+
+        combined = combine_chunks(index, columns, [chunk, full])
+        np.testing.assert_array_equal(combined[("power", "active")], [1, 6, 1, 1, 8, 1])
+        np.testing.assert_array_equal(
+            combined[("voltage", "")], [240, 235, 240, 240, 240, 240]
+        )
+        self.assertEqual(
+            combined.attrs["timeframe"], TimeFrame(index[0], index[-1] + index.freq)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
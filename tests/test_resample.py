@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.base.node import Node
+from nilmtk.elecmeter import ElecMeter
+from nilmtk.preprocessing import Resample
+from nilmtk.timeframe.timeframe import TimeFrame
+from nilmtk.utils import safe_resample
+
+
+def make_data(n=500, seed=42):
+    rng = np.random.default_rng(seed)
+    # Irregular samples roughly every 3 seconds, with a few long gaps
+    steps = rng.integers(1, 6, size=n)
+    steps[[100, 250, 400]] = [40, 25, 300]
+    index = pd.Timestamp("2014-03-30 00:00:01", tz="Europe/London") + pd.to_timedelta(
+        np.cumsum(steps), unit="s"
+    )
+    data = rng.normal(100, 30, size=(n, 2)).astype(np.float32)
+    data[rng.integers(0, n, size=20), 0] = np.nan
+    return pd.DataFrame(data, index=index, columns=["a", "b"])
+
+
+def split_into_chunks(df, split_points):
+    chunks = []
+    for start, end in zip([0] + split_points, split_points + [len(df)]):
+        chunk = df.iloc[start:end].copy()
+        chunk.attrs["timeframe"] = TimeFrame(chunk.index[0], chunk.index[-1])
+        chunks.append(chunk)
+    return chunks
+
+
+def run_node(chunks, **resample_kwargs):
+    meter = ElecMeter(metadata={})
+    node = Resample(Node(meter, generator=iter(chunks)), **resample_kwargs)
+    return [chunk for chunk in node.process()]
+
+
+class TestResample(unittest.TestCase):
+    def check_against_pandas(self, split_points, **resample_kwargs):
+        df = make_data()
+        expected = safe_resample(df, rule="6s", **resample_kwargs)
+        chunks = split_into_chunks(df, split_points)
+        resampled = run_node(chunks, rule="6s", **resample_kwargs)
+        self.assertEqual(len(resampled), len(chunks))
+        for chunk, resampled_chunk in zip(chunks, resampled):
+            self.assertEqual(
+                resampled_chunk.attrs["timeframe"], chunk.attrs["timeframe"]
+            )
+        result = pd.concat(resampled)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False, rtol=1e-5)
+
+    def test_single_chunk(self):
+        for how in ["mean", "sum", "max", "min"]:
+            self.check_against_pandas([], how=how)
+
+    def test_chunks_are_continuous(self):
+        for split_points in [[50, 52, 300], [101, 251, 399]]:
+            for how in ["mean", "sum", "max"]:
+                self.check_against_pandas(split_points, how=how)
+
+    def test_ffill_across_chunks(self):
+        for limit in [1, 3, 10, None]:
+            self.check_against_pandas(
+                [101, 260], how="mean", fill_method="ffill", limit=limit
+            )
+
+    def test_discontinuous_sections(self):
+        df = make_data()
+        # Make the second chunk start well after the end of the first
+        df.index = df.index.where(
+            np.arange(len(df)) < 250, df.index + pd.Timedelta("1h")
+        )
+        chunks = split_into_chunks(df, [250])
+        resampled = run_node(chunks, rule="6s", fill_method="ffill", limit=2)
+        for chunk, resampled_chunk in zip(chunks, resampled):
+            expected = safe_resample(
+                chunk, rule="6s", how="mean", fill_method="ffill", limit=2
+            )
+            pd.testing.assert_frame_equal(
+                resampled_chunk, expected, check_freq=False, rtol=1e-5
+            )
+
+    def test_falls_back_to_pandas(self):
+        df = make_data()
+        chunks = split_into_chunks(df, [250])
+        resampled = run_node(chunks, rule="6s", how="median")
+        for chunk, resampled_chunk in zip(chunks, resampled):
+            expected = safe_resample(chunk, rule="6s", how="median")
+            pd.testing.assert_frame_equal(resampled_chunk, expected)
+
+    def test_rule_in_resample_kwargs(self):
+        meter = ElecMeter(metadata={})
+        with self.assertRaises(ValueError):
+            meter._prep_kwargs_for_sample_period_and_resample(
+                sample_period=6, resample=True, resample_kwargs={"rule": "1min"}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.seriesbuffer import SeriesBuffer
+
+
+class TestSeriesBuffer(unittest.TestCase):
+    def test_append(self):
+        index = pd.date_range("2014-01-01", periods=10, freq="6s", tz="Europe/London")
+        power = pd.Series(np.arange(10, dtype=np.float32), index=index, name="power")
+        for memory_budget in [None, 0]:
+            # Start too small, so the buffer has to grow
+            buffer = SeriesBuffer(2, memory_budget=memory_budget)
+            self.assertEqual(buffer.is_memmap, memory_budget == 0)
+            # Overlapping chunks
+            for chunk in [power.iloc[:4], power.iloc[3:7], power.iloc[7:]]:
+                buffer.append(chunk)
+            series = buffer.to_series()
+            pd.testing.assert_series_equal(series, power, check_freq=False)
+            self.assertTrue(np.shares_memory(series.to_numpy(), buffer._values))
+
+    def test_to_series_trims_capacity(self):
+        index = pd.date_range("2014-01-01", periods=10, freq="6s", tz="Europe/London")
+        power = pd.Series(np.arange(10, dtype=np.float32), index=index, name="power")
+        for memory_budget in [None, 0]:
+            buffer = SeriesBuffer(1000, memory_budget=memory_budget)
+            buffer.append(power)
+            series = buffer.to_series()
+            self.assertEqual(buffer.capacity, 10)
+            values = series.to_numpy()
+            while isinstance(values.base, np.ndarray):
+                values = values.base
+            self.assertEqual(values.nbytes, 10 * 4)
+            # Appending after `to_series` must not change the Series
+            buffer.append(power.shift(1, freq="min") + 100)
+            pd.testing.assert_series_equal(series, power, check_freq=False)
+            self.assertEqual(len(buffer.to_series()), 20)
+
+    def test_empty(self):
+        self.assertIsNone(SeriesBuffer(10).to_series())
+
+
+if __name__ == "__main__":
+    unittest.main()
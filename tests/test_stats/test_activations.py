@@ -0,0 +1,217 @@
+import unittest
+from os import remove
+from os.path import join
+from tempfile import mkstemp
+
+import numpy as np
+import pandas as pd
+
+from nilmtk import ElecMeter, HDFDataStore
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.elecmeter import ElecMeterID
+from nilmtk.electric import get_activations
+from nilmtk.stats.activations import ActivationDetector, slice_activations
+from nilmtk.timeframe import TimeFrame
+
+from ..testingtools import data_dir
+
+METER_ID = ElecMeterID(instance=1, building=1, dataset="REDD")
+
+
+def detect(chunks, **kwargs):
+    detector = ActivationDetector(**kwargs)
+    frames = [detector.process(chunk) for chunk in chunks]
+    frames.append(detector.finish())
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestActivationDetector(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2014-01-01", periods=12, freq="10s", tz="Europe/London")
+        self.power = pd.Series(
+            [0, 100, 200, 0, 0, 0, 300, 0, 100, 100, 0, 100], index=index
+        )
+
+    def test_across_chunks(self):
+        index = self.power.index
+        expected = detect([self.power])
+        self.assertEqual(list(expected["start"]), list(index[[1, 6, 8]]))
+        self.assertEqual(list(expected["end"]), list(index[[3, 7, 10]]))
+        self.assertEqual(list(expected["peak"]), [200, 300, 100])
+        np.testing.assert_allclose(
+            expected["energy"], np.array([3000, 3000, 2000]) / JOULES_PER_KWH
+        )
+        for split in range(1, len(self.power)):
+            chunks = [self.power.iloc[:split], self.power.iloc[split:]]
+            pd.testing.assert_frame_equal(detect(chunks), expected)
+
+    def test_min_off_and_min_on_duration(self):
+        index = self.power.index
+        for split in [None, 2, 4, 7, 9]:
+            if split is None:
+                chunks = [self.power]
+            else:
+                chunks = [self.power.iloc[:split], self.power.iloc[split:]]
+            activations = detect(chunks, min_off_duration=25)
+            self.assertEqual(list(activations["start"]), list(index[[1, 6]]))
+            self.assertEqual(list(activations["end"]), list(index[[3, 10]]))
+            self.assertEqual(list(activations["peak"]), [200, 300])
+            activations = detect(chunks, min_on_duration=15)
+            self.assertEqual(list(activations["start"]), list(index[[1, 8]]))
+
+    def test_nan(self):
+        power = self.power.copy()
+        power.iloc[7] = np.nan
+        chunks = [power.iloc[:7], power.iloc[7:]]
+        # A NaN as the first sample after an activation ends it, and
+        # does not discard it
+        activations = detect(chunks)
+        self.assertEqual(list(activations["start"]), list(power.index[[1, 6, 8]]))
+        self.assertEqual(list(activations["end"]), list(power.index[[3, 7, 10]]))
+        # But a NaN within an activation does
+        activations = detect(chunks, min_off_duration=25)
+        self.assertEqual(list(activations["start"]), list(power.index[[1]]))
+
+    def test_gap(self):
+        index = self.power.index
+        power = pd.Series([0, 100, 200, 0, 0, 100, 0, 0, 100, 0, 100, 100], index=index)
+        first, second = power.iloc[:6], power.iloc[6:]
+        second.attrs["timeframe"] = TimeFrame(index[6], index[11])
+        first.attrs["timeframe"] = TimeFrame(index[0], index[6])
+        activations = detect([first, second], min_off_duration=25)
+        self.assertEqual(list(activations["start"]), list(index[[1]]))
+        self.assertEqual(list(activations["end"]), list(index[[9]]))
+        # The activation which is still on at the gap is discarded, and
+        # the one before the gap cannot be merged with a later one
+        first.attrs["timeframe"] = TimeFrame(index[0], index[5])
+        activations = detect([first, second], min_off_duration=25)
+        self.assertEqual(list(activations["start"]), list(index[[1, 8]]))
+        self.assertEqual(list(activations["end"]), list(index[[3, 9]]))
+
+    def test_max_sample_period(self):
+        power = self.power.drop(self.power.index[[4, 5]])
+        activations = detect([power], max_sample_period=10)
+        np.testing.assert_allclose(
+            activations["energy"], np.array([3000, 3000, 2000]) / JOULES_PER_KWH
+        )
+        # The time after a sample above the threshold is clipped too
+        power = self.power.drop(self.power.index[[2]])
+        activations = detect([power], max_sample_period=10)
+        np.testing.assert_allclose(
+            activations["energy"], np.array([1000, 3000, 2000]) / JOULES_PER_KWH
+        )
+
+
+class TestSliceActivations(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2014-01-01", periods=500, freq="6s", tz="Europe/London")
+        self.power = pd.Series(
+            (rng.random(500) > 0.7) * rng.random(500) * 300, index=index
+        )
+        self.power.iloc[rng.integers(0, 500, 10)] = np.nan
+
+    def slice(self, chunks, border, **kwargs):
+        detector = ActivationDetector(on_power_threshold=50, **kwargs)
+        activations = slice_activations(chunks, detector, border)
+        return [a for a in activations if not a.isnull().values.any()]
+
+    def test_across_chunks(self):
+        for kwargs in [{}, dict(min_off_duration=20), dict(min_on_duration=15)]:
+            for border in [1, 3]:
+                expected = get_activations(
+                    self.power, border=border, on_power_threshold=50, **kwargs
+                )
+                self.assertTrue(expected)
+                for chunksize in [1, 7, 100]:
+                    chunks = [
+                        self.power.iloc[i : i + chunksize]
+                        for i in range(0, len(self.power), chunksize)
+                    ]
+                    activations = self.slice(chunks, border, **kwargs)
+                    self.assertEqual(len(activations), len(expected))
+                    for activation, expected_activation in zip(activations, expected):
+                        pd.testing.assert_series_equal(activation, expected_activation)
+
+    def test_nan_at_off_sample(self):
+        index = pd.date_range("2014-01-01", periods=20, freq="6s", tz="Europe/London")
+        power = pd.Series(0.0, index=index)
+        power.iloc[15:17] = 100
+        power.iloc[17] = np.nan
+        for border in [0, 1]:
+            expected = get_activations(
+                power, border=border, on_power_threshold=50, min_on_duration=12
+            )
+            activations = self.slice([power], border, min_on_duration=12)
+            self.assertEqual(len(activations), len(expected))
+            for activation, expected_activation in zip(activations, expected):
+                pd.testing.assert_series_equal(activation, expected_activation)
+        # The NaN is only sliced, and so only discards the activation,
+        # if there is a border
+        self.assertEqual(len(expected), 0)
+        self.assertEqual(len(self.slice([power], 0, min_on_duration=12)), 1)
+
+    def test_borders_stop_at_gaps(self):
+        index = self.power.index
+        first, second = self.power.iloc[:250], self.power.iloc[250:]
+        first.attrs["timeframe"] = TimeFrame(index[0], index[249])
+        second.attrs["timeframe"] = TimeFrame(index[250], index[499])
+        expected = get_activations(first, border=3, on_power_threshold=50)
+        expected += get_activations(second, border=3, on_power_threshold=50)
+        activations = self.slice([first, second], border=3)
+        self.assertEqual(len(activations), len(expected))
+        for activation, expected_activation in zip(activations, expected):
+            pd.testing.assert_series_equal(activation, expected_activation)
+
+
+class TestMeterActivations(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        filename = join(data_dir(), "energy.h5")
+        cls.datastore = HDFDataStore(filename)
+        ElecMeter.load_meter_devices(cls.datastore)
+        meter_meta = cls.datastore.load_metadata("building1")["elec_meters"][
+            METER_ID.instance
+        ]
+        cls.meter = ElecMeter(
+            store=cls.datastore, metadata=meter_meta, meter_id=METER_ID
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.datastore.close()
+
+    def test_get_activations(self):
+        chunk = self.meter.power_series_all_data(resample=True)
+        expected = get_activations(chunk, on_power_threshold=50)
+        activations = self.meter.get_activations(on_power_threshold=50)
+        self.assertEqual(len(activations), len(expected))
+        for activation, expected_activation in zip(activations, expected):
+            pd.testing.assert_series_equal(activation, expected_activation)
+
+    def test_load_activation(self):
+        for kwargs in [{}, {"sample_period": 30}]:
+            records = self.meter.activation_records(on_power_threshold=50, **kwargs)
+            activations = self.meter.get_activations(on_power_threshold=50, **kwargs)
+            self.assertEqual(len(records), len(activations))
+            for record, activation in zip(records.itertuples(), activations):
+                loaded = self.meter.load_activation(record, **kwargs)
+                pd.testing.assert_series_equal(loaded, activation)
+
+    def test_activation_records_to_store(self):
+        records = self.meter.activation_records(on_power_threshold=50)
+        filename = mkstemp(suffix=".h5")[1]
+        store = HDFDataStore(filename, "w")
+        try:
+            self.meter.activation_records(
+                on_power_threshold=50, store=store, key="/activations"
+            )
+            stored = store.store["/activations"]
+        finally:
+            store.close()
+            remove(filename)
+        pd.testing.assert_frame_equal(stored, records.set_index("start"))
+
+
+if __name__ == "__main__":
+    unittest.main()
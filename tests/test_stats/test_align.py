@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.electric import Electric
+from nilmtk.stats.align import align_streams
+from nilmtk.stats.entropy import knn_mutual_information
+
+
+def chunked(series, splits):
+    bounds = [0] + list(splits) + [len(series)]
+    return [series.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+class TestAlignStreams(unittest.TestCase):
+    def test_align_streams(self):
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2014-01-01", periods=200, freq="3s", tz="Europe/London")
+        a = pd.Series(rng.random(200), index=index)
+        a.iloc[20:40] = np.nan
+        index = pd.date_range("2014-01-01 00:01", periods=90, freq="4s", tz="UTC")
+        b = pd.Series(rng.random(90), index=index.tz_convert("Europe/London"))
+        c = pd.Series(rng.random(1), index=b.index[[50]])
+
+        expected = pd.DataFrame(
+            {
+                "a": a.resample("10s").mean(),
+                "b": b.resample("10s").mean(),
+                "c": c.resample("10s").mean(),
+            }
+        ).dropna(how="all")
+        streams = [chunked(a, [7, 101, 150]), chunked(b, [1, 33]), [c]]
+        chunks = list(align_streams(streams, 10, names=["a", "b", "c"]))
+        self.assertGreater(len(chunks), 1)
+        aligned = pd.concat(chunks)
+        pd.testing.assert_frame_equal(aligned, expected, check_freq=False)
+
+
+class FakeMeter(Electric):
+    def __init__(self, series, splits):
+        self.series = series
+        self.splits = splits
+
+    def sample_period(self):
+        return 10
+
+    def power_series(self, **kwargs):
+        return iter(chunked(self.series, self.splits))
+
+
+class TestAlignedMeters(unittest.TestCase):
+    def test_correlation_with_misaligned_chunks(self):
+        rng = np.random.default_rng(1)
+        index = pd.date_range("2014-01-01", periods=300, freq="10s")
+        x = pd.Series(rng.random(300), index=index)
+        y = (x + rng.random(300)).drop(index[50:120])
+        x.iloc[200:210] = np.nan
+        expected = x.corr(y)
+        # Chunks are cut by row count, so they cover different times
+        meter_x = FakeMeter(x, [100, 150])
+        meter_y = FakeMeter(y, [30, 100])
+        self.assertAlmostEqual(meter_x.correlation(meter_y), expected)
+        self.assertAlmostEqual(meter_y.correlation(meter_x), expected)
+
+    def test_mutual_information_with_misaligned_chunks(self):
+        rng = np.random.default_rng(2)
+        index = pd.date_range("2014-01-01", periods=300, freq="10s")
+        x = pd.Series(rng.random(300), index=index)
+        y = (x + rng.random(300)).drop(index[50:120])
+        meter_x = FakeMeter(x, [100, 150])
+        meter_y = FakeMeter(y, [30, 100])
+        # All 230 overlapping samples fit in the reservoir
+        mi = meter_x.mutual_information(meter_y, max_samples=1000)
+        expected = knn_mutual_information(x.drop(index[50:120]), y)
+        self.assertAlmostEqual(mi, expected, delta=1e-6)
+
+    def test_mutual_information_without_overlap(self):
+        index = pd.date_range("2014-01-01", periods=100, freq="10s")
+        meter_x = FakeMeter(pd.Series(1.0, index=index[:50]), [])
+        meter_y = FakeMeter(pd.Series(1.0, index=index[50:]), [])
+        for max_samples in [None, 1000]:
+            with self.assertRaises(ValueError):
+                meter_x.mutual_information(meter_y, max_samples=max_samples)
+
+    def test_entropy_with_too_few_samples(self):
+        index = pd.date_range("2014-01-01", periods=3, freq="10s")
+        for series in [pd.Series(dtype=float), pd.Series(1.0, index=index)]:
+            meter = FakeMeter(series, [])
+            for max_samples in [None, 1000]:
+                with self.assertRaises(ValueError):
+                    meter.entropy(k=3, max_samples=max_samples)
+
+
+if __name__ == "__main__":
+    unittest.main()
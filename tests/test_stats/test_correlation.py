@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.stats.correlation import CoMoments
+
+
+class TestCoMoments(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(1e6, 1, size=1000)  # large offset, small variance
+        values = np.column_stack(
+            [x, x + rng.normal(0, 1, 1000), rng.normal(0, 1, 1000)]
+        )
+        values[rng.random(values.shape) < 0.1] = np.nan
+        self.values = values
+        self.expected = pd.DataFrame(values).corr().values
+
+    def test_single_chunk(self):
+        comoments = CoMoments.from_array(self.values)
+        np.testing.assert_allclose(comoments.correlation(), self.expected)
+        np.testing.assert_allclose(
+            comoments.covariance(), pd.DataFrame(self.values).cov().values
+        )
+
+    def test_chunks_and_merge(self):
+        comoments = CoMoments(3)
+        for chunk in np.array_split(self.values, 7):
+            comoments.update(chunk)
+        np.testing.assert_allclose(comoments.correlation(), self.expected)
+
+        # Partial states merge in any order
+        first, second = np.array_split(self.values, 2)
+        merged = CoMoments.from_array(second)
+        merged.merge(CoMoments.from_array(first))
+        np.testing.assert_allclose(merged.correlation(), self.expected)
+
+    def test_too_few_samples(self):
+        comoments = CoMoments.from_array([[1.0, np.nan], [2.0, 3.0]])
+        self.assertTrue(np.isnan(comoments.correlation()[0, 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.stats.decimate import MinMaxDecimator
+
+
+class TestMinMaxDecimator(unittest.TestCase):
+    def test_across_chunks(self):
+        index = pd.date_range("2014-01-01", periods=101, freq="s", tz="Europe/London")
+        power = pd.Series(np.zeros(101), index=index, name="power")
+        power.iloc[13] = 500  # a one-sample spike
+        power.iloc[50:60] = np.nan
+        decimator = MinMaxDecimator(index[0], index[-1], 10)
+        for chunk in [power.iloc[:15], power.iloc[15:], power.iloc[:0]]:
+            decimator.update(chunk)
+        series = decimator.to_series()
+        self.assertEqual(len(series), 22)
+        self.assertEqual(series.name, "power")
+        self.assertEqual(str(series.index.tz), "Europe/London")
+        np.testing.assert_array_equal(decimator.maxs[:3], [0, 500, 0])
+        self.assertTrue(np.isnan(decimator.mins[5]))
+        self.assertEqual(series.index[2], index[10] + pd.Timedelta("2.5s"))
+
+
+if __name__ == "__main__":
+    unittest.main()
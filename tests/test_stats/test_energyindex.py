@@ -0,0 +1,97 @@
+import unittest
+from os.path import join
+
+import numpy as np
+import pandas as pd
+
+from nilmtk import ElecMeter, HDFDataStore, TimeFrame
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.elecmeter import ElecMeterID
+from nilmtk.preprocessing import Clip
+from nilmtk.stats import EnergyIndex
+from nilmtk.stats.energyindex import get_energy_per_bin
+from nilmtk.stats.energyindexresults import EnergyIndexResults
+
+from ..testingtools import data_dir
+from .test_totalenergy import check_energy_numbers
+
+METER_ID = ElecMeterID(instance=1, building=1, dataset="REDD")
+MINUTE = 60 * 10**9
+
+
+class TestEnergyIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        filename = join(data_dir(), "energy.h5")
+        cls.datastore = HDFDataStore(filename)
+        ElecMeter.load_meter_devices(cls.datastore)
+        cls.meter_meta = cls.datastore.load_metadata("building1")["elec_meters"][
+            METER_ID.instance
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.datastore.close()
+
+    def test_energy_per_bin(self):
+        power = np.array([100, 100, 200, np.nan, 300, 0])
+        secs = np.array([0, 30, 50, 60, 70, 200])
+        index = pd.DatetimeIndex(
+            pd.Timestamp("2010-01-01") + pd.to_timedelta(secs, "s")
+        )
+        df = pd.DataFrame({("power", "active"): power}, index=index)
+        bins, energy, ac_types = get_energy_per_bin(df, 60, MINUTE)
+        self.assertEqual(ac_types, ["active"])
+        first_bin = pd.Timestamp("2010-01-01").value // MINUTE
+        np.testing.assert_array_equal(bins - first_bin, [0, 1, 3])
+        joules = [100 * 30 + 100 * 20 + 200 * 20, 300 * 60, 0]
+        np.testing.assert_allclose(energy[:, 0], np.array(joules) / JOULES_PER_KWH)
+
+    def test_energy_lookup(self):
+        index = pd.date_range("2010-01-01", periods=4, freq="1min", tz="Europe/London")
+        results = EnergyIndexResults("1min")
+        bins = index.asi8 // MINUTE
+        results.append_bins(bins[:2], np.array([[1.0], [2.0]]), ["active"], index.tz)
+        results.append_bins(bins[1:], np.array([[1.0], [3.0], [4.0]]), ["active"])
+        self.assertEqual(results.combined()["active"], 11.0)
+
+        energy, edges = results.energy(
+            [TimeFrame(index[0] + pd.Timedelta("30s"), index[3])]
+        )
+        self.assertEqual(energy["active"], 6.0)
+        self.assertEqual(edges, [TimeFrame(index[0] + pd.Timedelta("30s"), index[1])])
+
+        energy, edges = results.energy([TimeFrame(index[2], None)])
+        self.assertEqual(energy["active"], 7.0)
+        self.assertEqual(edges, [])
+
+        imported = EnergyIndexResults("1min")
+        imported.import_from_cache(results.export_to_cache())
+        pd.testing.assert_frame_equal(imported._data, results._data)
+
+    def test_pipeline(self):
+        meter = ElecMeter(
+            store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
+        )
+        energy_index = EnergyIndex(Clip(meter.get_source_node()))
+        energy_index.run()
+        check_energy_numbers(self, energy_index.results.combined())
+
+    def test_total_energy_with_index(self):
+        meter = ElecMeter(
+            store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
+        )
+        meter.clear_cache()
+        expected = meter.total_energy()
+        for _ in range(2):  # the second time uses the cached index
+            energy = meter.total_energy(use_energy_index=True)
+            pd.testing.assert_series_equal(
+                energy.sort_index(), expected.sort_index(), check_names=False
+            )
+        energy = meter.total_energy(use_energy_index=True, ac_type="active")
+        self.assertEqual(list(energy.index), ["active"])
+        meter.clear_cache()
+
+
+if __name__ == "__main__":
+    unittest.main()
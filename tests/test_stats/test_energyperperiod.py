@@ -0,0 +1,108 @@
+import unittest
+from os.path import join
+
+import numpy as np
+import pandas as pd
+
+from nilmtk import ElecMeter, HDFDataStore
+from nilmtk.consts import JOULES_PER_KWH
+from nilmtk.elecmeter import ElecMeterID
+from nilmtk.stats.energyperperiod import calendar_period_edges, get_energy_per_period
+from nilmtk.stats.energyperperiodresults import EnergyPerPeriodResults
+
+from ..testingtools import data_dir
+
+METER_ID = ElecMeterID(instance=1, building=1, dataset="REDD")
+HOUR = 3600 * 10**9
+
+
+class TestEnergyPerPeriod(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        filename = join(data_dir(), "energy.h5")
+        cls.datastore = HDFDataStore(filename)
+        ElecMeter.load_meter_devices(cls.datastore)
+        cls.meter_meta = cls.datastore.load_metadata("building1")["elec_meters"][
+            METER_ID.instance
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.datastore.close()
+
+    def test_calendar_period_edges(self):
+        # Clocks go forward on 2014-03-30 and back on 2014-10-26 in London
+        tz = "Europe/London"
+        first = pd.Timestamp("2014-03-29 12:00", tz=tz).value
+        last = pd.Timestamp("2014-03-31 12:00", tz=tz).value
+        edges = calendar_period_edges(first, last, "D", tz)
+        np.testing.assert_array_equal(np.diff(edges), [24 * HOUR, 23 * HOUR, 24 * HOUR])
+
+        first = pd.Timestamp("2014-10-26 00:30", tz=tz).value
+        last = pd.Timestamp("2014-10-26 02:30", tz=tz).value
+        edges = calendar_period_edges(first, last, "h", tz)
+        self.assertEqual(len(edges) - 1, 4)
+        self.assertTrue((np.diff(edges) == HOUR).all())
+
+        first = pd.Timestamp("2014-01-15").value
+        last = pd.Timestamp("2014-03-15").value
+        edges = calendar_period_edges(first, last, "M")
+        self.assertEqual(
+            list(pd.DatetimeIndex(edges.view("M8[ns]")).month), [1, 2, 3, 4]
+        )
+
+    def test_split_across_period_boundary(self):
+        index = pd.date_range("2014-03-29 23:40", periods=4, freq="10min", tz="UTC")
+        df = pd.DataFrame({("power", "active"): [1000.0, 2000.0, 3000.0, 0.0]}, index)
+        starts, ends, energy, ac_types = get_energy_per_period(df, 600, "D")
+        self.assertEqual(ac_types, ["active"])
+        np.testing.assert_array_equal(ends - starts, [24 * HOUR, 24 * HOUR])
+        joules_per_min = np.array([1000, 2000, 3000]) * 60
+        expected = [
+            joules_per_min[0] * 10 + joules_per_min[1] * 10,
+            joules_per_min[2] * 10,
+        ]
+        np.testing.assert_allclose(energy[:, 0], np.array(expected) / JOULES_PER_KWH)
+
+        # Straddle midnight
+        index = index + pd.Timedelta("5min")
+        df.index = index
+        starts, ends, energy, ac_types = get_energy_per_period(df, 600, "D")
+        expected = [
+            joules_per_min[0] * 10 + joules_per_min[1] * 5,
+            joules_per_min[1] * 5 + joules_per_min[2] * 10,
+        ]
+        np.testing.assert_allclose(energy[:, 0], np.array(expected) / JOULES_PER_KWH)
+
+    def test_results_across_chunks(self):
+        results = EnergyPerPeriodResults("D")
+        day = 24 * HOUR
+        results.append_periods(
+            np.array([0, day]), np.array([day, 2 * day]), np.ones((2, 1)), ["active"]
+        )
+        results.append_periods(
+            np.array([day]), np.array([2 * day]), np.ones((1, 1)), ["active"]
+        )
+        self.assertEqual(list(results.simple()["active"]), [1.0, 2.0])
+        imported = EnergyPerPeriodResults("D")
+        imported.import_from_cache(results.export_to_cache())
+        pd.testing.assert_frame_equal(imported._data, results._data)
+
+    def test_meter_energy_per_period(self):
+        meter = ElecMeter(
+            store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
+        )
+        meter.clear_cache()
+        total_energy = meter.total_energy()
+        for _ in range(2):  # the second time uses the cache
+            energy = meter.energy_per_period("min")
+            self.assertEqual(len(energy), 3)
+            for ac_type, value in total_energy.items():
+                self.assertAlmostEqual(energy[ac_type].sum(), value)
+        energy = meter.energy_per_period("min", ac_type="active")
+        self.assertEqual(list(energy.columns), ["active"])
+        meter.clear_cache()
+
+
+if __name__ == "__main__":
+    unittest.main()
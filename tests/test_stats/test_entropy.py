@@ -0,0 +1,55 @@
+import unittest
+from math import log, pi
+
+import numpy as np
+
+from nilmtk.stats.entropy import (
+    knn_entropy,
+    knn_mutual_information,
+    reservoir_sample,
+)
+
+
+class TestEntropy(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_knn_entropy_of_normal_distribution(self):
+        x = self.rng.normal(size=5000)
+        expected = 0.5 * log(2 * pi * np.e, 2)
+        self.assertAlmostEqual(knn_entropy(x, rng=self.rng), expected, delta=0.05)
+
+    def test_knn_mutual_information(self):
+        rho = 0.8
+        x = self.rng.normal(size=5000)
+        y = rho * x + np.sqrt(1 - rho**2) * self.rng.normal(size=5000)
+        expected = -0.5 * log(1 - rho**2, 2)
+        mi = knn_mutual_information(x, y, rng=self.rng)
+        self.assertAlmostEqual(mi, expected, delta=0.05)
+
+        independent = knn_mutual_information(
+            x, self.rng.normal(size=5000), rng=self.rng
+        )
+        self.assertAlmostEqual(independent, 0, delta=0.05)
+
+    def test_reservoir_sample(self):
+        chunks = [np.arange(i, i + 100) for i in range(0, 10000, 100)]
+        sample = reservoir_sample(chunks, 1000, rng=self.rng)
+        self.assertEqual(len(sample), 1000)
+        self.assertEqual(len(np.unique(sample)), 1000)
+        # Roughly uniform over the whole stream
+        self.assertAlmostEqual(sample.mean(), 5000, delta=500)
+
+        sample = reservoir_sample(chunks[:2], 1000, rng=self.rng)
+        np.testing.assert_array_equal(sample, np.arange(200))
+
+    def test_reservoir_sample_of_empty_stream(self):
+        self.assertEqual(reservoir_sample([], 10).shape, (0,))
+        sample = reservoir_sample(iter([]), 10, n_columns=2)
+        self.assertEqual(sample.shape, (0, 2))
+        sample = reservoir_sample([np.empty((0, 2))], 10)
+        self.assertEqual(sample.shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
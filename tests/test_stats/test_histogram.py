@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.stats.histogram import (
+    activity_histogram_from_generator,
+    histogram_from_generator,
+    time_of_period_bins,
+)
+
+
+class TestActivityHistogram(unittest.TestCase):
+    def test_time_of_period_bins(self):
+        # 23:30 UTC is 00:30 in London during summer time
+        index = pd.DatetimeIndex(
+            ["2014-06-01 23:30", "2014-06-02 11:59", "2014-12-01 23:30"], tz="UTC"
+        ).tz_convert("Europe/London")
+        np.testing.assert_array_equal(time_of_period_bins(index, "D", "h"), [0, 12, 23])
+        np.testing.assert_array_equal(
+            time_of_period_bins(index, "D", "30min"), [1, 25, 47]
+        )
+        # 2014-06-02 was a Monday
+        np.testing.assert_array_equal(time_of_period_bins(index, "W", "D"), [0, 0, 0])
+        with self.assertRaises(ValueError):
+            time_of_period_bins(index, "D", "7h")
+        with self.assertRaises(ValueError):
+            time_of_period_bins(index, "MS", "D")
+
+    def test_activity_histogram_from_generator(self):
+        index = pd.date_range("2014-03-29", "2014-04-02", freq="h", tz="Europe/London")
+        rng = np.random.default_rng(0)
+        when_on = pd.Series(rng.random(len(index)) > 0.5, index=index)
+        expected = np.bincount(when_on[when_on].index.hour, minlength=24)
+        chunks = [when_on.iloc[:30], when_on.iloc[30:]]
+        hist = activity_histogram_from_generator(chunks, "D", "h")
+        np.testing.assert_array_equal(hist, expected)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_histogram_from_generator(self):
+        values = np.arange(100, dtype=np.float64)
+        # The largest values are not in the first chunk
+        chunks = [values[:10], values[10:]]
+        for range in [(0, 99), (None, 99), (0, None), None]:
+            hist, bins = histogram_from_generator(iter(chunks), bins=11, range=range)
+            expected, expected_bins = np.histogram(values, bins=11)
+            np.testing.assert_array_equal(hist, expected)
+            np.testing.assert_array_equal(bins, expected_bins)
+        hist, bins = histogram_from_generator(iter(chunks))
+        self.assertEqual(len(bins), 100)
+        self.assertEqual(hist.sum(), 100)
+        self.assertEqual(histogram_from_generator(iter([]), bins=10), (None, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
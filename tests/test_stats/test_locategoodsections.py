@@ -9,7 +9,9 @@ from nilmtk import DataSet, ElecMeter, TimeFrame
 from nilmtk.datastore import HDFDataStore
 from nilmtk.elecmeter import ElecMeterID
 from nilmtk.stats import GoodSections
+from nilmtk.stats.goodsections import get_good_section_bounds, get_good_sections
 from nilmtk.stats.goodsectionsresults import GoodSectionsResults
+from nilmtk.timeframe.timeframegroup import OPEN_END, OPEN_START
 
 from ..testingtools import data_dir
 
@@ -135,6 +137,64 @@ class TestLocateGoodSections(unittest.TestCase):
             self.assertEqual(results[2].timedelta.total_seconds(), 50)
             self.assertEqual(results[3].timedelta.total_seconds(), 20)
 
+    def test_good_section_bounds(self):
+        secs = np.array([0, 10, 20, 50, 60, 70, 100])
+        index = secs * 10**9
+        starts, ends = get_good_section_bounds(index, 10)
+        np.testing.assert_array_equal(starts, [0, 50 * 10**9])
+        np.testing.assert_array_equal(ends, [20 * 10**9, 70 * 10**9])
+
+        # Open-ended at both ends
+        starts, ends = get_good_section_bounds(
+            index,
+            10,
+            look_ahead_start=105 * 10**9,
+            previous_chunk_ended_with_open_ended_good_section=True,
+        )
+        np.testing.assert_array_equal(starts, [OPEN_START, 50 * 10**9, 100 * 10**9])
+        np.testing.assert_array_equal(ends, [20 * 10**9, 70 * 10**9, OPEN_END])
+
+    def test_get_good_sections_unsorted_with_nans(self):
+        index = pd.date_range("2011-01-01", periods=6, freq="10s", tz="US/Eastern")
+        df = pd.DataFrame({"a": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0]}, index=index)
+        sections = get_good_sections(df.iloc[::-1], max_sample_period=10)
+        self.assertEqual(
+            sections, [TimeFrame(index[0], index[1]), TimeFrame(index[3], index[5])]
+        )
+        self.assertEqual(str(sections[0].start.tz), "US/Eastern")
+
+    def test_cache_round_trip(self):
+        index = pd.date_range("2014-03-30", periods=4, freq="1h", tz="Europe/London")
+        results = GoodSectionsResults(max_sample_period=10)
+        minute = timedelta(minutes=1)
+        results.append(
+            TimeFrame(index[0], index[1]),
+            {"sections": [[TimeFrame(index[0], index[0] + minute)]]},
+        )
+        results.append(
+            TimeFrame(index[1], index[2]),
+            {"sections": [[TimeFrame(index[1] + minute, None)]]},
+        )
+        results.append(
+            TimeFrame(index[2], index[3]),
+            {"sections": [[TimeFrame(None, index[2] + minute)]]},
+        )
+        expected = [
+            TimeFrame(index[0], index[0] + minute),
+            TimeFrame(index[1] + minute, index[2] + minute),
+        ]
+        self.assertEqual(results.combined(), expected)
+
+        cached = results.export_to_cache()
+        self.assertEqual(len(cached), 3)
+        imported = GoodSectionsResults(max_sample_period=10)
+        imported.import_from_cache(cached, results.timeframes()[1:])
+        self.assertEqual(imported.timeframes(), results.timeframes()[1:])
+        combined = imported.combined()
+        self.assertEqual(combined, expected[1:])
+        self.assertEqual(str(combined[0].start.tz), "Europe/London")
+        self.assertTrue(combined[-1].include_end)
+
 
 if __name__ == "__main__":
     unittest.main()
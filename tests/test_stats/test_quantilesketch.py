@@ -0,0 +1,110 @@
+import unittest
+from os.path import join
+
+import numpy as np
+
+from nilmtk import ElecMeter, HDFDataStore
+from nilmtk.elecmeter import ElecMeterID
+from nilmtk.electric import get_vampire_power
+from nilmtk.stats.quantilesketch import QuantileSketch
+
+from ..testingtools import data_dir
+
+METER_ID = ElecMeterID(instance=1, building=1, dataset="REDD")
+QUANTILES = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+
+def rank_errors(values, sketch):
+    estimates = sketch.quantile(QUANTILES)
+    ranks = np.searchsorted(np.sort(values), estimates, side="right") / len(values)
+    return np.abs(ranks - QUANTILES)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = rng.lognormal(3, 1, 200000)
+
+    def test_update(self):
+        sketch = QuantileSketch(seed=0)
+        for chunk in np.array_split(self.values, 50):
+            sketch.update(chunk)
+        sketch.update([np.nan])
+        self.assertEqual(sketch.n, len(self.values))
+        self.assertLess(len(sketch), 1000)
+        self.assertLess(rank_errors(self.values, sketch).max(), 0.02)
+        self.assertEqual(sketch.quantile(0), self.values.min())
+        self.assertEqual(sketch.quantile(1), self.values.max())
+        hist, _ = sketch.histogram(bins=10)
+        self.assertEqual(hist.sum(), len(self.values))
+
+    def test_merge_and_frame(self):
+        sketches = []
+        for seed, chunk in enumerate(np.array_split(self.values, 4)):
+            sketch = QuantileSketch(seed=seed)
+            sketch.update(chunk)
+            sketches.append(sketch)
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+        self.assertEqual(merged.n, len(self.values))
+        self.assertLess(rank_errors(self.values, merged).max(), 0.02)
+
+        imported = QuantileSketch.from_frame(merged.to_frame())
+        self.assertEqual(imported.n, merged.n)
+        np.testing.assert_array_equal(
+            imported.quantile(QUANTILES), merged.quantile(QUANTILES)
+        )
+
+    def test_empty(self):
+        sketch = QuantileSketch()
+        self.assertTrue(np.isnan(sketch.quantile(0.5)))
+        self.assertEqual(QuantileSketch.from_frame(sketch.to_frame()).n, 0)
+
+
+class TestPowerQuantiles(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        filename = join(data_dir(), "energy.h5")
+        cls.datastore = HDFDataStore(filename)
+        ElecMeter.load_meter_devices(cls.datastore)
+        meter_meta = cls.datastore.load_metadata("building1")["elec_meters"][
+            METER_ID.instance
+        ]
+        cls.meter = ElecMeter(
+            store=cls.datastore, metadata=meter_meta, meter_id=METER_ID
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.datastore.close()
+
+    def test_power_quantiles(self):
+        self.meter.clear_cache()
+        power = self.meter.power_series_all_data(sections=self.meter.good_sections())
+        for _ in range(2):  # the second time uses the cache
+            quantiles = self.meter.power_quantiles([0, 0.5, 1])
+            self.assertEqual(quantiles[0], power.min())
+            self.assertEqual(quantiles[0.5], power.quantile(0.5, interpolation="lower"))
+            self.assertEqual(quantiles[1], power.max())
+        self.assertEqual(self.meter.vampire_power(quantile=0), power.min())
+        self.meter.clear_cache()
+
+    def test_unify(self):
+        self.meter.clear_cache()
+        power = self.meter.power_series_all_data(sections=self.meter.good_sections())
+        results = self.meter.power_quantile_sketch(full_results=True)
+        other = self.meter.power_quantile_sketch(full_results=True)
+        results.unify(other)
+        self.assertEqual(results.sketch.n, 2 * len(power))
+        self.assertEqual(results.simple().quantile(1), power.max())
+        self.meter.clear_cache()
+
+    def test_get_vampire_power(self):
+        power = self.meter.power_series_all_data()
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(get_vampire_power(power, quantile=0), power.min())
+
+
+if __name__ == "__main__":
+    unittest.main()
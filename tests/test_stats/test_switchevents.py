@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.stats.switchevents import count_simultaneous_events, switch_events
+from nilmtk.timeframe import TimeFrame
+
+
+class TestSwitchEvents(unittest.TestCase):
+    def test_switch_events_across_chunks(self):
+        index = pd.date_range("2014-01-01", periods=8, freq="6s", tz="Europe/London")
+        power = pd.Series([0, 0, 100, 100, 100, 0, np.nan, 100], index=index)
+        for split in [1, 3, 5]:
+            chunks = [power.iloc[:split], power.iloc[split:]]
+            times = np.concatenate(list(switch_events(chunks, threshold=40)))
+            np.testing.assert_array_equal(times, index[[2, 5]].asi8)
+
+    def test_switch_events_across_gaps(self):
+        index = pd.date_range("2014-01-01", periods=8, freq="6s", tz="Europe/London")
+        power = pd.Series([0, 0, 100, 100, 100, 100, 0, 0], index=index)
+        first, second = power.iloc[:4], power.iloc[6:]
+        # The chunks' timeframes leave a gap between them
+        first.attrs["timeframe"] = TimeFrame(index[0], index[4])
+        second.attrs["timeframe"] = TimeFrame(index[6], index[7])
+        times = np.concatenate(list(switch_events([first, second])))
+        np.testing.assert_array_equal(times, index[[2]].asi8)
+
+        # Contiguous timeframes are compared across the boundary
+        second.attrs["timeframe"] = TimeFrame(index[4], index[7])
+        times = np.concatenate(list(switch_events([first, second])))
+        np.testing.assert_array_equal(times, index[[2, 6]].asi8)
+
+        # Without timeframes the gap is found from `max_sample_period`
+        chunks = [power.iloc[:4], power.iloc[6:]]
+        times = np.concatenate(list(switch_events(chunks, max_sample_period=10)))
+        np.testing.assert_array_equal(times, index[[2]].asi8)
+        times = np.concatenate(list(switch_events(chunks, max_sample_period=20)))
+        np.testing.assert_array_equal(times, index[[2, 6]].asi8)
+
+    def test_count_simultaneous_events(self):
+        times, counts = count_simultaneous_events(
+            [np.array([1, 2, 3]), np.array([2, 3, 3]), np.array([3, 4])]
+        )
+        np.testing.assert_array_equal(times, [2, 3])
+        np.testing.assert_array_equal(counts, [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,7 @@ from nilmtk import ElecMeter, HDFDataStore
 from nilmtk.consts import JOULES_PER_KWH
 from nilmtk.elecmeter import ElecMeterID
 from nilmtk.preprocessing import Clip
-from nilmtk.stats.totalenergy import TotalEnergy, _energy_for_power_series
+from nilmtk.stats.totalenergy import TotalEnergy, get_total_energy
 
 from ..testingtools import data_dir
 
@@ -45,10 +45,34 @@ class TestEnergy(unittest.TestCase):
         index = [
             pd.Timestamp("2010-01-01") + timedelta(seconds=int(sec)) for sec in secs
         ]
-        df = pd.Series(data=data, index=index)
-        kwh = _energy_for_power_series(df, max_sample_period=15)
+        df = pd.DataFrame({("power", "active"): data}, index=index)
+        kwh = get_total_energy(df, max_sample_period=15)["active"]
         self.assertAlmostEqual(true_kwh, kwh)
 
+    def test_get_total_energy_with_nans(self):
+        index = pd.date_range("2010-01-01", periods=6, freq="10s")
+        df = pd.DataFrame(
+            {
+                ("power", "active"): [100.0, 100.0, 200.0, 200.0, 0.0, 0.0],
+                ("power", "reactive"): [50.0, np.nan, np.nan, 50.0, 50.0, 0.0],
+                ("cumulative energy", "apparent"): [np.nan, 1.0, 2.0, 4.0, 5.0, np.nan],
+            },
+            index=index,
+        )
+        energy = get_total_energy(df, max_sample_period=15)
+        self.assertAlmostEqual(energy["active"], 6000 / JOULES_PER_KWH)
+        self.assertAlmostEqual(
+            energy["reactive"], (50 * 15 + 50 * 10 + 50 * 10) / JOULES_PER_KWH
+        )
+        self.assertEqual(energy["apparent"], 4.0)
+        # NaNs are skipped, as if the rows were not there
+        for ac_type in ["active", "reactive"]:
+            column = df[[("power", ac_type)]].dropna()
+            self.assertAlmostEqual(
+                energy[ac_type],
+                get_total_energy(column, max_sample_period=15)[ac_type],
+            )
+
     def test_pipeline(self):
         meter = ElecMeter(
             store=self.datastore, metadata=self.meter_meta, meter_id=METER_ID
@@ -1,4 +1,6 @@
+import pickle
 import unittest
+from copy import deepcopy
 
 import pandas as pd
 
@@ -149,6 +151,26 @@ class TestTimeFrame(unittest.TestCase):
         ]
         self.assertEqual(merged, correct_answer)
 
+    def test_from_ns(self):
+        start = pd.Timestamp("2014-03-30 00:30", tz="Europe/London")
+        end = pd.Timestamp("2014-03-30 03:30", tz="Europe/London")
+        tf = TimeFrame.from_ns(start.value, end.value, tz=start.tz)
+        self.assertEqual(tf, TimeFrame(start, end))
+        self.assertEqual(tf.start, start)
+        self.assertEqual(str(tf.end.tz), "Europe/London")
+        self.assertEqual(tf.timedelta, end - start)
+        self.assertIsNone(TimeFrame.from_ns(None, end.value).start)
+
+    def test_copy_and_pickle(self):
+        tf = TimeFrame("2012-01-01", "2013-01-01", tz="Europe/London")
+        tf.include_end = True
+        for copied in [deepcopy(tf), pickle.loads(pickle.dumps(tf)), TimeFrame(tf)]:
+            self.assertEqual(copied, tf)
+            self.assertTrue(copied.include_end)
+            self.assertEqual(copied.start.tz, tf.start.tz)
+        self.assertEqual(len({tf, deepcopy(tf)}), 1)
+        self.assertFalse(hasattr(tf, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from nilmtk.timeframe.timeframe import TimeFrame
+from nilmtk.timeframe.timeframegroup import TimeFrameGroup
+
+
+def make_tfg(spans, tz="Europe/London"):
+    """Builds a TimeFrameGroup from (start, end) minutes after midnight."""
+    origin = pd.Timestamp("2014-01-01", tz=tz)
+    return TimeFrameGroup(
+        [
+            TimeFrame(
+                origin + timedelta(minutes=start), origin + timedelta(minutes=end)
+            )
+            for start, end in spans
+        ]
+    )
+
+
+def pairwise_intersection(tfg, other):
+    """The original O(n*m) implementation of TimeFrameGroup.intersection."""
+    new_tfg = []
+    for self_timeframe in tfg:
+        for other_timeframe in other:
+            intersect = self_timeframe.intersection(other_timeframe)
+            if not intersect.empty:
+                new_tfg.append(intersect)
+    return new_tfg
+
+
+def random_spans(rng, n):
+    edges = np.sort(rng.choice(10000, size=2 * n, replace=False)).tolist()
+    return list(zip(edges[::2], edges[1::2]))
+
+
+class TestTimeFrameGroup(unittest.TestCase):
+    def test_intersection_matches_pairwise(self):
+        rng = np.random.default_rng(42)
+        for _ in range(20):
+            tfg = make_tfg(random_spans(rng, 50))
+            other = make_tfg(random_spans(rng, 30))
+            self.assertEqual(tfg.intersection(other), pairwise_intersection(tfg, other))
+
+    def test_intersection_keeps_touching_sections_and_open_ends(self):
+        tfg = make_tfg([(0, 10), (10, 20), (30, 40)])
+        tfg[-1].include_end = True
+        other = TimeFrameGroup([TimeFrame(start=tfg[0].start + timedelta(minutes=5))])
+        intersection = tfg.intersection(other)
+        self.assertEqual(intersection, make_tfg([(5, 10), (10, 20), (30, 40)]))
+        self.assertTrue(intersection[-1].include_end)
+        self.assertEqual(str(intersection[0].start.tz), "Europe/London")
+
+    def test_union_difference_and_merge(self):
+        tfg = make_tfg([(0, 6), (10, 15), (20, 26)])
+        other = make_tfg([(3, 5), (8, 12), (16, 18), (23, 26)])
+        self.assertEqual(
+            tfg.union(other), make_tfg([(0, 6), (8, 15), (16, 18), (20, 26)])
+        )
+        self.assertEqual(
+            tfg.difference(other), make_tfg([(0, 3), (5, 6), (12, 15), (20, 23)])
+        )
+        self.assertEqual(tfg.merge(gap=4 * 60), make_tfg([(0, 15), (20, 26)]))
+        self.assertEqual(tfg.merge(), tfg)
+
+    def test_split(self):
+        tfg = make_tfg([(0, 25), (30, 35)])
+        self.assertEqual(
+            tfg.split(10 * 60), make_tfg([(0, 10), (10, 20), (20, 25), (30, 35)])
+        )
+
+    def test_uptime_and_remove_shorter_than(self):
+        tfg = make_tfg([(0, 1), (10, 15), (20, 30)])
+        self.assertEqual(tfg.uptime(), timedelta(minutes=16))
+        self.assertEqual(
+            tfg.remove_shorter_than(5 * 60), make_tfg([(10, 15), (20, 30)])
+        )
+
+    def test_remove_shorter_than_keeps_originals(self):
+        tfg = make_tfg([(20, 30), (0, 1), (10, 15)])
+        kept = tfg.remove_shorter_than(5 * 60)
+        self.assertEqual(len(kept), 2)
+        self.assertIs(kept[0], tfg[0])
+        self.assertIs(kept[1], tfg[2])
+
+    def test_list_modifications_update_arrays(self):
+        tfg = make_tfg([(0, 10)])
+        self.assertEqual(tfg.uptime(), timedelta(minutes=10))
+        tfg.extend(make_tfg([(20, 25)]))
+        self.assertEqual(tfg.uptime(), timedelta(minutes=15))
+        del tfg[0]
+        self.assertEqual(tfg.uptime(), timedelta(minutes=5))
+
+    def test_timeframe_modifications_update_arrays(self):
+        tfg = make_tfg([(0, 10), (20, 30)])
+        self.assertEqual(tfg.uptime(), timedelta(minutes=20))
+        tfg[0].end = tfg[0].start + timedelta(minutes=5)
+        self.assertEqual(tfg.uptime(), timedelta(minutes=15))
+        tfg[1].include_end = True
+        self.assertTrue(tfg.merge()[-1].include_end)
+        tfg[1].enabled = False  # i.e. open-ended
+        with self.assertRaises(ValueError):
+            tfg.uptime()
+
+    def test_other_timeframes_do_not_invalidate_arrays(self):
+        tfg = make_tfg([(0, 10)])
+        arrays = tfg.to_arrays()
+        other = make_tfg([(20, 30)])
+        other[0].end = other[0].start + timedelta(minutes=5)
+        TimeFrame(tfg[0])
+        self.assertIs(tfg.to_arrays(), arrays)
+
+    def test_period_index(self):
+        periods = pd.period_range("2014-01-01", periods=3, freq="D")
+        tfg = TimeFrameGroup(periods)
+        self.assertEqual(len(tfg), 3)
+        self.assertEqual(tfg[1].start, pd.Timestamp("2014-01-02"))
+        self.assertEqual(tfg[1].end, periods[1].end_time)
+
+
+if __name__ == "__main__":
+    unittest.main()